@@ -2,14 +2,19 @@ from reports.report_manager import add_screen_data, create_report, set_screen_da
 from reports.report_types import REPORT_TYPES
 from screens.extract_data_from_screen import extract_data_from_screen
 from screens.detect_match_screen_type import detect_match_screen_type
+from screen_context import ScreenContext
 from show_missing_screens import show_missing_screens
 
-async def handle_screenshot(screenshot_path, report, report_type, user_id, team, overlay):
+async def handle_screenshot(frame, report, report_type, user_id, team, overlay):
     """
     Handles the screenshot action, determines the report type and screen type,
     and manages the report data collection based on detected screen information.
     """
-    screen_type = await detect_match_screen_type(screenshot_path)
+    # The captured frame is processed in memory, the crops and OCR results of detection are reused by the screen processor
+    context = ScreenContext(image=frame)
+
+    # Only a report still being filled tells which screens to expect
+    screen_type = await detect_match_screen_type(context, report if report_type else None)
     print(f"Detected screen: {screen_type}")
 
     # Initialize report if necessary
@@ -17,8 +22,9 @@ async def handle_screenshot(screenshot_path, report, report_type, user_id, team,
 
     # Perform data extraction if report_type is set and screen is allowed
     if report_type:
-        await extract_and_process_screen_data(screenshot_path, report, report_type, team, screen_type, overlay)
+        await extract_and_process_screen_data(context, report, report_type, team, screen_type, overlay)
 
+    context.release()
     return report, report_type
 
 
@@ -44,7 +50,7 @@ def initialize_report(report, report_type, user_id, screen_type, overlay):
     return report_type, report
 
 
-async def extract_and_process_screen_data(screenshot_path, report, report_type, team, screen_type, overlay):
+async def extract_and_process_screen_data(context, report, report_type, team, screen_type, overlay):
     """
     Extracts data from screens and updates the report based on the screen type
     and multi or single capture configuration.
@@ -59,7 +65,7 @@ async def extract_and_process_screen_data(screenshot_path, report, report_type,
     )
 
     if screen_type in allowed_screens:
-        screen_data = await extract_data_from_screen(screen_type, screenshot_path, team)
+        screen_data = await extract_data_from_screen(screen_type, context, team)
         handle_screen_data(report, screen_type, screen_data, multi_capture)
         show_missing_screens(report, report_type, overlay)
         handle_submission_status(report_config, report, overlay, multi_capture)
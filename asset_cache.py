@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import struct
+
+import numpy as np
+
+# Folder compiled asset banks are stored in, empty string disables it (banks are then built in memory)
+ASSET_CACHE_DIR = os.environ.get("FCORE_ASSET_CACHE_DIR", os.path.join("local_cache", "assets"))
+
+# Bumped whenever the file layout changes, older files are rebuilt
+ASSET_FORMAT_VERSION = 1
+MAGIC = b"FCASSET\0"
+ALIGNMENT = 64  # Arrays start on aligned offsets so the mapped views are aligned too
+
+# File layout: MAGIC, format version (uint32), header length (uint64), JSON header, then the raw arrays
+PREFIX = struct.Struct("<8sIQ")
+
+def source_hash(folder, params=""):
+    """
+    Hash of every file under the folder (relative path and content) together with the build parameters.
+    Changing, adding or removing a source file, or changing how it's preprocessed, changes the hash.
+    """
+    digest = hashlib.sha256(f"{ASSET_FORMAT_VERSION}|{params}".encode())
+    if os.path.isdir(folder):
+        for root, directories, filenames in os.walk(folder):
+            directories.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(root, filename)
+                digest.update(os.path.relpath(path, folder).replace(os.sep, "/").encode())
+                with open(path, "rb") as file:
+                    digest.update(hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
+
+def write_bank(path, arrays, metadata, digest):
+    """
+    Writes arrays and metadata into one file, atomically so other processes never see a partial file.
+    """
+    entries = {}
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+
+    header = json.dumps({"hash": digest, "metadata": metadata, "arrays": entries}).encode()
+    data_start = -(-(PREFIX.size + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(PREFIX.pack(MAGIC, ASSET_FORMAT_VERSION, len(header)))
+        file.write(header)
+        for name, array in arrays.items():
+            file.seek(data_start + entries[name]["offset"])
+            file.write(np.ascontiguousarray(array).tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+
+    try:
+        os.replace(temporary_path, path)
+    except OSError:
+        # Another process has the old file mapped (Windows), it's rebuilt on a later start
+        os.remove(temporary_path)
+        return False
+    return True
+
+def read_header(path):
+    """Header of a compiled bank and where its arrays start, None if the file is missing or of another format."""
+    try:
+        with open(path, "rb") as file:
+            magic, version, header_length = PREFIX.unpack(file.read(PREFIX.size))
+            if magic != MAGIC or version != ASSET_FORMAT_VERSION:
+                return None
+            header = json.loads(file.read(header_length))
+    except (OSError, ValueError, struct.error):
+        return None
+
+    return header, -(-(PREFIX.size + header_length) // ALIGNMENT) * ALIGNMENT
+
+def map_bank(path, header, data_start):
+    """Read-only memory-mapped views of the arrays, shared between processes through the page cache."""
+    arrays = {}
+    for name, entry in header["arrays"].items():
+        dtype, shape = np.dtype(entry["dtype"]), tuple(entry["shape"])
+        if 0 in shape:
+            arrays[name] = np.empty(shape, dtype=dtype)  # Empty arrays can't be mapped
+        else:
+            arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=data_start + entry["offset"], shape=shape)
+    return arrays
+
+def load_bank(name, folder, build, params="", directory=ASSET_CACHE_DIR):
+    """
+    Loads a compiled asset bank, compiling it first if its source files changed.
+
+    Parameters:
+        name (str): File name of the bank in the cache folder.
+        folder (str): Folder holding the source files (e.g. the template PNGs).
+        build (function): folder -> (dict of name -> np.array, JSON-safe metadata), run only when compiling.
+        params (str): Build parameters (sizes, preprocessing...), a change recompiles the bank.
+
+    Returns:
+        tuple: (dict of name -> read-only np.array, metadata)
+    """
+    if not directory:
+        return build(folder)
+
+    digest = source_hash(folder, params)
+    path = os.path.join(directory, f"{name}.bin")
+
+    loaded = read_header(path)
+    if loaded is None or loaded[0]["hash"] != digest:
+        arrays, metadata = build(folder)
+        os.makedirs(directory, exist_ok=True)
+        if not write_bank(path, arrays, metadata, digest):
+            return arrays, metadata
+        print(f"Compiled asset bank {path}")
+        loaded = read_header(path)
+
+    header, data_start = loaded
+    return map_bank(path, header, data_start), header["metadata"]
+
+if __name__ == "__main__":
+    # Compiles every bank, e.g. before starting several workers
+    import digits
+    import playstyles
@@ -1,23 +1,22 @@
-import cv2
-
+from color_signatures import MVP_ICON
 from crop import crop_area
 from save_image import save_image
 
 DEBUG = True
 
-def check_for_mvp(image, last_name_bbox, player_name, search_x_offset=50, folder="./images"):
+def crop_mvp_area(image, last_name_bbox, player_name, search_x_offset=50, folder="./images"):
     """
-    Check if the player has the MVP icon based on color detection.
+    Crop the area where the MVP icon would be, left of the player's last name.
     
     Parameters:
         image (np.array): The original image containing the player data.
         last_name_bbox (list): The bounding box of the player's last name.
         player_name (str): Name of the player being checked for MVP.
         search_x_offset (int): Distance to move left from the last name's x_min to search for the MVP icon.
-        save (bool): Whether to save the cropped area for debugging.
+        folder (str): Where the cropped area is saved for debugging.
     
     Returns:
-        bool: True if the player is the MVP, False otherwise.
+        np.array: The cropped area, None if it's empty or invalid.
     """
     # Get the coordinates for the last name's bounding box
     x_min, y_min = last_name_bbox[0]  # Top-left corner of the last name
@@ -33,27 +32,36 @@ def check_for_mvp(image, last_name_bbox, player_name, search_x_offset=50, folder
     # Ensure the cropped area is valid (not empty)
     if cropped_area is None or cropped_area.size == 0:
         print(f"Error: Cropped area for {player_name} is empty or invalid.")
-        return False
+        return None
     
     # Optionally save the cropped image for debugging
     if DEBUG:
         save_image(cropped_area, folder, f"mvp.png")
 
-    # Convert the cropped area to HSV
-    try:
-        hsv_cropped = cv2.cvtColor(cropped_area, cv2.COLOR_BGR2HSV)
-    except cv2.error as e:
-        print(f"OpenCV error when converting cropped area to HSV for {player_name}: {e}")
-        return False
+    return cropped_area
 
-    # Define HSV color range for detecting gold/yellow color
-    lower_gold = (20, 100, 100)
-    upper_gold = (30, 255, 255)
+def find_mvp(image, candidates, search_x_offset=50, folder="./images"):
+    """
+    Checks the MVP icon of every candidate with one color pass.
+    
+    Parameters:
+        image (np.array): The original image containing the player data.
+        candidates (list): (last name bounding box, player name) per player, in screen order.
 
-    # Create a mask to detect yellow/gold pixels
-    mask = cv2.inRange(hsv_cropped, lower_gold, upper_gold)
+    Returns:
+        int: Index of the first candidate with the MVP icon (more than 30% gold/yellow pixels), None if there's none.
+    """
+    areas = [crop_mvp_area(image, bbox, name, search_x_offset, folder) for bbox, name in candidates]
+    for index, is_mvp in enumerate(MVP_ICON.classify(areas)):
+        if is_mvp:
+            return index
+    return None
 
-    # Calculate the percentage of yellow pixels
-    yellow_percentage = (cv2.countNonZero(mask) / mask.size) * 100
+def check_for_mvp(image, last_name_bbox, player_name, search_x_offset=50, folder="./images"):
+    """
+    Check if the player has the MVP icon based on color detection.
 
-    return yellow_percentage > 30  # Return True if more than 75% of the area is yellow/gold
\ No newline at end of file
+    Returns:
+        bool: True if the player is the MVP, False otherwise.
+    """
+    return find_mvp(image, [(last_name_bbox, player_name)], search_x_offset, folder) is not None
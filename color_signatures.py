@@ -0,0 +1,162 @@
+import cv2
+import numpy as np
+
+# Color classes per icon or badge: label -> ([(lower, upper), ...], minimum)
+# A pixel belongs to a class if it's inside any of its ranges, ranges are in the signature's color space
+# (HSV with hue 0-180, gray 0-255, or the raw BGR channel values 0-255 each counted on their own).
+# The minimum is a fraction of the ROI's samples, or a number of samples for signatures with counts=True
+
+# Player mood next to the name on the pre-match screen, checked in this order
+MOOD_CLASSES = {
+    "excited": ([((40, 50, 50), (75, 255, 255))], 0),  # Green
+    "happy": ([((85, 50, 50), (105, 255, 255))], 0),  # Cyan-Blue
+    "neutral": ([((20, 50, 50), (30, 255, 255))], 0),  # Yellow
+    "bad": ([((0, 50, 50), (10, 255, 255)), ((170, 50, 50), (180, 255, 255))], 0),  # Red, hue wraps around
+}
+
+# Sign of the player form value, whichever color covers more of the number
+FORM_SIGN_CLASSES = {
+    True: ([((35, 50, 50), (85, 255, 255))], 0),  # Green, positive
+    False: ([((0, 50, 50), (10, 255, 255)), ((170, 50, 50), (180, 255, 255))], 0),  # Red, negative
+}
+
+# Green substitution caret next to the name, more than 20 pixels
+SUB_CARET_CLASSES = {
+    True: ([((50, 100, 50), (80, 255, 255))], 20),
+}
+
+# White ball icon of a goal scorer, half of the area's channel values at 200 or above
+GOAL_ICON_CLASSES = {
+    True: ([((200,), (255,))], 0.5),
+}
+
+# Gold MVP icon
+MVP_ICON_CLASSES = {
+    True: ([((20, 100, 100), (30, 255, 255))], 0.3),
+}
+
+# Golden playstyle icons, more than 50 pixels
+GOLDEN_PLAYSTYLE_CLASSES = {
+    True: ([((15, 100, 100), (35, 255, 255))], 50),
+}
+
+# White background of the selected "Play Match" button, the match is played as a regular match
+PLAY_MATCH_BUTTON_CLASSES = {
+    True: ([((200,), (255,))], 0.5),
+}
+
+# Color space -> (conversion from BGR, values per sample). "channels" compares every BGR value on its own
+COLOR_SPACES = {
+    "hsv": (cv2.COLOR_BGR2HSV, 3),
+    "gray": (cv2.COLOR_BGR2GRAY, 3),
+    "channels": (None, 1),
+}
+
+class ColorSignature:
+    """
+    Labels a batch of small ROIs by the share of their pixels in named color ranges.
+    All ROIs are converted and compared in one pass over their pixels stacked into a single array.
+
+    Parameters:
+        classes (dict): label -> ([(lower, upper), ...], minimum), see the tables above.
+        space (str): Color space the ranges are given in, "hsv", "gray" or "channels".
+        dominant (bool): Pick the class covering the most pixels (ties give the default)
+                         instead of the first class above its minimum.
+        counts (bool): Minimums are numbers of samples instead of fractions of the ROI.
+        default: Label of ROIs matching no class.
+    """
+    def __init__(self, classes, space="hsv", dominant=False, counts=False, default=None):
+        self.labels = list(classes)
+        self.minimums = np.array([minimum for _, minimum in classes.values()])
+        self.conversion, self.sample_size = COLOR_SPACES[space]
+        self.dominant = dominant
+        self.counts = counts
+        self.default = default
+
+        self.ranges = [
+            [(np.array(lower, dtype=np.uint8), np.array(upper, dtype=np.uint8)) for lower, upper in class_ranges]
+            for class_ranges, _ in classes.values()
+        ]
+
+    def sample_counts(self, rois):
+        """
+        Samples (pixels, or channel values in the "channels" space) of each ROI in each class.
+
+        Parameters:
+            rois (list): BGR crops of any size, None or empty crops are allowed.
+
+        Returns:
+            tuple: ((len(rois), classes) counts, samples per ROI), both 0 for empty ROIs.
+        """
+        counts = np.zeros((len(rois), len(self.labels)), dtype=np.int64)
+        sizes = np.zeros(len(rois), dtype=np.int64)
+        valid = [index for index, roi in enumerate(rois) if roi is not None and roi.size > 0]
+        if not valid:
+            return counts, sizes
+
+        # Stack the samples of all ROIs into one row so they're converted with a single call
+        pixels = np.concatenate([rois[index].reshape(-1, self.sample_size) for index in valid])
+        if self.conversion is None:
+            converted = pixels.reshape(1, -1)
+        else:
+            converted = cv2.cvtColor(pixels[np.newaxis], self.conversion)
+
+        # One mask per class over all pixels, a pixel is in a class if it's inside any of its ranges
+        masks = np.empty((len(self.ranges), len(pixels)), dtype=np.uint8)
+        for index, class_ranges in enumerate(self.ranges):
+            mask = cv2.inRange(converted, *class_ranges[0])
+            for lower, upper in class_ranges[1:]:
+                mask = cv2.bitwise_or(mask, cv2.inRange(converted, lower, upper))
+            masks[index] = mask.reshape(-1)
+
+        # Samples per ROI and class, summed over each ROI's stretch of the stacked samples
+        sizes[valid] = [rois[index].size // self.sample_size for index in valid]
+        offsets = np.concatenate([[0], np.cumsum(sizes[valid])[:-1]])
+        counts[valid] = np.add.reduceat(masks, offsets, axis=1, dtype=np.int64).T // 255
+        return counts, sizes
+
+    def fractions(self, rois):
+        """
+        Share of each ROI's samples in each class.
+
+        Returns:
+            np.array: (len(rois), classes) fractions, 0 for empty ROIs.
+        """
+        counts, sizes = self.sample_counts(rois)
+        return counts / np.maximum(sizes, 1)[:, np.newaxis]
+
+    def classify(self, rois):
+        """
+        Label per ROI, None for empty ROIs.
+
+        Parameters:
+            rois (list): BGR crops of any size.
+
+        Returns:
+            list: One of the class labels or the default per ROI.
+        """
+        labels = []
+        scores = self.sample_counts(rois)[0] if self.counts else self.fractions(rois)
+        for roi, row in zip(rois, scores):
+            if roi is None or roi.size == 0:
+                labels.append(None)
+                continue
+
+            above = row > self.minimums
+            if not above.any():
+                labels.append(self.default)
+            elif self.dominant:
+                best = row.max()
+                labels.append(self.labels[int(row.argmax())] if (row == best).sum() == 1 else self.default)
+            else:
+                labels.append(self.labels[int(above.argmax())])
+
+        return labels
+
+MOOD = ColorSignature(MOOD_CLASSES, default="unknown")
+FORM_SIGN = ColorSignature(FORM_SIGN_CLASSES, dominant=True)
+SUB_CARET = ColorSignature(SUB_CARET_CLASSES, counts=True, default=False)
+GOAL_ICON = ColorSignature(GOAL_ICON_CLASSES, space="channels", default=False)
+MVP_ICON = ColorSignature(MVP_ICON_CLASSES, default=False)
+GOLDEN_PLAYSTYLE = ColorSignature(GOLDEN_PLAYSTYLE_CLASSES, counts=True, default=False)
+PLAY_MATCH_BUTTON = ColorSignature(PLAY_MATCH_BUTTON_CLASSES, space="gray", default=False)
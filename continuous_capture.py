@@ -0,0 +1,110 @@
+import os
+import time
+
+import cv2
+import numpy as np
+
+# Opt-in hands-free mode: sample the screen and process every new screen once it has settled
+CONTINUOUS_CAPTURE = os.environ.get("FCORE_CONTINUOUS", "0") not in ("0", "false", "False", "")
+# Screen samples per second in continuous mode
+CAPTURE_FPS = float(os.environ.get("FCORE_CAPTURE_FPS", 2))
+# Consecutive unchanged samples needed before a new screen is passed on
+STABLE_FRAMES = int(os.environ.get("FCORE_STABLE_FRAMES", 3))
+# Share of changed pixels in the most changed tile above which the screen counts as changed.
+# Compared per tile so a change confined to a small area (e.g. one number) isn't averaged away over the frame.
+CHANGE_THRESHOLD = float(os.environ.get("FCORE_CHANGE_THRESHOLD", 0.002))
+
+THUMBNAIL_SIZE = (480, 270)  # Width, height frames are compared at, large enough to keep digit strokes
+SAMPLE_STEP = 2  # Pixel stride taken before resizing, keeps the downsampling cheap on large frames
+TILE_GRID = (8, 8)  # Columns, rows of tiles the thumbnail is compared in
+PIXEL_THRESHOLD = 24  # Gray levels a thumbnail pixel must change by to count as changed, ignores capture noise
+
+def thumbnail(frame):
+    """Small grayscale version of a frame for change detection."""
+    sampled = frame[::SAMPLE_STEP, ::SAMPLE_STEP]
+    gray = cv2.cvtColor(sampled, cv2.COLOR_BGR2GRAY) if sampled.ndim == 3 else sampled
+    return cv2.resize(gray, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+
+def frame_difference(a, b):
+    """Share of changed pixels in the most changed tile of two thumbnails."""
+    changed = (cv2.absdiff(a, b) > PIXEL_THRESHOLD).astype(np.float32)
+    # Area interpolation down to one pixel per tile averages each tile
+    return float(cv2.resize(changed, TILE_GRID, interpolation=cv2.INTER_AREA).max())
+
+class ChangeDetector:
+    """
+    Decides which sampled frames are worth classifying.
+    A frame is passed on once the screen changed and then stayed the same for `stable_frames` samples,
+    so animations and transitions are skipped and every screen is handled once.
+    """
+    def __init__(self, stable_frames=STABLE_FRAMES, threshold=CHANGE_THRESHOLD):
+        self.stable_frames = stable_frames
+        self.threshold = threshold
+        self.previous = None  # Thumbnail of the last sample
+        self.accepted = None  # Thumbnail of the last frame passed on
+        self.stable_count = 0
+
+    def update(self, frame):
+        """
+        Feed the next sample.
+
+        Returns:
+            bool: True if this frame shows a new screen that has settled.
+        """
+        current = thumbnail(frame)
+        previous, self.previous = self.previous, current
+
+        if previous is None or frame_difference(current, previous) > self.threshold:
+            self.stable_count = 1
+        else:
+            self.stable_count += 1
+
+        if self.stable_count != self.stable_frames:
+            return False
+
+        # Settled, but back on the screen that was already handled
+        if self.accepted is not None and frame_difference(current, self.accepted) <= self.threshold:
+            return False
+
+        self.accepted = current
+        return True
+
+class ContinuousCapture:
+    """
+    Samples a capture backend at a fixed rate and returns the frames of settled new screens.
+
+    Parameters:
+        capture: Capture backend with grab().
+        fps (float): Samples per second.
+    """
+    def __init__(self, capture, fps=CAPTURE_FPS, detector=None):
+        self.capture = capture
+        self.interval = 1 / fps
+        self.detector = detector or ChangeDetector()
+        self.last_sample = 0.0
+        self.samples = 0
+        self.screens = 0
+
+    def poll(self):
+        """
+        Takes a sample if it's due.
+
+        Returns:
+            np.array: BGR frame of a new settled screen, None otherwise.
+        """
+        now = time.perf_counter()
+        if now - self.last_sample < self.interval:
+            return None
+        self.last_sample = now
+
+        frame = self.capture.grab()
+        if frame is None:
+            return None
+
+        self.samples += 1
+        if not self.detector.update(frame):
+            return None
+
+        self.screens += 1
+        print(f"New screen after {self.samples} samples ({self.screens} screens so far)")
+        return frame
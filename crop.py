@@ -7,10 +7,11 @@ def crop_area(image, x, y, w, h):
     x, y, w, h = int(x), int(y), int(w), int(h)  # Ensure all coordinates are integers
     return image[y:y+h, x:x+w]
 
-def crop_region(image, center_x, center_y, width=100, height=100):
+def region_around(center_x, center_y, width=100, height=100):
+    """Coordinates (x1, y1, x2, y2) of a width x height region centered on a point, kept inside the image."""
     x_start = max(center_x - width // 2, 0)
     y_start = max(center_y - height // 2, 0)
-    x_end = x_start + width
-    y_end = y_start + height
-    cropped_image = image[y_start:y_end, x_start:x_end]
-    return cropped_image
\ No newline at end of file
+    return x_start, y_start, x_start + width, y_start + height
+
+def crop_region(image, center_x, center_y, width=100, height=100):
+    return crop_image(image, region_around(center_x, center_y, width, height))
\ No newline at end of file
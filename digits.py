@@ -0,0 +1,207 @@
+import cv2
+import os
+import sys
+import numpy as np
+from asset_cache import load_bank
+
+# Glyph templates, one folder per character: assets/digits/<label>/<n>.png
+DIGITS_PATH = "assets/digits"
+# Opt-in template reader for numeric fields. No templates ship with the repo, build them first
+# with `python digits.py <folder with numeric field crops>`. Off, numeric fields are read with OCR.
+DIGITS_ENABLED = os.environ.get("FCORE_DIGIT_TEMPLATES", "0") not in ("0", "false", "False", "")
+
+# Folder names for characters that can't be used as folder names
+LABEL_CHARS = {"percent": "%", "dot": ".", "colon": ":", "plus": "+", "minus": "-"}
+CHAR_LABELS = {char: label for label, char in LABEL_CHARS.items()}
+
+GLYPH_SIZE = (16, 24)  # Width, height every glyph is normalized to
+THRESHOLD = 0.8  # Minimum correlation of the least certain glyph for a confident read
+MIN_COMPONENT_AREA = 0.01  # Components smaller than this share of the largest one are noise
+MAX_SAMPLES_PER_GLYPH = 20  # Templates kept per character when building the bank
+
+def binarize(image):
+    """Otsu threshold with the text as white foreground, whatever the original polarity."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+    # Text covers less of the crop than the background
+    if cv2.countNonZero(binary) > binary.size // 2:
+        binary = cv2.bitwise_not(binary)
+
+    return binary
+
+def segment_glyphs(binary):
+    """
+    Splits a binary image into characters using connected components.
+    Components overlapping horizontally (e.g. the parts of '%' or ':') are merged.
+
+    Returns:
+        list: (x, y, w, h) per character, left-to-right.
+    """
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    if count <= 1:
+        return []
+
+    stats = stats[1:]  # Drop the background
+    areas = stats[:, cv2.CC_STAT_AREA]
+    stats = stats[areas >= areas.max() * MIN_COMPONENT_AREA]
+    stats = stats[np.argsort(stats[:, cv2.CC_STAT_LEFT], kind="stable")]
+
+    glyphs = []
+    for x, y, w, h, _ in stats:
+        if glyphs:
+            gx, gy, gw, gh = glyphs[-1]
+            if x < gx + gw:
+                x2, y2 = max(gx + gw, x + w), max(gy + gh, y + h)
+                gx, gy = min(gx, x), min(gy, y)
+                glyphs[-1] = (gx, gy, x2 - gx, y2 - gy)
+                continue
+        glyphs.append((x, y, w, h))
+
+    return glyphs
+
+def normalize_glyph(binary, box):
+    """
+    Scales one character to GLYPH_SIZE keeping its aspect ratio
+    and returns it as a zero-mean, unit-length vector.
+    """
+    x, y, w, h = box
+    glyph = binary[y:y + h, x:x + w]
+
+    target_w, target_h = GLYPH_SIZE
+    scale = min(target_w / w, target_h / h)
+    resized = cv2.resize(glyph, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+
+    canvas = np.zeros((target_h, target_w), dtype=np.float32)
+    top = (target_h - resized.shape[0]) // 2
+    left = (target_w - resized.shape[1]) // 2
+    canvas[top:top + resized.shape[0], left:left + resized.shape[1]] = resized
+
+    vector = canvas.reshape(-1)
+    vector -= vector.mean()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def compile_digit_bank(path):
+    """
+    Load all glyph templates into one matrix of normalized vectors.
+
+    Returns:
+        tuple: ({"matrix": one normalized template per row}, {"labels": character per row})
+    """
+    labels, vectors = [], []
+    if os.path.isdir(path):
+        for label in sorted(os.listdir(path)):
+            folder = os.path.join(path, label)
+            if not os.path.isdir(folder):
+                continue
+
+            char = LABEL_CHARS.get(label, label)
+            for filename in sorted(os.listdir(folder)):
+                if filename.endswith(".png"):
+                    template = cv2.imread(os.path.join(folder, filename), cv2.IMREAD_GRAYSCALE)
+                    h, w = template.shape
+                    labels.append(char)
+                    vectors.append(normalize_glyph(template, (0, 0, w, h)))
+
+    matrix = np.array(vectors, dtype=np.float32).reshape(len(vectors), GLYPH_SIZE[0] * GLYPH_SIZE[1])
+    return {"matrix": matrix}, {"labels": labels}
+
+def load_digit_bank(path=DIGITS_PATH):
+    """
+    Loads the compiled glyph bank, recompiled when the templates change.
+
+    Returns:
+        tuple: (labels, matrix) with one character per template row.
+    """
+    arrays, metadata = load_bank("digits", path, compile_digit_bank, params=f"size={GLYPH_SIZE}")
+    return metadata["labels"], arrays["matrix"]
+
+# Load the templates once, only when the reader is enabled
+DIGIT_LABELS, DIGIT_MATRIX = load_digit_bank() if DIGITS_ENABLED else ([], None)
+
+def read_digits(image, labels=DIGIT_LABELS, matrix=DIGIT_MATRIX):
+    """
+    Reads a short numeric field (score, rating, percentage...) with the glyph templates.
+
+    Parameters:
+        image (numpy.ndarray): Crop containing only the field.
+
+    Returns:
+        tuple: (text, confidence) where confidence is the correlation of the least certain glyph,
+               ("", 0.0) if the bank is empty or nothing was found.
+    """
+    if image is None or image.size == 0 or not labels:
+        return "", 0.0
+
+    binary = binarize(image)
+    boxes = segment_glyphs(binary)
+    if not boxes:
+        return "", 0.0
+
+    glyphs = np.stack([normalize_glyph(binary, box) for box in boxes])
+    scores = glyphs @ matrix.T  # Correlation of every glyph with every template
+    best = scores.argmax(axis=1)
+
+    text = "".join(labels[index] for index in best)
+    confidence = float(scores[np.arange(len(best)), best].min())
+    return text, confidence
+
+def add_samples(image, text, path=DIGITS_PATH, max_samples=MAX_SAMPLES_PER_GLYPH):
+    """
+    Adds the characters of a labelled crop to the template bank.
+    Skipped when segmentation doesn't find exactly one component per character.
+
+    Returns:
+        int: Number of templates written.
+    """
+    binary = binarize(image)
+    boxes = segment_glyphs(binary)
+    if len(boxes) != len(text):
+        return 0
+
+    written = 0
+    for char, (x, y, w, h) in zip(text, boxes):
+        folder = os.path.join(path, CHAR_LABELS.get(char, char))
+        os.makedirs(folder, exist_ok=True)
+
+        existing = len([name for name in os.listdir(folder) if name.endswith(".png")])
+        if existing >= max_samples:
+            continue
+
+        cv2.imwrite(os.path.join(folder, f"{existing}.png"), binary[y:y + h, x:x + w])
+        written += 1
+
+    return written
+
+async def build_digit_bank(sample_folder, path=DIGITS_PATH, min_confidence=0.95):
+    """
+    Builds the template bank from sample crops of numeric fields (e.g. the debug crops in ./images).
+    Each crop is labelled with PaddleOCR and only confident, cleanly segmented reads are kept.
+    """
+    from ocr import recognize_only
+
+    filenames = [name for name in sorted(os.listdir(sample_folder)) if name.endswith(".png")]
+    crops = [cv2.imread(os.path.join(sample_folder, name)) for name in filenames]
+
+    written = 0
+    for name, crop, (text, confidence) in zip(filenames, crops, await recognize_only(crops)):
+        text = text.replace(" ", "")
+        if confidence < min_confidence or not text or not all(char.isdigit() or char in CHAR_LABELS for char in text):
+            print(f"Skipped {name}: '{text}' ({confidence:.2f})")
+            continue
+
+        added = add_samples(crop, text, path)
+        print(f"{name}: '{text}' -> {added} templates")
+        written += added
+
+    print(f"Wrote {written} glyph templates to {path}")
+
+if __name__ == "__main__":
+    import asyncio
+
+    if len(sys.argv) != 2:
+        print("Usage: python digits.py <folder with numeric field crops>")
+        sys.exit(1)
+
+    asyncio.run(build_digit_bank(sys.argv[1]))
@@ -0,0 +1,246 @@
+import json
+import os
+import sys
+
+import cv2
+import numpy as np
+from layout import crop_box, region_box
+from screens.screen_types import (
+    MATCH_FACTS, PLAYER_PERFORMANCE, PLAYER_PERFORMANCE_EXTENDED, PRE_MATCH,
+    SIM_MATCH_FACTS, SIM_MATCH_PERFORMANCE, SIM_MATCH_PERFORMANCE_BENCH,
+    SIM_PRE_MATCH, SQUAD_ATTRIBUTES, SQUAD_FINANCIAL, SQUAD_STATS
+)
+
+# Prebuilt reference hashes, built from labelled screenshots with `python fingerprints.py <folder>`.
+# Only read at runtime.
+FINGERPRINTS_PATH = "assets/fingerprints.json"
+# Hashes learned from screens the OCR detectors confirmed (see add_fingerprint)
+LEARNED_FINGERPRINTS_PATH = os.path.join("local_cache", "fingerprints", "learned.json")
+# Learn reference hashes from OCR-confirmed screens, set to 0 to only use the prebuilt bank
+FINGERPRINTS_LEARN = os.environ.get("FCORE_FINGERPRINTS_LEARN", "1") not in ("0", "false", "False", "")
+
+HASH_SIZE = 16  # Difference hash of HASH_SIZE x HASH_SIZE bits per region
+MAX_DISTANCE = 0.12  # Largest share of differing bits still accepted as the same screen
+MIN_MARGIN = 0.05  # Required gap between the closest screen type and the next closest one
+MAX_SAMPLES_PER_TYPE = 5  # Reference hashes learned per screen type
+# OCR-confirmed screenshots that must agree on a learned hash before it's used,
+# so a single wrong detection never becomes a reference
+MIN_CONFIRMATIONS = 2
+
+# Anchor region hashed for each screen type: (x1, y1, x2, y2) in base resolution pixels
+# These are the same crops the OCR detectors read their anchor labels from
+FINGERPRINT_REGIONS = {
+    screen_type: region_box(screen_type, "anchor") for screen_type in (
+        PRE_MATCH, SIM_PRE_MATCH, MATCH_FACTS, PLAYER_PERFORMANCE, PLAYER_PERFORMANCE_EXTENDED,
+        SIM_MATCH_FACTS, SIM_MATCH_PERFORMANCE, SIM_MATCH_PERFORMANCE_BENCH,
+        SQUAD_FINANCIAL, SQUAD_ATTRIBUTES, SQUAD_STATS
+    )
+}
+
+MATCH_SCREEN_TYPES = [
+    PRE_MATCH, SIM_PRE_MATCH, MATCH_FACTS, PLAYER_PERFORMANCE, PLAYER_PERFORMANCE_EXTENDED,
+    SIM_MATCH_FACTS, SIM_MATCH_PERFORMANCE, SIM_MATCH_PERFORMANCE_BENCH
+]
+
+# Screens sharing an anchor that only differ in a detail a fingerprint can't be trusted with.
+# A match on one of them must be confirmed by the caller's OCR probe.
+LOOKALIKE_GROUPS = [
+    {PRE_MATCH, SIM_PRE_MATCH},  # "Play Match" button color
+    {SIM_MATCH_PERFORMANCE, SIM_MATCH_PERFORMANCE_BENCH},  # "n/a" text of the bench view
+    {SQUAD_FINANCIAL, SQUAD_ATTRIBUTES, SQUAD_STATS},  # Column keywords of the header
+]
+LOOKALIKES = {screen_type: group - {screen_type} for group in LOOKALIKE_GROUPS for screen_type in group}
+
+def difference_hash(image, hash_size=HASH_SIZE):
+    """
+    Perceptual difference hash: compares neighbouring pixels of a tiny grayscale thumbnail.
+
+    Returns:
+        np.array: hash_size * hash_size bits as a uint8 array of 0/1.
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    thumbnail = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    return (thumbnail[:, 1:] > thumbnail[:, :-1]).astype(np.uint8).reshape(-1)
+
+def read_entries(path=FINGERPRINTS_PATH):
+    """Reference hash entries stored in the bank file, empty if there's none."""
+    if not os.path.exists(path):
+        return []
+
+    with open(path, "r") as file:
+        return json.load(file).get("entries", [])
+
+def write_entries(entries, path=FINGERPRINTS_PATH):
+    """Writes the bank file atomically, so a concurrent reader never sees a partial file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump({"hash_size": HASH_SIZE, "entries": entries}, file, indent=2)
+    os.replace(temporary_path, path)
+
+def make_entry(image, screen_type, source):
+    """Reference hash entry of a full screenshot of the given screen type."""
+    region = FINGERPRINT_REGIONS[screen_type]
+    bits = difference_hash(crop_box(image, region))
+    return {
+        "screen_type": screen_type,
+        "region": list(region),
+        "hash": np.packbits(bits).tobytes().hex(),
+        "source": source,
+    }
+
+def entry_bits(entry):
+    return np.unpackbits(np.frombuffer(bytes.fromhex(entry["hash"]), dtype=np.uint8))
+
+def is_active(entry):
+    """Prebuilt entries are always used, learned ones once enough screenshots confirmed them."""
+    return entry.get("confirmations", MIN_CONFIRMATIONS) >= MIN_CONFIRMATIONS
+
+def load_fingerprints(paths=(FINGERPRINTS_PATH, LEARNED_FINGERPRINTS_PATH)):
+    """
+    Load the reference hashes grouped by region, so each region is hashed once per screenshot.
+
+    Returns:
+        dict: region -> (screen types, bit matrix with one reference hash per row)
+    """
+    grouped = {}
+    for path in paths:
+        for entry in filter(is_active, read_entries(path)):
+            region = tuple(entry["region"])
+            grouped.setdefault(region, ([], []))
+            grouped[region][0].append(entry["screen_type"])
+            grouped[region][1].append(entry_bits(entry))
+
+    return {region: (types, np.array(hashes)) for region, (types, hashes) in grouped.items()}
+
+# Load the bank once
+FINGERPRINTS = load_fingerprints()
+
+def classify_screen(image, screen_types, fingerprints=FINGERPRINTS, max_distance=MAX_DISTANCE, min_margin=MIN_MARGIN):
+    """
+    Finds the reference screen closest to the screenshot without running OCR.
+    The closest screen type must be within max_distance and at least min_margin closer
+    than any other screen type (its LOOKALIKES excepted), otherwise the match is ambiguous.
+
+    Parameters:
+        image (np.array): The full screenshot.
+        screen_types (list): Screen types to consider, e.g. MATCH_SCREEN_TYPES.
+
+    Returns:
+        tuple: (screen type, distance) of the closest reference, else (None, None).
+    """
+    # Distance of the closest reference per screen type
+    closest = {}
+
+    for region, (types, hashes) in fingerprints.items():
+        candidates = np.array([screen_type in screen_types for screen_type in types])
+        if not candidates.any():
+            continue
+
+        cropped_image = crop_box(image, region)
+        if cropped_image.size == 0:
+            continue
+
+        query = difference_hash(cropped_image)
+        distances = (hashes[candidates] != query).mean(axis=1)
+
+        for screen_type, distance in zip(np.array(types)[candidates], distances):
+            closest[str(screen_type)] = min(float(distance), closest.get(str(screen_type), 1.0))
+
+    if not closest:
+        return None, None
+
+    best_type = min(closest, key=closest.get)
+    best_distance = closest[best_type]
+    if best_distance > max_distance:
+        return None, None
+
+    others = [
+        distance for screen_type, distance in closest.items()
+        if screen_type != best_type and screen_type not in LOOKALIKES.get(best_type, ())
+    ]
+    if others and min(others) - best_distance < min_margin:
+        return None, None
+
+    return best_type, best_distance
+
+def add_fingerprint(image, screen_type, fingerprints=FINGERPRINTS, path=LEARNED_FINGERPRINTS_PATH):
+    """
+    Learns the reference hash of a screenshot whose screen type the OCR detectors confirmed,
+    so later screenshots of that type skip OCR. A new hash starts as a candidate and is only used
+    once MIN_CONFIRMATIONS confirmed screenshots agree with it (within MAX_DISTANCE).
+    Stops after MAX_SAMPLES_PER_TYPE hashes per type.
+
+    Parameters:
+        image (np.array): The full screenshot.
+        screen_type (str): The confirmed screen type.
+
+    Returns:
+        bool: True if a hash became a reference in the bank.
+    """
+    if not FINGERPRINTS_LEARN or screen_type not in FINGERPRINT_REGIONS:
+        return False
+
+    region = FINGERPRINT_REGIONS[screen_type]
+    if crop_box(image, region).size == 0:
+        return False
+
+    entries = read_entries(path)
+    own = [entry for entry in entries if entry["screen_type"] == screen_type]
+    if sum(map(is_active, own)) >= MAX_SAMPLES_PER_TYPE:
+        return False
+
+    entry = make_entry(image, screen_type, "learned")
+    bits = entry_bits(entry)
+
+    # Agreeing with a pending candidate confirms it, otherwise this screenshot becomes a candidate
+    pending = [candidate for candidate in own if not is_active(candidate)]
+    candidate = next((candidate for candidate in pending if (entry_bits(candidate) != bits).mean() <= MAX_DISTANCE), None)
+    if candidate is None:
+        if len(pending) < MAX_SAMPLES_PER_TYPE:
+            entry["confirmations"] = 1
+            write_entries(entries + [entry], path)
+        return False
+
+    candidate["confirmations"] += 1
+    write_entries(entries, path)
+    if not is_active(candidate):
+        return False
+
+    types, hashes = fingerprints.get(region, ([], np.empty((0, HASH_SIZE * HASH_SIZE), dtype=np.uint8)))
+    fingerprints[region] = (types + [screen_type], np.vstack([hashes, entry_bits(candidate)]))
+    print(f"Learned fingerprint for {screen_type} ({sum(map(is_active, own))}/{MAX_SAMPLES_PER_TYPE})")
+    return True
+
+def build_fingerprints(sample_folder, path=FINGERPRINTS_PATH):
+    """
+    Builds the bank from labelled screenshots stored as <sample_folder>/<screen type>/*.png.
+    """
+    entries = []
+    for screen_type in sorted(os.listdir(sample_folder)):
+        folder = os.path.join(sample_folder, screen_type)
+        if not os.path.isdir(folder):
+            continue
+        if screen_type not in FINGERPRINT_REGIONS:
+            print(f"Skipped '{screen_type}': no fingerprint region for this screen type")
+            continue
+
+        for filename in sorted(os.listdir(folder)):
+            if not filename.endswith(".png"):
+                continue
+            image = cv2.imread(os.path.join(folder, filename))
+            entries.append(make_entry(image, screen_type, filename))
+        print(f"{screen_type}: {sum(entry['screen_type'] == screen_type for entry in entries)} samples")
+
+    write_entries(entries, path)
+    print(f"Wrote {len(entries)} fingerprints to {path}")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python fingerprints.py <folder with one subfolder of screenshots per screen type>")
+        sys.exit(1)
+
+    build_fingerprints(sys.argv[1])
@@ -1,5 +1,16 @@
+import math
+import threading
+
 import cv2
 import numpy as np
+from layout import base_box, frame_slices, is_base_resolution
+
+# Scratch buffers and CLAHE objects are per thread, OpenCV objects aren't safe to share
+_local = threading.local()
+# Scratch buffers kept per thread before the oldest shapes are dropped
+MAX_BUFFERS = 64
+
+SHARPEN_KERNEL = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]])
 
 def grayscale_image(image):
     """Convert the image to grayscale."""
@@ -22,8 +33,7 @@ def preprocess_image(image, upscale=True):
     blurred = cv2.GaussianBlur(gray, (3, 3), 0)
 
     # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    enhanced = clahe.apply(blurred)
+    enhanced = get_clahe(2.0, (8, 8)).apply(blurred)
 
     # Apply Otsu's thresholding
     _, thresh = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
@@ -96,3 +106,170 @@ def preprocess(image):
         return gray_image
     else:
         return image
+
+
+def get_clahe(clip_limit, tile_grid_size):
+    """CLAHE object for the given settings, created once per thread."""
+    cache = _local.__dict__.setdefault("clahe", {})
+    key = (clip_limit, tuple(tile_grid_size))
+    if key not in cache:
+        cache[key] = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tuple(tile_grid_size))
+    return cache[key]
+
+def _buffer(key, shape):
+    """Reusable scratch image for intermediate pipeline steps."""
+    buffers = _local.__dict__.setdefault("buffers", {})
+    key = (key, tuple(shape))
+    if key not in buffers:
+        if len(buffers) >= MAX_BUFFERS:
+            buffers.pop(next(iter(buffers)))
+        buffers[key] = np.empty(shape, dtype=np.uint8)
+    return buffers[key]
+
+class RegionPipeline:
+    """
+    Declarative preprocessing of one screen region: crop -> scale -> color -> threshold.
+
+    The region is always cropped before anything else, grayscale conversion is done before
+    scaling (a third of the pixels to resize) and intermediate steps write into reused buffers.
+    The returned image is always a new array, safe to keep and draw on.
+
+    Parameters:
+        coordinates (tuple): (x1, y1, x2, y2) of the region in the input image, None to process the whole input.
+        region (tuple): (screen type, name) of a region registered in the layout, instead of coordinates.
+                        The input is then a full frame of any resolution.
+        scale (float): Resize factor relative to the base resolution. Frames of other resolutions are
+                       resized straight to the scaled size, in the same single resize of the crop.
+        grayscale (bool): Convert to grayscale.
+        contrast (tuple): (alpha, beta) for cv2.convertScaleAbs.
+        blur (int): Gaussian blur kernel size.
+        sharpen (bool): Apply a 3x3 sharpening kernel.
+        clahe (tuple): (clip limit, tile grid size) for contrast limited histogram equalization.
+        threshold (str): "otsu" or "otsu_inv" binarization, requires grayscale.
+        fill (list): ((x1, y1, x2, y2), color) rectangles painted over the result to hide irrelevant text.
+        to_bgr (bool): Convert a grayscale result back to 3 channels.
+    """
+    def __init__(self, coordinates=None, region=None, scale=1.0, interpolation=cv2.INTER_LINEAR,
+                 grayscale=False, contrast=None, blur=None, sharpen=False, clahe=None, threshold=None,
+                 fill=(), to_bgr=False):
+        self.coordinates = coordinates
+        self.region = region
+        self.scale = scale
+        self.interpolation = interpolation
+        self.grayscale = grayscale
+        self.contrast = contrast
+        self.blur = blur
+        self.sharpen = sharpen
+        self.clahe = clahe
+        self.threshold = threshold
+        self.fill = fill
+        self.to_bgr = to_bgr
+
+    def __call__(self, image, coordinates=None):
+        """
+        Run the pipeline on a region of the image.
+
+        Parameters:
+            image (np.array): Full screenshot, or an already cropped region if no coordinates are set.
+            coordinates (tuple): Overrides the pipeline's coordinates, for regions found at runtime.
+        """
+        if coordinates is not None:
+            region, size, target = self.crop(image, coordinates)
+        elif self.region:
+            region, size, target = self.crop(image, base_box(*self.region), full_frame=True)
+        else:
+            region, size, target = self.crop(image, self.coordinates)
+
+        steps = self.steps(region.ndim == 3, size, target)
+        result = region
+        for index, step in enumerate(steps):
+            last = index == len(steps) - 1
+            result = step(result, lambda shape: None if last else _buffer((id(self), index), shape))
+
+        # Never hand out a view of the screenshot or of a scratch buffer
+        if not steps:
+            result = result.copy()
+
+        for (x1, y1, x2, y2), color in self.fill:
+            cv2.rectangle(result, (x1, y1), (x2, y2), color, thickness=-1)
+
+        return result
+
+    def crop(self, image, coordinates, full_frame=False):
+        """
+        Crop the source pixels needed for the region.
+        Coordinates in a full frame are in base resolution pixels and mapped to the frame's resolution.
+
+        Returns:
+            tuple: (cropped view, (width, height) to resize it to or None,
+                    (x offset, y offset, width, height) to trim after scaling or None)
+        """
+        if coordinates is None:
+            return image, self.scaled_size(image), None
+
+        # Whole source pixels covering the region, a fractional part outside it is trimmed after scaling
+        x1, y1, x2, y2 = coordinates
+        sx1, sy1 = max(math.floor(x1), 0), max(math.floor(y1), 0)
+        sx2, sy2 = math.ceil(x2), math.ceil(y2)
+
+        height, width = image.shape[:2]
+        if full_frame and not is_base_resolution(image):
+            # Mapped crop goes straight to the size the region has at base resolution times the scale
+            rows, columns = frame_slices((sx1, sy1, sx2, sy2), width, height)
+            cropped = image[rows, columns]
+            size = (round((sx2 - sx1) * self.scale), round((sy2 - sy1) * self.scale))
+        else:
+            cropped = image[sy1:sy2, sx1:sx2]
+            size = self.scaled_size(cropped)
+
+        target = None
+        if (sx1, sy1, sx2, sy2) != (x1, y1, x2, y2):
+            target = (round((x1 - sx1) * self.scale), round((y1 - sy1) * self.scale),
+                      round((x2 - x1) * self.scale), round((y2 - y1) * self.scale))
+
+        return cropped, size, target
+
+    def scaled_size(self, image):
+        """(width, height) of the image after scaling, None if it isn't scaled."""
+        if self.scale == 1:
+            return None
+        height, width = image.shape[:2]
+        return round(width * self.scale), round(height * self.scale)
+
+    def steps(self, is_color, size, target):
+        steps = []
+        if self.grayscale and is_color:
+            steps.append(lambda src, out: cv2.cvtColor(src, cv2.COLOR_BGR2GRAY, dst=out(src.shape[:2])))
+            is_color = False
+        if size:
+            steps.append(lambda src, out: self._resize(src, out, size, target))
+        elif target:
+            steps.append(lambda src, out: self._trim(src, target).copy())
+        if self.contrast:
+            alpha, beta = self.contrast
+            steps.append(lambda src, out: cv2.convertScaleAbs(src, dst=out(src.shape), alpha=alpha, beta=beta))
+        if self.blur:
+            steps.append(lambda src, out: cv2.GaussianBlur(src, (self.blur, self.blur), 0, dst=out(src.shape)))
+        if self.sharpen:
+            steps.append(lambda src, out: cv2.filter2D(src, -1, SHARPEN_KERNEL, dst=out(src.shape)))
+        if self.clahe:
+            clahe = get_clahe(*self.clahe)
+            steps.append(lambda src, out: clahe.apply(src, dst=out(src.shape)))
+        if self.threshold:
+            threshold_type = cv2.THRESH_BINARY_INV if self.threshold == "otsu_inv" else cv2.THRESH_BINARY
+            steps.append(lambda src, out: cv2.threshold(src, 0, 255, threshold_type + cv2.THRESH_OTSU, dst=out(src.shape))[1])
+        if self.to_bgr and not is_color:
+            steps.append(lambda src, out: cv2.cvtColor(src, cv2.COLOR_GRAY2BGR, dst=out(src.shape + (3,))))
+        return steps
+
+    def _resize(self, src, out, size, target):
+        resized = cv2.resize(src, size, dst=out((size[1], size[0]) + src.shape[2:]), interpolation=self.interpolation)
+        return self._trim(resized, target)
+
+    @staticmethod
+    def _trim(image, target):
+        if target is None:
+            return image
+
+        offset_x, offset_y, target_width, target_height = target
+        return image[offset_y:offset_y + target_height, offset_x:offset_x + target_width]
@@ -0,0 +1,107 @@
+from functools import lru_cache
+
+import cv2
+from screens.screen_layouts import MEASURED_RESOLUTION, SCREEN_LAYOUTS, UPSCALED_LAYOUTS
+
+# Resolution crops are returned at, whatever the capture resolution
+BASE_RESOLUTION = MEASURED_RESOLUTION
+
+# Frames whose aspect ratio is within this share of the base one count as the same aspect ratio
+ASPECT_TOLERANCE = 0.02
+
+# What has been verified: the regions were measured on, and checked against, 3440x1440 captures only.
+# Frames of other resolutions are mapped with per-axis scaling, i.e. the UI is assumed to stretch over the
+# whole frame. For other 21:9 resolutions (e.g. 2560x1080, 5120x2160) that's a plain uniform scale.
+# For other aspect ratios (e.g. 16:9 2560x1440) it's unverified: if the game lays a screen out differently
+# there, its regions need to be measured on such a capture and kept as a separate layout.
+
+# Regions per screen type: screen type -> name -> (x1, y1, x2, y2) normalized to 0-1 of the UI
+LAYOUTS = {}
+
+def register_layout(screen_type, regions, resolution=BASE_RESOLUTION):
+    """
+    Registers the regions of a screen type.
+
+    Parameters:
+        screen_type (str): Screen type the regions belong to.
+        regions (dict): name -> (x1, y1, x2, y2) in pixels of a capture at `resolution`.
+    """
+    width, height = resolution
+    layout = LAYOUTS.setdefault(screen_type, {})
+    for name, (x1, y1, x2, y2) in regions.items():
+        layout[name] = (x1 / width, y1 / height, x2 / width, y2 / height)
+
+for screen_type, regions in SCREEN_LAYOUTS.items():
+    register_layout(screen_type, regions)
+for screen_type, (resolution, regions) in UPSCALED_LAYOUTS.items():
+    register_layout(screen_type, regions, resolution)
+
+def base_box(screen_type, name):
+    """Registered region in (fractional) pixels of a BASE_RESOLUTION capture."""
+    x1, y1, x2, y2 = LAYOUTS[screen_type][name]
+    width, height = BASE_RESOLUTION
+    return x1 * width, y1 * height, x2 * width, y2 * height
+
+def region_box(screen_type, name):
+    """
+    Registered region in whole pixels of a BASE_RESOLUTION capture.
+    Crops of the region always come out at this size, whatever the capture resolution.
+    """
+    return tuple(round(value) for value in base_box(screen_type, name))
+
+@lru_cache(maxsize=None)
+def frame_geometry(width, height):
+    """
+    Scale from base pixels to frame pixels per axis: (x scale, y scale).
+    Computed once per resolution, warns once about resolutions of an unverified aspect ratio.
+    """
+    base_width, base_height = BASE_RESOLUTION
+    if abs((width / height) / (base_width / base_height) - 1) > ASPECT_TOLERANCE:
+        print(f"Capture is {width}x{height}, screen regions were measured on {base_width}x{base_height} (another "
+              f"aspect ratio). They're scaled per axis, which hasn't been verified for this aspect ratio.")
+    return width / base_width, height / base_height
+
+@lru_cache(maxsize=4096)
+def frame_slices(box, width, height):
+    """
+    Integer crop of a base-pixel box in a frame of the given size, computed once per resolution.
+
+    Returns:
+        tuple: (rows slice, columns slice)
+    """
+    scale_x, scale_y = frame_geometry(width, height)
+    x1, y1, x2, y2 = box
+    x1, x2 = (max(0, min(width, round(x * scale_x))) for x in (x1, x2))
+    y1, y2 = (max(0, min(height, round(y * scale_y))) for y in (y1, y2))
+    return slice(y1, y2), slice(x1, x2)
+
+def is_base_resolution(image):
+    height, width = image.shape[:2]
+    return (width, height) == BASE_RESOLUTION
+
+def crop_box(image, box):
+    """
+    Crops a box given in base pixels out of a frame of any resolution.
+    At the base resolution this is a plain view, otherwise only the crop is resized to the box's size.
+    """
+    box = tuple(int(value) for value in box)
+    if is_base_resolution(image):
+        x1, y1, x2, y2 = box
+        return image[max(y1, 0):y2, max(x1, 0):x2]
+
+    height, width = image.shape[:2]
+    rows, columns = frame_slices(box, width, height)
+    cropped = image[rows, columns]
+    if cropped.size == 0:
+        return cropped
+
+    return cv2.resize(cropped, (box[2] - box[0], box[3] - box[1]), interpolation=cv2.INTER_LINEAR)
+
+def crop_layout(image, screen_type, name):
+    """Crops a registered region of a frame of any resolution, at base resolution size."""
+    return crop_box(image, region_box(screen_type, name))
+
+def frame_scale(image):
+    """Scale from base pixels to pixels of this frame per axis: (x scale, y scale)."""
+    height, width = image.shape[:2]
+    return frame_geometry(width, height)
@@ -1,28 +1,41 @@
 import asyncio 
-import win32api
-import win32con
+import time
 
 from actions.handle_screenshot import handle_screenshot
 from actions.handle_refresh import handle_refresh
 from actions.handle_optional_screens import handle_optional_screens
 from auth import load_session, restore_or_authenticate
 from cache import load_selected_team
+from continuous_capture import CONTINUOUS_CAPTURE, ContinuousCapture
 from database import get_user_teams
-from ocr_manager import initialize_paddleocr
-from overlay import OverlayWindow
+from ocr_manager import shutdown_ocr, warm_up_ocr
+from platform_backends import create_capture, create_input, create_overlay
 from priority import set_highest_priority, set_normal_priority
 from reports.handle_report_submission import handle_report_submission
 from reports.load_incomplete_reports import load_incomplete_reports
 from reports.abort_report import abort_report
-from screenshot import take_screenshot
+from screens.detect_match_screen_type import SCHEDULER
+from screenshot import screenshot_writer, take_screenshot
 from select_team import select_team
 from show_missing_screens import show_missing_screens
 
 running = True  # Global flag to control the main process
 
-async def start_main_process(user_id, selected_team, overlay):
+async def start_main_process(user_id, selected_team, overlay, capture=None, keys=None):
+    """
+    Runs the hotkey loop until shutdown.
+
+    Parameters:
+        capture: Capture backend, the configured platform's by default.
+        keys: Input backend, the configured platform's by default. The loop ends once it has no input left.
+    """
     global running
 
+    capture = capture or create_capture()
+    keys = keys or create_input()
+    # Hands-free mode picks up new screens by itself, F12 still works
+    continuous = ContinuousCapture(capture) if CONTINUOUS_CAPTURE else None
+
     print(f"Monitoring screenshots for team: {selected_team['teamName']}")
 
     # Load incomplete reports if any exist
@@ -40,23 +53,32 @@ async def start_main_process(user_id, selected_team, overlay):
     while running:
         try:
             # Detect keypress actions
-            action_refresh = (win32api.GetAsyncKeyState(win32con.VK_F5) & 0x8000) != 0
-            action_screenshot = (win32api.GetAsyncKeyState(win32con.VK_F12) & 0x8000) != 0
-            action_submit = (win32api.GetAsyncKeyState(win32con.VK_F10) & 0x8000) != 0
-            action_abort = (win32api.GetAsyncKeyState(win32con.VK_F3) & 0x8000) != 0  # Abort report with F3
-
-            # Handle screenshot action
+            action_refresh = keys.is_pressed("F5")
+            action_screenshot = keys.is_pressed("F12")
+            action_submit = keys.is_pressed("F10")
+            action_abort = keys.is_pressed("F3")  # Abort report with F3
+
+            # Handle screenshot action, or a new screen found in continuous mode
+            frame = None
+            started = time.perf_counter()
             if action_screenshot:
-                set_highest_priority()
                 overlay.show("Screenshotting..", duration=3)
+                frame, _ = take_screenshot(grab=capture.grab)
+            elif continuous:
+                frame = continuous.poll()
+                if frame is not None:
+                    screenshot_writer.archive(frame)
 
-                screenshot_path = take_screenshot()
-                report, report_type = await handle_screenshot(screenshot_path, report, report_type, user_id, selected_team, overlay)
+            if frame is not None:
+                set_highest_priority()
+
+                report, report_type = await handle_screenshot(frame, report, report_type, user_id, selected_team, overlay)
 
                 # Handle optional screens logic
                 if report_type and handle_optional_screens(report, report_type, overlay):
                     report_type = None  # Reset after submission
 
+                print(f"Screenshot handled in {time.perf_counter() - started:.2f}s")
                 set_normal_priority()
 
             if action_submit:
@@ -77,6 +99,10 @@ async def start_main_process(user_id, selected_team, overlay):
 
                 report = load_incomplete_reports(overlay)
 
+            # Scripted input (and in continuous mode the frames) ran out
+            if keys.finished and (not continuous or capture.finished):
+                break
+
             await asyncio.sleep(0.1)
 
         except KeyboardInterrupt:
@@ -85,6 +111,7 @@ async def start_main_process(user_id, selected_team, overlay):
             overlay.close()
             break
 
+    SCHEDULER.print_stats()
     print("Exited main process.")
 
 def signal_handler(sig, frame):
@@ -95,8 +122,8 @@ def signal_handler(sig, frame):
 async def main():
     global running
 
-    overlay = OverlayWindow()  # Initialize overlay
-    asyncio.create_task(initialize_paddleocr())
+    overlay = create_overlay()  # Initialize overlay
+    asyncio.create_task(warm_up_ocr())  # Warm up OCR in the background
 
     try:
         # Step 1: Load session from file
@@ -153,6 +180,9 @@ async def main():
     finally:
         print("Cleaning up resources...")
         overlay.close()
+        # The writer thread is a daemon, queued archives would be lost on exit
+        screenshot_writer.flush()
+        shutdown_ocr()
 
 
 if __name__ == "__main__":
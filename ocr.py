@@ -1,26 +1,37 @@
 import logging
 import os
+import time
+from collections import Counter
 import cv2
 import numpy as np
-from ocr_manager import get_ocr_instance
+from digits import DIGITS_ENABLED, THRESHOLD as DIGIT_THRESHOLD, read_digits
+from ocr_backends import DET_LIMIT_SIDE_LEN, OCR_BACKEND
+from ocr_cache import MISS, ocr_cache
+from ocr_manager import run_easyocr, run_ocr
+from ocr_result import OcrResult
 
-#reader = easyocr.Reader(['en'], gpu=True)
 logging.getLogger("ppocr").setLevel(logging.ERROR)
 
+# Empty space between crops in a batch mosaic so detections never merge across crops
+BATCH_PADDING = 32
+
+# How a region is read by ocr_regions
+FULL_OCR = "full"  # Text detection + angle classification + recognition
+RECOGNIZE_ONLY = "recognize_only"  # Recognition only, for single short tokens at a known spot
+DIGITS = "digits"  # Glyph templates for numeric fields, recognition only when the templates are unsure
+
 async def extract_text_from_image(image):
     """
     Extracts text from the given image using PaddleOCR.
     Accepts either an image path (string) or a NumPy image array.
     """
-    ocr = await get_ocr_instance()
-
     # Check if the input is a file path or an image array
     if isinstance(image, str):  # File path
-        result = ocr.ocr(image)
+        result = await run_ocr(image)
     elif isinstance(image, np.ndarray):  # Image array
         # Convert the image array to a format compatible with PaddleOCR (RGB)
         image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        result = ocr.ocr(image_rgb, cls=True)
+        result = await cached_ocr(image_rgb, cls=True)
     else:
         raise ValueError("Invalid input type for 'image'. Expected file path or NumPy array.")
 
@@ -60,46 +71,315 @@ def extract_number_value2(ocr_result):
 
     return None
 
-def annotate_ocr_results(image, folder, ocr_results):
+def annotate_ocr_results(image, folder, ocr_results, scale=(1, 1)):
     """
     Annotate the image with bounding boxes around OCR results and save the annotated image.
+    Draws on a copy, the image may be a view into a shared frame.
+    Boxes are multiplied by scale, e.g. layout.frame_scale(image) for base-pixel boxes on a frame.
     """
+    image = image.copy()
+    scale_x, scale_y = scale
 
     # Step 4: Annotate the image with bounding boxes around recognized text
-    for result in ocr_results:
-        for line in result:
-            bbox = line[0]  # Get bounding box coordinates
-            # Draw a red bounding box around each OCR result
-            cv2.rectangle(image, 
-                          (int(bbox[0][0]), int(bbox[0][1])), 
-                          (int(bbox[2][0]), int(bbox[2][1])), 
-                          (255, 0, 0), 2)  # Red bounding box
+    for bbox, _, _ in parse_ocr(ocr_results):
+        # Draw a red bounding box around each OCR result
+        cv2.rectangle(image, 
+                      (int(bbox[0][0] * scale_x), int(bbox[0][1] * scale_y)), 
+                      (int(bbox[2][0] * scale_x), int(bbox[2][1] * scale_y)), 
+                      (255, 0, 0), 2)  # Red bounding box
 
     # Save the annotated image
     cv2.imwrite(os.path.join(folder, f"annotated_image.png"), image)
 
+def scale_ocr_result(ocr_result, scale_x, scale_y):
+    """
+    Maps the boxes of an OCR result from frame pixels to base pixels, given the frame's layout scale.
+
+    Returns:
+        list: PaddleOCR-style result with every point divided by the scale.
+    """
+    if (scale_x, scale_y) == (1, 1):
+        return ocr_result
+
+    lines = [[[[point[0] / scale_x, point[1] / scale_y] for point in bbox], (text, confidence)]
+             for bbox, text, confidence in parse_ocr(ocr_result)]
+    return [lines] if lines else [None]
+
+async def cached_ocr(image, **kwargs):
+    """Runs OCR through the result cache, keyed by the image content and OCR parameters."""
+    key = ocr_cache.make_key(image, (OCR_BACKEND, "ocr", sorted(kwargs.items())))
+    ocr_result = ocr_cache.get(key)
+
+    if ocr_result is MISS:
+        ocr_result = await run_ocr(image, **kwargs)
+        ocr_cache.put(key, ocr_result)
+
+    return ocr_result
+
 async def paddleocr(image):
-    ocr = await get_ocr_instance()
-    ocr_result = ocr.ocr(image)
+    ocr_result = await cached_ocr(image)
     
     return ocr_result
 
-def easyocr_number(image):
+async def paddleocr_result(image):
+    """Runs OCR on the image and returns the result as an OcrResult."""
+    return OcrResult.from_paddle(await paddleocr(image))
+
+def crop_size(image):
+    """(width, height) of a crop, None for empty crops."""
+    return (image.shape[1], image.shape[0]) if image is not None and image.size > 0 else None
+
+def place_crops(sizes, row_width, padding=BATCH_PADDING):
+    """
+    Places crops row by row, starting a new row when the next crop would pass row_width.
+
+    Returns:
+        tuple: (placements, (width, height)) with an (x, y, w, h) tuple per size, None for empty crops.
+    """
+    placements = []
+    x, y, row_height = padding, padding, 0
+    for size in sizes:
+        if size is None:
+            placements.append(None)
+            continue
+
+        w, h = size
+        if x + w + padding > row_width and x > padding:
+            # Start a new row
+            x = padding
+            y += row_height + padding
+            row_height = 0
+
+        placements.append((x, y, w, h))
+        x += w + padding
+        row_height = max(row_height, h)
+
+    width = max((px + pw for px, _, pw, _ in filter(None, placements)), default=0) + padding
+    return placements, (width, y + row_height + padding)
+
+def plan_batches(images, max_side=DET_LIMIT_SIDE_LEN, padding=BATCH_PADDING):
+    """
+    Splits crops into batches whose mosaic fits within max_side on both axes,
+    so the detector never downscales the crops (e.g. values upscaled for small text).
+    A crop that doesn't fit on its own gets a batch of its own.
+
+    Returns:
+        list: Lists of indices into images, in order. Empty crops are left out.
+    """
+    batches = []
+    batch = []
+    for index, image in enumerate(images):
+        if crop_size(image) is None:
+            continue
+
+        candidate = batch + [index]
+        _, (width, height) = place_crops([crop_size(images[i]) for i in candidate], max_side, padding)
+        if batch and (width > max_side or height > max_side):
+            batches.append(batch)
+            candidate = [index]
+        batch = candidate
+
+    if batch:
+        batches.append(batch)
+    return batches
+
+def build_mosaic(images, padding=BATCH_PADDING, max_side=DET_LIMIT_SIDE_LEN):
+    """
+    Packs crops into a single roughly square canvas, row by row.
+
+    Parameters:
+        images (list): Crops as NumPy arrays (grayscale or BGR).
+        padding (int): Empty pixels around every crop.
+        max_side (int): Side the canvas should stay within, see plan_batches.
+
+    Returns:
+        tuple: (mosaic, placements) where placements holds an (x, y, w, h) tuple
+               for every crop, or None for empty crops that were left out.
+    """
+    sizes = [crop_size(image) for image in images]
+    placed_sizes = [size for size in sizes if size]
+    if not placed_sizes:
+        return None, [None] * len(images)
+
+    # Aim for a square canvas, fall back to full-width rows when the square one passes the side limit
+    total_area = sum((w + padding) * (h + padding) for w, h in placed_sizes)
+    widest = max(w for w, _ in placed_sizes) + 2 * padding
+    placements, (mosaic_width, mosaic_height) = place_crops(sizes, max(widest, int(np.sqrt(total_area))), padding)
+    if max(mosaic_width, mosaic_height) > max_side:
+        placements, (mosaic_width, mosaic_height) = place_crops(sizes, max(widest, max_side), padding)
+
+    mosaic = np.zeros((mosaic_height, mosaic_width, 3), dtype=np.uint8)
+
+    for image, placement in zip(images, placements):
+        if placement is None:
+            continue
+        px, py, pw, ph = placement
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        mosaic[py:py + ph, px:px + pw] = image[:, :, :3]
+
+    return mosaic, placements
+
+def split_mosaic_result(ocr_result, placements):
+    """
+    Assigns detections from a mosaic OCR pass back to the crops they belong to.
+    Boxes are translated into each crop's own coordinates.
+
+    Returns:
+        list: One PaddleOCR-style result per crop, [None] when nothing was found.
+    """
+    per_crop = [[] for _ in placements]
+
+    for bbox, text, confidence in parse_ocr(ocr_result):
+        center_x = sum(point[0] for point in bbox) / len(bbox)
+        center_y = sum(point[1] for point in bbox) / len(bbox)
+
+        for index, placement in enumerate(placements):
+            if placement is None:
+                continue
+            px, py, pw, ph = placement
+            if px <= center_x < px + pw and py <= center_y < py + ph:
+                local_bbox = [[point[0] - px, point[1] - py] for point in bbox]
+                per_crop[index].append([local_bbox, (text, confidence)])
+                break
+
+    return [[lines] if lines else [None] for lines in per_crop]
+
+async def paddleocr_batch(images):
+    """
+    Runs OCR for many crops in as few inference calls as possible.
+    The crops are packed into mosaics no larger than the detector's side limit,
+    detected and recognized together, and the detections are mapped back to their crops.
+
+    Parameters:
+        images (list): Crops as NumPy arrays.
+
+    Returns:
+        list: PaddleOCR-style results in the same order as the crops.
+    """
+    if not images:
+        return []
+
+    # Only crops that aren't cached go into the mosaic
+    keys = [ocr_cache.make_key(image, (OCR_BACKEND, "batch")) for image in images]
+    results = [ocr_cache.get(key) for key in keys]
+    missing = [index for index, result in enumerate(results) if result is MISS]
+    if not missing:
+        return results
+
+    crop_results = {index: [None] for index in missing}
+    for batch in plan_batches([images[index] for index in missing]):
+        batch = [missing[position] for position in batch]
+        mosaic, placements = build_mosaic([images[index] for index in batch])
+        ocr_result = await run_ocr(mosaic)
+        crop_results.update(zip(batch, split_mosaic_result(ocr_result, placements)))
+
+    for index, crop_result in crop_results.items():
+        ocr_cache.put(keys[index], crop_result)
+        results[index] = crop_result
+
+    return results
+
+async def recognize_only(crops):
+    """
+    Reads crops that already contain exactly one line of text.
+    Skips text detection and angle classification and recognizes all crops in one batch.
+
+    Parameters:
+        crops (list): Crops as NumPy arrays, each tightly around one short token.
+
+    Returns:
+        list: (text, confidence) per crop, ("", 0.0) for empty crops.
+    """
+    texts = [("", 0.0)] * len(crops)
+    keys = {}
+    prepared = []
+    for index, crop in enumerate(crops):
+        if crop is None or crop.size == 0:
+            continue
+
+        key = ocr_cache.make_key(crop, (OCR_BACKEND, "recognize_only"))
+        cached = ocr_cache.get(key)
+        if cached is not MISS:
+            texts[index] = cached
+            continue
+
+        if crop.ndim == 2:
+            crop = cv2.cvtColor(crop, cv2.COLOR_GRAY2BGR)
+        keys[index] = key
+        prepared.append(crop)
+
+    if not prepared:
+        return texts
+
+    recognized = iter(await run_ocr(prepared, method="recognize"))
+
+    for index, key in keys.items():
+        text, confidence = next(recognized, ("", 0.0))
+        texts[index] = (text, float(confidence))
+        ocr_cache.put(key, texts[index])
+
+    return texts
+
+def recognition_to_ocr_result(text, confidence, crop):
+    """Wraps a recognize_only result in the PaddleOCR result format, with the whole crop as the box."""
+    if not text:
+        return [None]
+
+    h, w = crop.shape[:2]
+    bbox = [[0, 0], [w, 0], [w, h], [0, h]]
+    return [[[bbox, (text, confidence)]]]
+
+async def ocr_regions(regions):
+    """
+    Reads a set of named regions, each with its own mode (FULL_OCR, RECOGNIZE_ONLY or DIGITS).
+    Full regions share one batched OCR pass, recognize-only regions share one recognition batch.
+    Digit regions are read with the glyph templates and join the recognition batch below DIGIT_THRESHOLD,
+    or straight away when the template reader is off (digits.DIGITS_ENABLED).
+
+    Parameters:
+        regions (dict): name -> (crop, mode)
+
+    Returns:
+        dict: name -> PaddleOCR-style result
+    """
+    full_names = [name for name, (_, mode) in regions.items() if mode == FULL_OCR]
+    rec_names = [name for name, (_, mode) in regions.items() if mode == RECOGNIZE_ONLY]
+
+    results = {}
+    for name, (crop, mode) in regions.items():
+        if mode != DIGITS:
+            continue
+        if not DIGITS_ENABLED:
+            rec_names.append(name)
+            continue
+        text, confidence = read_digits(crop)
+        if confidence >= DIGIT_THRESHOLD:
+            results[name] = recognition_to_ocr_result(text, confidence, crop)
+        else:
+            rec_names.append(name)
+
+    full_results = await paddleocr_batch([regions[name][0] for name in full_names]) if full_names else []
+    rec_results = await recognize_only([regions[name][0] for name in rec_names]) if rec_names else []
+
+    results.update(zip(full_names, full_results))
+    for name, (text, confidence) in zip(rec_names, rec_results):
+        results[name] = recognition_to_ocr_result(text, confidence, regions[name][0])
+
+    return results
+
+async def easyocr_number(image):
     """
-    This function parses EasyOCR results and extracts the number or letter 'O'.
+    Reads the image with the shared EasyOCR reader and extracts the number or letter 'O'.
     
     Args:
-        ocr_results (list): OCR output in the form of a list of bounding box, text, and confidence score.
+        image (np.array): The image to read.
     
     Returns:
         str: The extracted number or the letter 'O' from the OCR output. 
         Returns None if no valid number or 'O' is found.
     """
-    import easyocr 
-    reader = easyocr.Reader(['en'], gpu=True)
-
-    ocr_result = reader.readtext(image)
-    ocr_result = []
+    ocr_result = await run_easyocr(image)
 
     for result in ocr_result:
         # Each result consists of [bounding box, text, confidence]
@@ -117,6 +397,68 @@ def easyocr_number(image):
     # If no number or 'O' is found, return None
     return None
 
+# Strategies for OcrCascade: async image -> value (None when nothing was read)
+
+async def digits_strategy(image):
+    """Glyph template read, only trusted above DIGIT_THRESHOLD."""
+    text, confidence = read_digits(image)
+    return text if confidence >= DIGIT_THRESHOLD else None
+
+async def number_strategy(image):
+    """Full OCR, first number found."""
+    return extract_number_value(await paddleocr(image))
+
+def preprocessed(strategy, preprocess):
+    """Wraps a strategy so it runs on a preprocessed copy of the image (e.g. grayscale_image)."""
+    async def run(image):
+        return await strategy(preprocess(image))
+    return run
+
+def is_number(value):
+    """Validator for numeric fields: an int, or a string of digits with at most one decimal point."""
+    return value is not None and str(value).strip().replace('.', '', 1).isdigit()
+
+class OcrCascade:
+    """
+    Ordered OCR strategies for one kind of field, cheapest first.
+    Runs the stages in order and stops at the first value that passes the validator,
+    or when the time budget is spent. Counts which stage produced each value.
+
+    Parameters:
+        stages (list): (name, strategy) pairs, strategy is an async function image -> value.
+        validator (callable): Returns True for an acceptable value.
+        budget (float): Seconds after which no further stage is started, None for no limit.
+    """
+    def __init__(self, stages, validator=is_number, budget=None):
+        self.stages = stages
+        self.validator = validator
+        self.budget = budget
+        self.stage_counts = Counter()
+
+    async def run(self, image):
+        """
+        Returns:
+            tuple: (value, stage name) of the first valid read, or (None, None).
+        """
+        start_time = time.perf_counter()
+
+        for index, (name, strategy) in enumerate(self.stages):
+            if index and self.budget is not None and time.perf_counter() - start_time > self.budget:
+                print(f"OCR cascade stopped before '{name}': time budget of {self.budget}s spent")
+                break
+
+            value = await strategy(image)
+            if self.validator(value):
+                self.stage_counts[name] += 1
+                return value, name
+
+        self.stage_counts[None] += 1
+        return None, None
+
+    def print_stats(self):
+        counts = ", ".join(f"{name or 'failed'}: {count}" for name, count in self.stage_counts.most_common())
+        print(f"OCR cascade stages: {counts}")
+
 def parse_ocr(ocr_data):
     """
     A helper function to iterate through OCR data, yielding bounding box and text.
@@ -127,6 +469,10 @@ def parse_ocr(ocr_data):
     Yields:
         tuple: A tuple containing (bbox, text, confidence) for each OCR item.
     """
+    if isinstance(ocr_data, OcrResult):
+        yield from ocr_data
+        return
+
     if not ocr_data:
         return None
 
@@ -0,0 +1,172 @@
+import os
+from typing import Protocol
+
+import cv2
+import numpy as np
+from timed_import import timed_import
+
+# Which engine runs OCR: "paddle", "onnx" (PaddleOCR models on ONNX Runtime, CPU) or "stub"
+OCR_BACKEND = os.environ.get("FCORE_OCR_BACKEND", "paddle")
+# Run inference on the GPU where the engine supports it, set to 0 on hosts without one
+OCR_USE_GPU = os.environ.get("FCORE_OCR_GPU", "1") not in ("0", "false", "False", "")
+# Longest side the text detector works at, larger images are downscaled before detection (PaddleOCR's default)
+DET_LIMIT_SIDE_LEN = int(os.environ.get("FCORE_DET_LIMIT_SIDE_LEN", 960))
+
+class OcrBackend(Protocol):
+    """
+    Interface every OCR engine implements.
+    All results use PaddleOCR's formats so screen processors don't depend on the engine.
+    """
+    name: str
+
+    def detect(self, image):
+        """Returns the text boxes found in the image as a list of 4-point boxes."""
+        ...
+
+    def recognize(self, crops):
+        """Reads crops that each hold one line of text, returns (text, confidence) per crop."""
+        ...
+
+    def ocr(self, image, det=True, rec=True, cls=True):
+        """PaddleOCR-compatible call: [[bbox, (text, confidence)], ...] per image."""
+        ...
+
+class PaddleOCRBackend:
+    """PaddleOCR with angle classification."""
+    name = "paddle"
+
+    def __init__(self, use_gpu=OCR_USE_GPU):
+        PaddleOCR = timed_import('paddleocr', 'PaddleOCR')
+        self.engine = PaddleOCR(
+            use_angle_cls=True, lang='en', use_gpu=use_gpu,
+            det_limit_side_len=DET_LIMIT_SIDE_LEN, det_limit_type='max'
+        )
+
+    def detect(self, image):
+        result = self.engine.ocr(image, rec=False)
+        return result[0] if result and result[0] else []
+
+    def recognize(self, crops):
+        if not crops:
+            return []
+        # The recognizer batches the whole list itself (rec_batch_num crops per forward pass).
+        # Calling it directly avoids ocr()'s list handling, which differs between PaddleOCR versions
+        # (2.8.1 treats a nested list as a single image).
+        recognized, _ = self.engine.text_recognizer(list(crops))
+        return [(text, float(confidence)) for text, confidence in recognized]
+
+    def ocr(self, image, det=True, rec=True, cls=True):
+        return self.engine.ocr(image, det=det, rec=rec, cls=cls)
+
+class OnnxOcrBackend:
+    """
+    The PaddleOCR detection, angle and recognition models exported to ONNX and run with ONNX Runtime.
+    Much faster than Paddle's CPU inference on hosts without a GPU.
+    Uses the rapidocr_onnxruntime package from requirements.txt.
+    """
+    name = "onnx"
+
+    def __init__(self, use_gpu=OCR_USE_GPU):
+        RapidOCR = timed_import('rapidocr_onnxruntime', 'RapidOCR')
+        self.engine = RapidOCR(
+            det_use_cuda=use_gpu, cls_use_cuda=use_gpu, rec_use_cuda=use_gpu,
+            det_limit_side_len=DET_LIMIT_SIDE_LEN, det_limit_type='max'
+        )
+
+    def detect(self, image):
+        boxes, _ = self.engine(image, use_det=True, use_cls=False, use_rec=False)
+        return [np.asarray(box).tolist() for box in boxes] if boxes is not None else []
+
+    def recognize(self, crops):
+        if not crops:
+            return []
+        # The recognition model runs the whole list in width-sorted batches (rec_batch_num crops each)
+        recognized, _ = self.engine.text_rec(list(crops))
+        return [(text, float(confidence)) for text, confidence, *_ in recognized]
+
+    def ocr(self, image, det=True, rec=True, cls=True):
+        # Mirror PaddleOCR's batch form for recognition: a list of crops is one batch
+        if not det:
+            return [self.recognize(image if isinstance(image, list) else [image])]
+
+        if isinstance(image, str):
+            image = cv2.imread(image)
+
+        result, _ = self.engine(image, use_det=True, use_cls=cls, use_rec=rec)
+        if not result:
+            return [None]
+        if not rec:
+            return [[np.asarray(box).tolist() for box in result]]
+        return [[[np.asarray(box).tolist(), (text, float(confidence))] for box, text, confidence in result]]
+
+class StubOcrBackend:
+    """
+    Deterministic engine for tests and offline runs.
+    Reads text from `responses` (keyed by ocr_cache.OcrCache.make_key of the image) and
+    reports one box covering the whole image for every non-blank image.
+    """
+    name = "stub"
+
+    def __init__(self, responses=None):
+        self.responses = responses or {}
+
+    def _text(self, image):
+        from ocr_cache import OcrCache
+        return self.responses.get(OcrCache.make_key(image), ("", 0.0))
+
+    @staticmethod
+    def _full_box(image):
+        h, w = image.shape[:2]
+        return [[0, 0], [w, 0], [w, h], [0, h]]
+
+    def detect(self, image):
+        if image.size == 0 or image.min() == image.max():
+            return []
+        return [self._full_box(image)]
+
+    def recognize(self, crops):
+        return [self._text(crop) for crop in crops]
+
+    def ocr(self, image, det=True, rec=True, cls=True):
+        if not det:
+            return [self.recognize(image if isinstance(image, list) else [image])]
+
+        if isinstance(image, str):
+            image = cv2.imread(image)
+
+        boxes = self.detect(image)
+        if not boxes:
+            return [None]
+        if not rec:
+            return [boxes]
+
+        text, confidence = self._text(image)
+        return [[[boxes[0], (text, confidence)]]] if text else [None]
+
+BACKENDS = {
+    PaddleOCRBackend.name: PaddleOCRBackend,
+    OnnxOcrBackend.name: OnnxOcrBackend,
+    StubOcrBackend.name: StubOcrBackend,
+}
+
+def create_ocr_backend(name=OCR_BACKEND):
+    """Create an instance of the configured OCR backend (blocking, loads the models)."""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown OCR backend '{name}', expected one of: {', '.join(BACKENDS)}")
+
+    return backend_class()
+
+if __name__ == "__main__":
+    # Smoke check of the configured backend: recognizes two rendered crops in one batch
+    crops = []
+    for text in ("FCORE", "2024"):
+        crop = np.full((48, 200, 3), 255, dtype=np.uint8)
+        cv2.putText(crop, text, (10, 36), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 2)
+        crops.append(crop)
+
+    backend = create_ocr_backend()
+    recognized = backend.recognize(crops)
+    print(f"{backend.name}: {recognized}")
+    assert len(recognized) == len(crops), "Expected one result per crop"
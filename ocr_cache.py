@@ -0,0 +1,210 @@
+import copy
+import hashlib
+import json
+import os
+import queue
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Number of OCR results kept in memory
+OCR_CACHE_ENTRIES = int(os.environ.get("FCORE_OCR_CACHE_ENTRIES", 1024))
+# Folder for the opt-in on-disk tier (e.g. local_cache/ocr), unset or empty keeps the cache in memory only
+OCR_CACHE_DIR = os.environ.get("FCORE_OCR_CACHE_DIR", "")
+# Size limit for the on-disk tier, oldest entries are evicted first
+OCR_CACHE_MAX_BYTES = int(os.environ.get("FCORE_OCR_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Returned by get() when the key isn't cached (None is a valid OCR result)
+MISS = object()
+
+def _encode(value):
+    """Turn an OCR result into JSON-safe data, tagging tuples so they survive the round trip."""
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return _encode(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _decode_hook(obj):
+    if "__tuple__" in obj:
+        return tuple(obj["__tuple__"])
+    return obj
+
+class OcrCache:
+    """
+    Content-addressed cache for OCR results.
+    Results are keyed by a hash of the image pixels and the OCR parameters,
+    kept in an in-memory LRU and optionally persisted to disk with size-based eviction.
+    Disk writes and eviction run on a background thread, put() never blocks on file IO.
+    """
+    def __init__(self, max_entries=OCR_CACHE_ENTRIES, directory=OCR_CACHE_DIR, max_bytes=OCR_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.directory = directory or None
+        self.max_bytes = max_bytes
+
+        self.memory = OrderedDict()
+        self.disk_sizes = None  # Lazily scanned {key: size in bytes}
+        self.disk_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # Entries waiting to be written to disk, only touched by the writer thread afterwards
+        self.pending = queue.Queue()
+        self.writer = None
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(image, params=""):
+        """Hash the image content (shape, dtype and pixels) together with the OCR parameters."""
+        hasher = hashlib.blake2b(digest_size=16)
+        if isinstance(image, np.ndarray):
+            hasher.update(f"{image.shape}{image.dtype}".encode())
+            hasher.update(np.ascontiguousarray(image).data)
+        else:
+            hasher.update(repr(image).encode())
+        hasher.update(repr(params).encode())
+        return hasher.hexdigest()
+
+    def get(self, key):
+        """Returns the cached result for key, or MISS."""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.memory_hits += 1
+            return copy.deepcopy(self.memory[key])
+
+        result = self._read_disk(key)
+        if result is not MISS:
+            self.disk_hits += 1
+            self._remember(key, result)
+            return copy.deepcopy(result)
+
+        self.misses += 1
+        return MISS
+
+    def put(self, key, result):
+        """Stores a result in memory and, if enabled, queues it to be written to disk."""
+        self._remember(key, copy.deepcopy(result))
+        if not self.directory:
+            return
+
+        # Encoded now, the caller may change the result afterwards
+        self.pending.put((key, _encode(result)))
+        if self.writer is None or not self.writer.is_alive():
+            self.writer = threading.Thread(target=self._run_writer, name="ocr-cache-writer", daemon=True)
+            self.writer.start()
+
+    def flush(self):
+        """Blocks until every queued entry is on disk."""
+        self.pending.join()
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def print_stats(self):
+        stats = self.stats()
+        print(f"OCR cache: {stats['memory_hits']} memory hits, {stats['disk_hits']} disk hits, "
+              f"{stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+
+    def _remember(self, key, result):
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return MISS
+
+        path = self._path(key)
+        try:
+            with open(path, "r") as cache_file:
+                result = json.load(cache_file, object_hook=_decode_hook)
+        except (OSError, ValueError):
+            return MISS
+
+        # Touch the file so eviction treats it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return result
+
+    def _scan_disk(self):
+        """Builds the size index of the on-disk tier once."""
+        self.disk_sizes = {}
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                self.disk_sizes[entry.name[:-5]] = entry.stat().st_size
+        self.disk_bytes = sum(self.disk_sizes.values())
+
+    def _run_writer(self):
+        while True:
+            key, encoded = self.pending.get()
+            try:
+                self._write_disk(key, encoded)
+            except Exception as e:
+                print(f"Failed to write OCR cache entry: {e}")
+            finally:
+                self.pending.task_done()
+
+    def _write_disk(self, key, encoded):
+        if self.disk_sizes is None:
+            self._scan_disk()
+
+        payload = json.dumps(encoded)
+        try:
+            with open(self._path(key), "w") as cache_file:
+                cache_file.write(payload)
+        except OSError as e:
+            print(f"Failed to write OCR cache entry: {e}")
+            return
+
+        self.disk_bytes += len(payload) - self.disk_sizes.get(key, 0)
+        self.disk_sizes[key] = len(payload)
+
+        if self.disk_bytes > self.max_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Removes the least recently used files until the tier is back under its size limit."""
+        entries = []
+        for key in self.disk_sizes:
+            try:
+                entries.append((os.path.getmtime(self._path(key)), key))
+            except OSError:
+                entries.append((0, key))
+        entries.sort()
+
+        # Trim to 90% of the limit so eviction doesn't run on every write
+        target = self.max_bytes * 0.9
+        for _, key in entries:
+            if self.disk_bytes <= target:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self.disk_bytes -= self.disk_sizes.pop(key)
+
+# Shared cache used by the OCR helpers
+ocr_cache = OcrCache()
@@ -1,27 +1,227 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from functools import partial
 import asyncio
+import os
+import queue
+import threading
+import numpy as np
+from ocr_backends import OCR_BACKEND, OCR_USE_GPU, create_ocr_backend
 from timed_import import timed_import
 
+# Number of OCR calls that may run at the same time.
+# Every slot owns its own OCR backend instance (a few hundred MB each), so the default stays small
+# instead of following the CPU count.
+OCR_CONCURRENCY = int(os.environ.get("FCORE_OCR_CONCURRENCY", 2))
+
+# "thread" runs inference on threads inside this process,
+# "process" spreads it over OCR_POOL_SIZE worker processes with their own OCR engines.
+OCR_POOL_MODE = os.environ.get("FCORE_OCR_POOL", "thread")
+OCR_POOL_SIZE = int(os.environ.get("FCORE_OCR_POOL_SIZE", 2))
+
 ocr_initialization_task = None
-PaddleOCR = timed_import('paddleocr', 'PaddleOCR')
+ocr_pool_task = None
+ocr_process_pool = None
+
+# Executor that runs the blocking inference calls off the event loop
+ocr_executor = ThreadPoolExecutor(max_workers=OCR_CONCURRENCY, thread_name_prefix="ocr")
 
-async def initialize_paddleocr():
-    """Initialize PaddleOCR asynchronously"""
-    print("Initializing PaddleOCR...")
+# Idle OCR backend instances, one per executor slot at most
+_idle_instances = queue.Queue()
+_instance_count = 0
+_instance_lock = threading.Lock()
+
+async def initialize_ocr_backend():
+    """Initialize the configured OCR backend asynchronously"""
+    global _instance_count
+    print(f"Initializing OCR backend ({OCR_BACKEND})...")
     loop = asyncio.get_event_loop()
-    ocr_partial = partial(PaddleOCR, use_angle_cls=True, lang='en', use_gpu=True)
-    ocr_instance = await loop.run_in_executor(None, ocr_partial)
-    print("PaddleOCR initialized.")
+    ocr_instance = await loop.run_in_executor(ocr_executor, create_ocr_backend)
+
+    with _instance_lock:
+        _instance_count += 1
+    _idle_instances.put(ocr_instance)
+
+    print(f"OCR backend ({OCR_BACKEND}) initialized.")
     return ocr_instance
 
 async def get_ocr_instance():
-    """Returns the initialized PaddleOCR instance, awaiting initialization if needed."""
+    """Returns the initialized OCR backend instance, awaiting initialization if needed."""
     global ocr_initialization_task
     if ocr_initialization_task is None:
-        ocr_initialization_task = asyncio.create_task(initialize_paddleocr())
+        ocr_initialization_task = asyncio.create_task(initialize_ocr_backend())
     else:
         if not ocr_initialization_task.done():
             print("Waiting for OCR to be initialized...")
 
     ocr_instance = await ocr_initialization_task
-    return ocr_instance
\ No newline at end of file
+    return ocr_instance
+
+def _acquire_instance():
+    """Take an idle OCR backend instance, creating a new one if all existing ones are busy."""
+    global _instance_count
+    try:
+        return _idle_instances.get_nowait()
+    except queue.Empty:
+        pass
+
+    with _instance_lock:
+        can_create = _instance_count < OCR_CONCURRENCY
+        if can_create:
+            _instance_count += 1
+
+    if can_create:
+        print(f"Creating additional OCR backend instance ({_instance_count}/{OCR_CONCURRENCY})...")
+        try:
+            return create_ocr_backend()
+        except Exception:
+            # Give the slot back, otherwise a failed creation shrinks the pool for good
+            with _instance_lock:
+                _instance_count -= 1
+            raise
+
+    return _idle_instances.get()
+
+def _run_ocr_blocking(method, image, kwargs):
+    """Runs inference on an executor thread with an exclusively held OCR backend instance."""
+    ocr_instance = _acquire_instance()
+    try:
+        return getattr(ocr_instance, method)(image, **kwargs)
+    finally:
+        _idle_instances.put(ocr_instance)
+
+# Worker process state, only set inside pool processes
+_worker_ocr = None
+
+def _init_worker_process():
+    """Pool initializer: build and warm one OCR backend instance for this worker process."""
+    global _worker_ocr
+    import logging
+    logging.getLogger("ppocr").setLevel(logging.ERROR)
+
+    _worker_ocr = create_ocr_backend()
+    # Run one tiny inference so the first real job doesn't pay for lazy setup
+    _worker_ocr.ocr(np.zeros((32, 32, 3), dtype=np.uint8))
+
+def _worker_ready():
+    return os.getpid()
+
+def _to_plain(value):
+    """Convert numpy values in an OCR result into plain Python types, keeping tuples intact."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return tuple(_to_plain(item) for item in value)
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    return value
+
+def _run_ocr_in_worker(method, image, kwargs):
+    """Runs inference inside a pool process and returns a picklable, parsed result."""
+    return _to_plain(getattr(_worker_ocr, method)(image, **kwargs))
+
+async def initialize_ocr_pool():
+    """Start the OCR worker processes and wait until every worker has a warmed OCR backend."""
+    global ocr_process_pool
+    print(f"Starting OCR worker pool with {OCR_POOL_SIZE} processes...")
+    ocr_process_pool = ProcessPoolExecutor(max_workers=OCR_POOL_SIZE, initializer=_init_worker_process)
+
+    loop = asyncio.get_event_loop()
+    pids = await asyncio.gather(*[
+        loop.run_in_executor(ocr_process_pool, _worker_ready) for _ in range(OCR_POOL_SIZE)
+    ])
+    print(f"OCR worker pool ready ({len(set(pids))} processes).")
+    return ocr_process_pool
+
+async def get_ocr_pool():
+    """Returns the OCR process pool, starting it if needed."""
+    global ocr_pool_task
+    if ocr_pool_task is None:
+        ocr_pool_task = asyncio.create_task(initialize_ocr_pool())
+
+    return await ocr_pool_task
+
+async def warm_up_ocr():
+    """Initializes the OCR engine(s) for the configured pool mode."""
+    if OCR_POOL_MODE == "process":
+        await get_ocr_pool()
+    else:
+        await get_ocr_instance()
+
+# EasyOCR fallback reader, shared by all callers and created on first use
+easyocr_initialization_task = None
+easyocr_reader = None
+# Set once the EasyOCR reader is loaded and warmed, readable from any thread
+easyocr_ready = threading.Event()
+# EasyOCR readers aren't thread-safe, so inference calls take turns
+_easyocr_lock = threading.Lock()
+
+def create_easyocr():
+    """Create and warm the EasyOCR reader (blocking)."""
+    easyocr = timed_import('easyocr')
+    reader = easyocr.Reader(['en'], gpu=OCR_USE_GPU)
+    # Run one tiny inference so the first real call doesn't pay for lazy setup
+    reader.readtext(np.zeros((32, 32, 3), dtype=np.uint8))
+    return reader
+
+async def initialize_easyocr():
+    """Initialize the EasyOCR reader asynchronously"""
+    global easyocr_reader
+    print("Initializing EasyOCR...")
+    loop = asyncio.get_event_loop()
+    easyocr_reader = await loop.run_in_executor(ocr_executor, create_easyocr)
+    easyocr_ready.set()
+    print("EasyOCR initialized.")
+    return easyocr_reader
+
+async def get_easyocr_reader():
+    """Returns the shared EasyOCR reader, awaiting initialization if needed."""
+    global easyocr_initialization_task
+    if easyocr_initialization_task is None:
+        easyocr_initialization_task = asyncio.create_task(initialize_easyocr())
+    elif not easyocr_initialization_task.done():
+        print("Waiting for EasyOCR to be initialized...")
+
+    return await easyocr_initialization_task
+
+def _run_easyocr_blocking(reader, image, kwargs):
+    with _easyocr_lock:
+        return reader.readtext(image, **kwargs)
+
+async def run_easyocr(image, **kwargs):
+    """Run EasyOCR's readtext on the given image without blocking the event loop."""
+    reader = await get_easyocr_reader()
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(ocr_executor, partial(_run_easyocr_blocking, reader, image, kwargs))
+
+def shutdown_ocr():
+    """Stops executor threads and worker processes."""
+    if ocr_process_pool is not None:
+        ocr_process_pool.shutdown(cancel_futures=True)
+    ocr_executor.shutdown(wait=False, cancel_futures=True)
+
+async def run_ocr(image, method="ocr", **kwargs):
+    """
+    Run the OCR backend on the given image without blocking the event loop.
+    Up to OCR_CONCURRENCY calls (or OCR_POOL_SIZE in process mode) run in parallel;
+    the rest wait for a free slot.
+
+    Parameters:
+        image: Image (or list of crops for "recognize") passed to the backend.
+        method (str): Backend method to call: "ocr", "detect" or "recognize".
+        kwargs: Extra arguments for the backend method (e.g. det/rec/cls for "ocr").
+    """
+    loop = asyncio.get_event_loop()
+
+    if OCR_POOL_MODE == "process":
+        pool = await get_ocr_pool()
+        # Send a contiguous buffer so the image pickles without extra copies
+        if isinstance(image, np.ndarray):
+            image = np.ascontiguousarray(image)
+        return await loop.run_in_executor(pool, partial(_run_ocr_in_worker, method, image, kwargs))
+
+    # Make sure the first instance exists before fanning out
+    await get_ocr_instance()
+
+    return await loop.run_in_executor(ocr_executor, partial(_run_ocr_blocking, method, image, kwargs))
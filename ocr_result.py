@@ -0,0 +1,223 @@
+import numpy as np
+
+class OcrResult:
+    """
+    Compact OCR result.
+    Boxes are stored in one (N, 4, 2) array with texts and confidences in parallel arrays,
+    so geometry (centers, edges, rows) is computed once with NumPy instead of per item.
+
+    Iterating yields (bbox, text, confidence) tuples like ocr.parse_ocr.
+    """
+    def __init__(self, boxes, texts, confidences):
+        self.boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4, 2)
+        self.texts = list(texts)
+        self.confidences = np.asarray(confidences, dtype=np.float64).reshape(-1)
+
+        # Precomputed geometry
+        self.centers = self.boxes.mean(axis=1) if len(self.texts) else np.zeros((0, 2))
+        self.x_min = self.boxes[:, 0, 0]
+        self.y_min = self.boxes[:, 0, 1]
+        self.x_max = self.boxes[:, 2, 0]
+        self.y_max = self.boxes[:, 2, 1]
+
+        self._lower_texts = None
+        self._spatial = None
+
+    @classmethod
+    def from_paddle(cls, ocr_data):
+        """
+        Builds an OcrResult from PaddleOCR's nested [[bbox, (text, confidence)], ...] output.
+        Malformed items are skipped, the same way parse_ocr skips them.
+        """
+        if isinstance(ocr_data, OcrResult):
+            return ocr_data
+
+        boxes, texts, confidences = [], [], []
+        for group in ocr_data or []:
+            if not group:
+                continue
+
+            for item in group:
+                if not item or not isinstance(item, list) or len(item) != 2 or not isinstance(item[1], tuple):
+                    continue
+                try:
+                    bbox, (text, confidence) = item
+                    box = np.asarray(bbox, dtype=np.float64).reshape(4, 2)
+                except (ValueError, TypeError):
+                    continue
+
+                boxes.append(box)
+                texts.append(text)
+                confidences.append(confidence)
+
+        return cls(np.array(boxes).reshape(-1, 4, 2), texts, confidences)
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros((0, 4, 2)), [], [])
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __bool__(self):
+        return len(self.texts) > 0
+
+    def __iter__(self):
+        for index in range(len(self.texts)):
+            yield self.boxes[index], self.texts[index], self.confidences[index]
+
+    def __getitem__(self, index):
+        return self.boxes[index], self.texts[index], self.confidences[index]
+
+    def __repr__(self):
+        items = ", ".join(f"({text!r}, {confidence:.2f})" for text, confidence in zip(self.texts, self.confidences))
+        return f"OcrResult([{items}])"
+
+    @property
+    def lower_texts(self):
+        if self._lower_texts is None:
+            self._lower_texts = [text.strip().lower() for text in self.texts]
+        return self._lower_texts
+
+    def subset(self, indices):
+        """Returns a new OcrResult containing only the given indices, in the given order."""
+        indices = np.asarray(indices, dtype=np.intp)
+        return OcrResult(self.boxes[indices], [self.texts[i] for i in indices], self.confidences[indices])
+
+    def sorted_by_position(self):
+        """Returns a copy sorted top-to-bottom, then left-to-right by the top-left corner."""
+        return self.subset(np.lexsort((self.x_min, self.y_min)))
+
+    def find(self, keyword, exact=False):
+        """
+        Case-insensitive keyword lookup.
+
+        Parameters:
+            keyword (str): The text to look for.
+            exact (bool): Require the whole (stripped) text to match instead of containing the keyword.
+
+        Returns:
+            list: Indices of the matching detections, in OCR order.
+        """
+        keyword = keyword.lower()
+        if exact:
+            return [i for i, text in enumerate(self.lower_texts) if text == keyword]
+        return [i for i, text in enumerate(self.lower_texts) if keyword in text]
+
+    def find_first(self, keyword, exact=False):
+        """Returns the index of the first detection matching keyword, or None."""
+        matches = self.find(keyword, exact=exact)
+        return matches[0] if matches else None
+
+    @property
+    def spatial(self):
+        """SpatialIndex over the detections, built on first use."""
+        if self._spatial is None:
+            self._spatial = SpatialIndex(self)
+        return self._spatial
+
+    def rows(self, y_threshold, use_center=True):
+        """
+        Groups detections into rows.
+        A new row starts when the next detection (sorted by y) is more than
+        y_threshold away from the first detection of the current row.
+
+        Returns:
+            list: One index array per row, each sorted left-to-right.
+        """
+        if use_center:
+            return self.spatial.rows(y_threshold)
+
+        order = np.argsort(self.y_min, kind="stable")
+        return _split_rows(order, self.y_min[order], y_threshold, self.x_min)
+
+def _split_rows(order, sorted_ys, y_threshold, x_min):
+    """Cuts y-sorted indices into rows by jumping from row start to row start with searchsorted."""
+    rows = []
+    start = 0
+    while start < len(order):
+        end = int(np.searchsorted(sorted_ys, sorted_ys[start] + y_threshold, side="left"))
+        rows.append(order[start:end])
+        start = end
+
+    return [row[np.argsort(x_min[row], kind="stable")] for row in rows]
+
+class SpatialIndex:
+    """
+    Spatial lookups over the detections of an OcrResult.
+    Detections are kept sorted by their y-center, so every query narrows down to a horizontal
+    band with two binary searches and only filters that band on x.
+
+    Anchors can be a detection index or a bounding box.
+    Queries return index arrays ordered nearest-first (row() returns them left-to-right).
+    """
+    def __init__(self, result):
+        self.result = result
+        self.order = np.argsort(result.centers[:, 1], kind="stable")
+        self.sorted_y = result.centers[self.order, 1]
+
+    def _anchor(self, anchor):
+        """Returns (x_center, y_center, x_min, x_max) of a detection index or bounding box."""
+        if isinstance(anchor, (int, np.integer)):
+            result = self.result
+            return result.centers[anchor, 0], result.centers[anchor, 1], result.x_min[anchor], result.x_max[anchor]
+
+        box = np.asarray(anchor, dtype=np.float64).reshape(4, 2)
+        center = box.mean(axis=0)
+        return center[0], center[1], box[0, 0], box[2, 0]
+
+    def band(self, y_low, y_high):
+        """Indices whose y-center lies in [y_low, y_high], in y order."""
+        start = np.searchsorted(self.sorted_y, y_low, side="left")
+        end = np.searchsorted(self.sorted_y, y_high, side="right")
+        return self.order[start:end]
+
+    def below(self, anchor, max_distance, x_tolerance, align="center"):
+        """
+        Detections below the anchor within max_distance (between y-centers)
+        whose x lies within x_tolerance of the anchor.
+
+        Parameters:
+            align (str): "center" compares x-centers, "left" compares left edges.
+        """
+        x_center, y_center, x_min, _ = self._anchor(anchor)
+        candidates = self.band(y_center, y_center + max_distance)
+        dy = self.result.centers[candidates, 1] - y_center
+
+        if align == "left":
+            dx = np.abs(self.result.x_min[candidates] - x_min)
+        else:
+            dx = np.abs(self.result.centers[candidates, 0] - x_center)
+
+        keep = (dy > 0) & (dx < x_tolerance)
+        candidates, dy = candidates[keep], dy[keep]
+        return candidates[np.argsort(dy, kind="stable")]
+
+    def right_of(self, anchor, y_tolerance, max_distance=np.inf):
+        """Detections starting right of the anchor on the same row, nearest first."""
+        _, y_center, _, x_max = self._anchor(anchor)
+        candidates = self.band(y_center - y_tolerance, y_center + y_tolerance)
+        dx = self.result.x_min[candidates] - x_max
+
+        keep = (dx > 0) & (dx <= max_distance)
+        candidates, dx = candidates[keep], dx[keep]
+        return candidates[np.argsort(dx, kind="stable")]
+
+    def left_of(self, anchor, y_tolerance, max_distance=np.inf):
+        """Detections ending left of the anchor on the same row, nearest first."""
+        _, y_center, x_min, _ = self._anchor(anchor)
+        candidates = self.band(y_center - y_tolerance, y_center + y_tolerance)
+        dx = x_min - self.result.x_max[candidates]
+
+        keep = (dx > 0) & (dx <= max_distance)
+        candidates, dx = candidates[keep], dx[keep]
+        return candidates[np.argsort(dx, kind="stable")]
+
+    def row(self, y, y_tolerance):
+        """All detections whose y-center is within y_tolerance of y, sorted left-to-right."""
+        candidates = self.band(y - y_tolerance, y + y_tolerance)
+        return candidates[np.argsort(self.result.x_min[candidates], kind="stable")]
+
+    def rows(self, y_threshold):
+        """Groups all detections into rows, see OcrResult.rows."""
+        return _split_rows(self.order, self.sorted_y, y_threshold, self.result.x_min)
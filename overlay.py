@@ -5,6 +5,7 @@ import win32con
 import win32api
 import threading
 from time import time
+from platform_backends import format_text_as_table
 
 user32 = ctypes.windll.user32
 
@@ -128,17 +129,7 @@ class OverlayWindow:
 
     def format_text_as_table(self, data):
         """Format the given text (list of dicts) into a table-like structure."""
-        table = ""
-        headers = "Player Name".ljust(30) + "Rating".rjust(10) + "\n"
-        table += headers
-        table += "-" * len(headers) + "\n"
-
-        # Simulate table structure
-        for row in data:
-            player = row.get("player", "").ljust(30)
-            rating = str(row.get("rating", "")).rjust(10)
-            table += f"{player}{rating}\n"
-        return table
+        return format_text_as_table(data)
 
     def on_paint(self, hwnd):
         hdc, ps = win32gui.BeginPaint(hwnd)
@@ -0,0 +1,186 @@
+import json
+import os
+import re
+import time
+
+import cv2
+from screenshot import capture_frame
+
+# "windows" captures the screen, polls hotkeys and draws the overlay window,
+# "replay" reads frames and key presses from files and logs the overlay to the console (no display needed)
+PLATFORM = os.environ.get("FCORE_PLATFORM", "windows" if os.name == "nt" else "replay")
+# Replay input: a folder of screenshots or a manifest listing them (.json list or one path per line)
+REPLAY_FRAMES = os.environ.get("FCORE_REPLAY_FRAMES", "replay/frames")
+# Replay input: scripted key presses, one "<key> <seconds>" per line, e.g. "F12 at t=3s"
+REPLAY_EVENTS = os.environ.get("FCORE_REPLAY_EVENTS", "replay/events.txt")
+
+# Hotkeys the main loop reacts to
+KEYS = ("F3", "F5", "F10", "F12")
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+
+def format_text_as_table(data):
+    """Format the given text (list of dicts) into a table-like structure."""
+    table = ""
+    headers = "Player Name".ljust(30) + "Rating".rjust(10) + "\n"
+    table += headers
+    table += "-" * len(headers) + "\n"
+
+    # Simulate table structure
+    for row in data:
+        player = row.get("player", "").ljust(30)
+        rating = str(row.get("rating", "")).rjust(10)
+        table += f"{player}{rating}\n"
+    return table
+
+class WindowsCapture:
+    """Grabs the primary screen."""
+    finished = False
+
+    def grab(self):
+        return capture_frame()
+
+class WindowsInput:
+    """Polls the global hotkey state."""
+    finished = False
+
+    def __init__(self):
+        import win32api
+        import win32con
+        self.get_key_state = win32api.GetAsyncKeyState
+        self.virtual_keys = {key: getattr(win32con, f"VK_{key}") for key in KEYS}
+
+    def is_pressed(self, key):
+        return (self.get_key_state(self.virtual_keys[key]) & 0x8000) != 0
+
+class ReplayCapture:
+    """
+    Returns recorded screenshots in order, one per grab.
+
+    Parameters:
+        source (str): Folder of screenshots (sorted by name) or a manifest file listing them.
+    """
+    def __init__(self, source=REPLAY_FRAMES):
+        self.paths = self.load_paths(source)
+        self.index = 0
+        print(f"Replaying {len(self.paths)} frames from {source}")
+
+    @staticmethod
+    def load_paths(source):
+        if os.path.isdir(source):
+            return [os.path.join(source, name) for name in sorted(os.listdir(source)) if name.lower().endswith(IMAGE_EXTENSIONS)]
+
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"Replay frames not found: {source}")
+
+        # Manifest entries are relative to the manifest's folder
+        with open(source, "r") as file:
+            if source.endswith(".json"):
+                entries = json.load(file)
+            else:
+                entries = [line.strip() for line in file if line.strip() and not line.startswith("#")]
+
+        folder = os.path.dirname(source)
+        return [os.path.join(folder, entry) for entry in entries]
+
+    @property
+    def finished(self):
+        return self.index >= len(self.paths)
+
+    def grab(self):
+        """Next recorded frame, None once all frames were used."""
+        if self.index >= len(self.paths):
+            print("Replay has no frames left")
+            return None
+
+        path = self.paths[self.index]
+        self.index += 1
+        print(f"Replaying frame {path}")
+        return cv2.imread(path)
+
+class ReplayInput:
+    """
+    Reports scripted key presses once their time has come.
+    The clock starts on the first poll, every event is reported exactly once.
+
+    Parameters:
+        source (str): Event file, one "<key> <seconds>" per line ("F12 3", "F12 at t=3s"), # starts a comment.
+    """
+    EVENT_PATTERN = re.compile(r"^(\w+)\s+(?:at\s+)?(?:t\s*=\s*)?([\d.]+)\s*s?$", re.IGNORECASE)
+
+    def __init__(self, source=REPLAY_EVENTS):
+        self.events = self.load_events(source)
+        self.start_time = None
+        print(f"Replaying {len(self.events)} key presses from {source}")
+
+    @classmethod
+    def load_events(cls, source):
+        events = []
+        with open(source, "r") as file:
+            for line_number, line in enumerate(file, start=1):
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+
+                match = cls.EVENT_PATTERN.match(line)
+                if not match or match.group(1).upper() not in KEYS:
+                    raise ValueError(f"{source}:{line_number}: expected '<key> <seconds>' with a key out of {', '.join(KEYS)}, got '{line}'")
+
+                events.append((float(match.group(2)), match.group(1).upper()))
+
+        return sorted(events)
+
+    @property
+    def finished(self):
+        return not self.events
+
+    def is_pressed(self, key):
+        if self.start_time is None:
+            self.start_time = time.perf_counter()
+
+        elapsed = time.perf_counter() - self.start_time
+        for index, (at, event_key) in enumerate(self.events):
+            if at > elapsed:
+                break
+            if event_key == key:
+                del self.events[index]
+                print(f"[{elapsed:7.2f}s] {key} pressed")
+                return True
+
+        return False
+
+class ConsoleOverlay:
+    """Prints overlay messages instead of drawing them."""
+    def show(self, text, duration=None):
+        if isinstance(text, list):
+            text = format_text_as_table(text)
+        print(f"[overlay] {text}")
+
+    def hide(self):
+        pass
+
+    def close(self):
+        pass
+
+def create_capture(platform=PLATFORM):
+    if platform == "replay":
+        return ReplayCapture()
+    if platform == "windows":
+        return WindowsCapture()
+    raise ValueError(f"Unknown platform '{platform}', expected windows or replay")
+
+def create_input(platform=PLATFORM):
+    if platform == "replay":
+        return ReplayInput()
+    if platform == "windows":
+        return WindowsInput()
+    raise ValueError(f"Unknown platform '{platform}', expected windows or replay")
+
+def create_overlay(platform=PLATFORM):
+    if platform == "replay":
+        return ConsoleOverlay()
+    if platform == "windows":
+        # Only importable on Windows
+        from overlay import OverlayWindow
+        return OverlayWindow()
+    raise ValueError(f"Unknown platform '{platform}', expected windows or replay")
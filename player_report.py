@@ -1,59 +1,61 @@
 # player_report_watcher.py
 
-from PIL import ImageGrab
 import os
 import asyncio
 import signal
-import time
-import win32api
-import win32con
 
 from auth import load_session, restore_or_authenticate
 from cache import load_selected_team
+from continuous_capture import CONTINUOUS_CAPTURE, ContinuousCapture
 from database import get_user_teams
+from ocr_manager import shutdown_ocr, warm_up_ocr
+from platform_backends import create_capture, create_input
 from player_watcher.process_screenshots import process_screenshots
 from priority import set_highest_priority
+from screenshot import screenshot_writer, take_screenshot
 from select_team import select_team
 
 SCREENSHOT_DIR = "./local_player_data" 
 os.makedirs(SCREENSHOT_DIR, exist_ok=True)
 running = True  
 
-def take_screenshot():
-    """Takes a screenshot and returns the file path."""
-    if not os.path.exists('screenshots'):
-        os.makedirs('screenshots')
-
-    timestamp = time.strftime('%Y%m%d_%H%M%S')
-    filename = os.path.join(SCREENSHOT_DIR, f'screenshot_{timestamp}.png')
-
-    screenshot = ImageGrab.grab() 
-    screenshot.save(filename)
-
-    return filename
-
-async def watch_for_screenshots(user_id):
+async def watch_for_screenshots(user_id, capture=None, keys=None):
     """
     Continuously monitor the screenshot directory for new images.
     Print "Screenshotted" each time a new screenshot is detected or taken with F12.
     """
+    # Screenshots are only processed from disk, so every capture has to be written
+    screenshot_writer.require_files()
+
+    capture = capture or create_capture()
+    keys = keys or create_input()
+    # Hands-free mode stores every new settled screen, F12 still works
+    continuous = ContinuousCapture(capture) if CONTINUOUS_CAPTURE else None
+
     print("Starting Watch Mode: Monitoring for new screenshots...")
 
     # Track existing files in the directory
     seen_files = set(os.listdir(SCREENSHOT_DIR))
 
     while running:
-        action_screenshot = (win32api.GetAsyncKeyState(win32con.VK_F12) & 0x8000) != 0
-        action_process = (win32api.GetAsyncKeyState(win32con.VK_F10) & 0x8000) != 0
+        action_screenshot = keys.is_pressed("F12")
+        action_process = keys.is_pressed("F10")
 
         if action_screenshot:
             print("Taking screenshot..")
-            screenshot_file = take_screenshot()
-            seen_files.add(os.path.basename(screenshot_file))  
+            # Processed later from disk, the background writer archives it (waiting when it's behind)
+            _, screenshot_file = take_screenshot(SCREENSHOT_DIR, grab=capture.grab, block=True)
+            if screenshot_file:
+                seen_files.add(os.path.basename(screenshot_file))  
+        elif continuous:
+            frame = continuous.poll()
+            if frame is not None:
+                screenshot_writer.archive(frame, SCREENSHOT_DIR, block=True)
 
         if action_process:
             set_highest_priority()
             print("\nProcess Mode Activated. Listing all screenshots taken during Watch Mode:")
+            screenshot_writer.flush()
             await process_screenshots(user_id)
 
         # Check for new files in the directory
@@ -65,6 +67,10 @@ async def watch_for_screenshots(user_id):
                 print("Screenshotted:", file)  
             seen_files.update(new_files)
 
+        # Scripted input ran out
+        if keys.finished and (not continuous or capture.finished):
+            break
+
         # Wait briefly before checking again
         await asyncio.sleep(0.1)
 
@@ -72,6 +78,9 @@ async def watch_for_screenshots(user_id):
 async def main():
     global running
 
+    # Start the OCR engines while authenticating; the batch run needs them warm
+    asyncio.create_task(warm_up_ocr())
+
     try:
         # Step 1: Load session from file
         session = load_session()
@@ -127,6 +136,9 @@ async def main():
 
     finally:
         print("Cleaning up resources...")
+        # Captures taken after the last F10 are still queued on the daemon writer thread
+        screenshot_writer.flush()
+        shutdown_ocr()
 
 # Graceful shutdown handling
 def signal_handler(sig, frame):
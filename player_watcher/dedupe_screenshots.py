@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+
+from fingerprints import difference_hash
+from layout import frame_slices, region_box
+from screens.screen_layouts import SQUAD
+
+# Regions that tell squad screenshots apart: layout region name, hash size
+# Screen tabs, the player's name and the player's data panel
+DEDUPE_REGIONS = [
+    ("header", 16),
+    ("name", 16),
+    ("panel", 32),
+]
+# Largest share of differing bits in any region for two screenshots to count as the same
+MAX_DUPLICATE_DISTANCE = 0.05
+# OCR calls a screenshot costs: screen type, player name and the screen's data
+OCR_PASSES_PER_SCREENSHOT = 3
+# Screenshots on disk are hashed from a quarter-scale grayscale decode, the full frame is never kept for dedupe
+HASH_READ_FLAGS = cv2.IMREAD_REDUCED_GRAYSCALE_4
+
+def screenshot_hash(image):
+    """
+    Perceptual hash of the regions that differ between squad screenshots.
+
+    Parameters:
+        image (np.array): The frame, at any scale of the capture.
+
+    Returns:
+        list: One bit array per DEDUPE_REGIONS entry.
+    """
+    height, width = image.shape[:2]
+    # Regions are hashed at whatever size they have in this frame, the hash shrinks them anyway
+    return [difference_hash(image[frame_slices(region_box(SQUAD, name), width, height)], hash_size)
+            for name, hash_size in DEDUPE_REGIONS]
+
+def context_hash(context):
+    """
+    Hash of a screenshot without decoding its full frame into the context.
+    The reduced read is dropped right after hashing; the frame is only read in full when it's processed.
+    """
+    if context.path:
+        return screenshot_hash(cv2.imread(context.path, HASH_READ_FLAGS))
+    return screenshot_hash(context.image)
+
+def dedupe_screenshots(contexts, max_distance=MAX_DUPLICATE_DISTANCE):
+    """
+    Collapses near-identical screenshots (e.g. F12 pressed several times on the same page), keeping the latest.
+
+    Parameters:
+        contexts (list): ScreenContext per screenshot, ordered from oldest to newest.
+
+    Returns:
+        tuple: (unique contexts, duplicate contexts). Duplicates are released.
+    """
+    kept = []  # Contexts that survive, in order
+    hashes = [np.empty((0, hash_size * hash_size), dtype=np.uint8) for _, hash_size in DEDUPE_REGIONS]
+    duplicates = []
+
+    for context in contexts:
+        regions = context_hash(context)
+
+        # Distance to every kept screenshot is the largest distance over the regions
+        distances = np.zeros(len(kept))
+        for index, bits in enumerate(regions):
+            distances = np.maximum(distances, (hashes[index] != bits).mean(axis=1))
+
+        match = int(distances.argmin()) if len(kept) else None
+        if match is not None and distances[match] <= max_distance:
+            # Same page again, the newer screenshot replaces the older one
+            duplicates.append(kept[match])
+            kept[match] = context
+            for index, bits in enumerate(regions):
+                hashes[index][match] = bits
+            continue
+
+        kept.append(context)
+        for index, bits in enumerate(regions):
+            hashes[index] = np.vstack([hashes[index], bits])
+
+    for context in duplicates:
+        context.release()
+
+    if duplicates:
+        print(f"Skipped {len(duplicates)} near-duplicate screenshots, saving about {len(duplicates) * OCR_PASSES_PER_SCREENSHOT} OCR passes")
+
+    return kept, duplicates
@@ -4,18 +4,19 @@ import cv2
 from crop import crop_image
 from ocr import paddleocr
 from save_image import save_image
+from screens.screen_layouts import SQUAD
 
 DEBUG = True
 
 FOLDER = './images/player_report/'
 os.makedirs(FOLDER, exist_ok=True)
 
-async def detect_player_from_screen(screenshot_path):
-    image = cv2.imread(screenshot_path)
-    cropped_image = crop_image(image, (1700, 300, 2550, 960))
+async def detect_player_from_screen(context):
+    cropped_image = context.region(SQUAD, "player")
     save_image(cropped_image, FOLDER, "cropped_image.png")
 
-    cropped_name = crop_image(cropped_image, (50, 60, 700, 160))
+    # Copy before drawing so the shared frame stays untouched
+    cropped_name = crop_image(cropped_image, (50, 60, 700, 160)).copy()
     processed_name = cv2.rectangle(cropped_name, (0, 50), 
                                                 (80, 100), (255, 255, 0), thickness=-1)
     
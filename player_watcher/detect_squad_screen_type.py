@@ -1,10 +1,8 @@
-import os
 import time
 
-import cv2
-from crop import crop_image
 from ocr import extract_text_from_image
 from save_image import save_image
+from screens.screen_layouts import SQUAD
 from screens.screen_types import SQUAD_FINANCIAL, SQUAD_ATTRIBUTES, SQUAD_STATS
 
 # Configuration for squad screen types
@@ -23,15 +21,10 @@ SQUAD_SCREEN_KEYWORDS = {
 def preprocess_ocr_output(ocr_output):
     return set(ocr_output.lower().split())
 
-async def detect_squad_screen_type(screenshot_path):
-    """Detects the type of squad screen in the screenshot with optimized checks."""
-    if not os.path.exists(screenshot_path):
-        raise FileNotFoundError(f"{screenshot_path} does not exist.")
-    
-    image = cv2.imread(screenshot_path)
-
+async def detect_squad_screen_type(context):
+    """Detects the type of squad screen in the captured screen (ScreenContext) with optimized checks."""
     # Crop small section which includes relevant keywords
-    cropped_image = crop_image(image, (400, 225, 1750, 350))
+    cropped_image = context.region(SQUAD, "header")
 
     # Perform OCR on the full image
     ocr_output, _ = await extract_text_from_image(cropped_image)
@@ -45,6 +38,7 @@ async def detect_squad_screen_type(screenshot_path):
         if is_screen_type(ocr_output_words, keywords):
             check_time = time.time() - start_time
             print(f"Time taken for screen type check: {check_time:.4f} seconds")
+            context.screen_type = screen_type
             return screen_type
 
     # Measure and print the time taken if no match is found
@@ -1,23 +1,43 @@
 import asyncio
+import os
+
 from player_watcher.detect_squad_screen_type import detect_squad_screen_type
 from screens.screen_types import SQUAD_ATTRIBUTES, SQUAD_FINANCIAL, SQUAD_STATS
 
 ACCEPTED_SCREEN_TYPES = [SQUAD_FINANCIAL, SQUAD_STATS, SQUAD_ATTRIBUTES]
+# Screenshots decoded at once while detecting or processing them, a 3440x1440 frame is about 15 MB
+MAX_LOADED_FRAMES = int(os.environ.get("FCORE_MAX_LOADED_FRAMES", 4))
+
+async def filter_screenshots(contexts):
+    """
+    Filter screenshots to keep only valid screen types using concurrent processing.
+
+    Parameters:
+        contexts (list): ScreenContext per screenshot.
+
+    Returns:
+        list: (ScreenContext, screen_type) for every valid screenshot, ready for the screen processors.
+        Frames are released after detection, the processors read them again.
+    """
+    frames = asyncio.Semaphore(MAX_LOADED_FRAMES)
+
+    async def detect(context):
+        # Tasks decode their frame before their first await, the semaphore keeps them from all doing it at once
+        async with frames:
+            screen_type = await detect_squad_screen_type(context)
+            context.release()
+            return screen_type
 
-async def filter_screenshots(screenshot_paths):
-    """Filter screenshots to keep only valid screen types using concurrent processing."""
-    
     # Schedule concurrent detection tasks for each screenshot
-    tasks = [detect_squad_screen_type(path) for path in screenshot_paths]
+    tasks = [detect(context) for context in contexts]
     
     # Run all detection tasks concurrently
     screen_types = await asyncio.gather(*tasks)
     
     # Filter for valid screenshots based on screen type
-    valid_screenshots = [
-        (path, screen_type) 
-        for path, screen_type in zip(screenshot_paths, screen_types) 
-        if screen_type in ACCEPTED_SCREEN_TYPES
-    ]
+    valid_screenshots = []
+    for context, screen_type in zip(contexts, screen_types):
+        if screen_type in ACCEPTED_SCREEN_TYPES:
+            valid_screenshots.append((context, screen_type))
 
     return valid_screenshots
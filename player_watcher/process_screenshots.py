@@ -3,8 +3,11 @@ import shutil
 import asyncio
 import time
 
-from player_watcher.filter_screenshots import filter_screenshots
+from ocr_cache import ocr_cache
+from player_watcher.dedupe_screenshots import dedupe_screenshots
+from player_watcher.filter_screenshots import MAX_LOADED_FRAMES, filter_screenshots
 from reports.report_manager import create_report, save_to_cache, submit_report
+from screen_context import ScreenContext
 from screens.screen_types import SQUAD_FINANCIAL, SQUAD_STATS, SQUAD_ATTRIBUTES
 from screens.squad_attributes import process_squad_attributes
 from screens.squad_financial import process_squad_financial
@@ -19,9 +22,19 @@ async def process_screenshots(user_id):
     """Process valid screenshots by filtering, grouping by player, and saving all players in a single report."""
     start_time = time.time()  # Start timing the process
 
-    screenshot_paths = [os.path.join(SCREENSHOT_DIR, f) for f in os.listdir(SCREENSHOT_DIR) if os.path.isfile(os.path.join(SCREENSHOT_DIR, f))]
+    # Sorted by name, which is the capture time, so duplicates resolve to the latest screenshot
+    screenshot_paths = sorted(os.path.join(SCREENSHOT_DIR, f) for f in os.listdir(SCREENSHOT_DIR) if os.path.isfile(os.path.join(SCREENSHOT_DIR, f)))
+    # Contexts read their frame lazily, dedupe and detection only decode what they need and release it
+    contexts = [ScreenContext.from_path(path) for path in screenshot_paths]
+
+    # Repeated captures of the same page would only overwrite the same player's entry
+    print("Archiving duplicate screenshots...")
+    contexts, duplicates = dedupe_screenshots(contexts)
+    clean_up_duplicate_screenshots(duplicates)
+    screenshot_paths = [context.path for context in contexts]
+
     print("Filtering screenshots...")
-    valid_screenshots = await filter_screenshots(screenshot_paths)
+    valid_screenshots = await filter_screenshots(contexts)
 
     total_images = len(valid_screenshots)
     if not valid_screenshots:
@@ -33,10 +46,11 @@ async def process_screenshots(user_id):
     player_report = create_report("player_report", user_id)
     player_report["screens_data"] = {"players": []}  # Initialize as a list of player dictionaries
 
-    # Schedule all processing tasks concurrently
+    # Schedule all processing tasks concurrently, with at most MAX_LOADED_FRAMES frames decoded at once
+    frames = asyncio.Semaphore(MAX_LOADED_FRAMES)
     processing_tasks = [
-        process_single_screenshot(path, screen_type, player_report["screens_data"]["players"], i + 1, total_images) 
-        for i, (path, screen_type) in enumerate(valid_screenshots)
+        process_single_screenshot(context, screen_type, player_report["screens_data"]["players"], i + 1, total_images, frames)
+        for i, (context, screen_type) in enumerate(valid_screenshots)
     ]
 
     # Run all tasks concurrently
@@ -53,31 +67,38 @@ async def process_screenshots(user_id):
     end_time = time.time()  # End timing the process
     print(f"Saved player report for all players: {player_report['report_handle']}")
     print(f"Total processing time: {end_time - start_time:.2f} seconds")
+    ocr_cache.print_stats()
 
-async def process_single_screenshot(path, screen_type, players_data, current_index, total_images):
+async def process_single_screenshot(context, screen_type, players_data, current_index, total_images, frames):
     """Process a single screenshot, including player detection and data extraction."""
-    player_name = await detect_player_from_screen(path)
-    
-    if not player_name:
-        print(f"Could not detect player name for screenshot: {path}")
-        return
-
-    # Find existing player entry or create a new one
-    player_entry = next((player for player in players_data if player["name"] == player_name), None)
-    if not player_entry:
-        player_entry = {"name": player_name, "financial": None, "stats": None, "attributes": None}
-        players_data.append(player_entry)
-
-    # Await async processing functions and populate the appropriate field
-    if screen_type == SQUAD_FINANCIAL:
-        player_entry["financial"] = await process_squad_financial(path)
-    elif screen_type == SQUAD_STATS:
-        player_entry["stats"] = await process_squad_stats(path)
-    elif screen_type == SQUAD_ATTRIBUTES:
-        player_entry["attributes"] = await process_squad_attributes(path)
+    # The frame is read again here, after detection released it
+    async with frames:
+        player_name = await detect_player_from_screen(context)
+
+        if not player_name:
+            print(f"Could not detect player name for screenshot: {context.path}")
+            context.release()
+            return
+
+        # Find existing player entry or create a new one
+        player_entry = next((player for player in players_data if player["name"] == player_name), None)
+        if not player_entry:
+            player_entry = {"name": player_name, "financial": None, "stats": None, "attributes": None}
+            players_data.append(player_entry)
+
+        # Await async processing functions and populate the appropriate field
+        if screen_type == SQUAD_FINANCIAL:
+            player_entry["financial"] = await process_squad_financial(context)
+        elif screen_type == SQUAD_STATS:
+            player_entry["stats"] = await process_squad_stats(context)
+        elif screen_type == SQUAD_ATTRIBUTES:
+            player_entry["attributes"] = await process_squad_attributes(context)
+
+        # The frame isn't needed anymore
+        context.release()
 
     # Inform the user of progress
-    print(f"Processed image {current_index}/{total_images}: {os.path.basename(path)}")
+    print(f"Processed image {current_index}/{total_images}: {os.path.basename(context.path)}")
 
 def archive_screenshot(screenshot_path):
     filename = os.path.basename(screenshot_path)
@@ -85,8 +106,15 @@ def archive_screenshot(screenshot_path):
     shutil.move(screenshot_path, archive_path)
     print(f"Archived screenshot: {filename}")
 
+def clean_up_duplicate_screenshots(duplicates):
+    # Duplicates are the user's own captures, keep them in the archive instead of deleting them
+    for context in duplicates:
+        context.release()
+        print(f"Duplicate screenshot: {os.path.basename(context.path)}")
+        archive_screenshot(context.path)
+
 def clean_up_non_valid_screenshots(all_screenshots, valid_screenshots):
-    valid_paths = {path for path, _ in valid_screenshots}
+    valid_paths = {context.path for context, _ in valid_screenshots}
     non_valid_screenshots = set(all_screenshots) - valid_paths
 
     for path in non_valid_screenshots:
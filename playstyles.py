@@ -1,6 +1,8 @@
 import cv2
 import os
 import numpy as np
+from asset_cache import load_bank
+from color_signatures import GOLDEN_PLAYSTYLE
 
 # Paths to the playstyle templates
 REGULAR_PLAYSTYLE_PATH = "assets/playstyles/regular"
@@ -10,107 +12,167 @@ GK_GOLDEN_PLAYSTYLE_PATH = "assets/playstyles/goalkeeper_golden"
 
 THRESHOLD = 0.5  # Confidence threshold for a successful match
 
+TARGET_SIZE = (70, 70)  # Size icons and templates are compared at
+MIN_BRIGHTNESS = 60  # Darker icons are empty slots
+
 def load_templates(path):
     """Load all playstyle templates from the specified directory in grayscale."""
     templates = {}
-    for filename in os.listdir(path):
+    for filename in sorted(os.listdir(path)):
         if filename.endswith(".png"):
             template_name = os.path.splitext(filename)[0]
             template_image = cv2.imread(os.path.join(path, filename), cv2.IMREAD_GRAYSCALE)
             templates[template_name] = template_image
     return templates
 
-# Load templates once for each type of playstyle
-REGULAR_TEMPLATES = load_templates(REGULAR_PLAYSTYLE_PATH)
-GOLDEN_TEMPLATES = load_templates(GOLDEN_PLAYSTYLE_PATH)
-GK_TEMPLATES = load_templates(GK_PLAYSTYLE_PATH)
-GK_GOLDEN_TEMPLATES = load_templates(GK_GOLDEN_PLAYSTYLE_PATH)
+def normalize_icons(images):
+    """
+    Flattens equally sized grayscale icons into zero-mean, unit-length rows.
+    The dot product of two rows is then their TM_CCOEFF_NORMED score.
 
-def match_playstyle(cropped_image, is_gk=False):
+    Returns:
+        np.array: (len(images), width * height) float32 matrix.
     """
-    Matches the cropped playstyle icon against stored templates based on the icon type (regular, golden, goalkeeper).
-    
+    vectors = np.array([image.reshape(-1) for image in images], dtype=np.float32).reshape(len(images), -1)
+    vectors -= vectors.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    # Flat images correlate with nothing
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+class TemplateBank:
+    """
+    One family of playstyle templates, resized and normalized once.
+
     Parameters:
-        cropped_image (numpy.ndarray): The cropped playstyle icon from the player screen.
+        names (list): Template name per matrix row.
+        matrix (np.array): (templates, 70 * 70) rows from normalize_icons.
+    """
+    def __init__(self, names, matrix):
+        self.names = names
+        self.matrix = matrix
+
+    @staticmethod
+    def build(path):
+        """Compiles a template folder for the asset cache."""
+        templates = load_templates(path)
+        resized = [cv2.resize(image, TARGET_SIZE, interpolation=cv2.INTER_AREA) for image in templates.values()]
+        return {"matrix": normalize_icons(resized)}, {"names": list(templates)}
+
+    @classmethod
+    def from_folder(cls, path):
+        """Loads the compiled bank of a template folder, recompiled when its PNGs change."""
+        arrays, metadata = load_bank(f"playstyles_{os.path.basename(path)}", path, cls.build, params=f"size={TARGET_SIZE}")
+        return cls(metadata["names"], arrays["matrix"])
+
+    def match(self, vectors):
+        """
+        Scores normalized icons against every template with one matrix product.
+
+        Parameters:
+            vectors (np.array): (icons, 70 * 70) rows from normalize_icons.
+
+        Returns:
+            list: (best template name, confidence) per icon.
+        """
+        if not self.names:
+            return [(None, 0.0)] * len(vectors)
+
+        scores = vectors @ self.matrix.T  # (icons, templates)
+        best = scores.argmax(axis=1)
+        return [(self.names[index], float(score)) for index, score in zip(best, scores[np.arange(len(best)), best])]
+
+# Load the compiled templates once for each type of playstyle
+REGULAR_TEMPLATES = TemplateBank.from_folder(REGULAR_PLAYSTYLE_PATH)
+GOLDEN_TEMPLATES = TemplateBank.from_folder(GOLDEN_PLAYSTYLE_PATH)
+GK_TEMPLATES = TemplateBank.from_folder(GK_PLAYSTYLE_PATH)
+GK_GOLDEN_TEMPLATES = TemplateBank.from_folder(GK_GOLDEN_PLAYSTYLE_PATH)
+
+def select_templates(is_gk, golden_playstyle):
+    """Template bank for the icon type (regular, golden, goalkeeper)."""
+    if is_gk and golden_playstyle:
+        return GK_GOLDEN_TEMPLATES
+    if is_gk:
+        return GK_TEMPLATES
+    if golden_playstyle:
+        return GOLDEN_TEMPLATES
+    return REGULAR_TEMPLATES
+
+def match_playstyles(cropped_images, is_gk=False):
+    """
+    Matches all playstyle icons of a player at once, one matrix product per template bank.
+
+    Parameters:
+        cropped_images (list): The cropped playstyle icons from the player screen.
         is_gk (bool): True if the player is a goalkeeper, else False.
 
     Returns:
-        best_match (str): The name of the best-matching template, or "none" if no match meets the threshold.
-        best_confidence (float): The confidence score of the best match.
+        list: (best match, confidence) per icon, as returned by match_playstyle.
     """
-    # Standard size for comparison
-    TARGET_SIZE = (70, 70)
+    results = [(None, None)] * len(cropped_images)
+    icons = {}  # Template bank -> [(index, grayscale icon)]
 
-    # Resize cropped image to target size
-    cropped_resized = cv2.resize(cropped_image, TARGET_SIZE, interpolation=cv2.INTER_AREA)
+    # Resize cropped images to target size
+    resized_images = [cv2.resize(cropped_image, TARGET_SIZE, interpolation=cv2.INTER_AREA) for cropped_image in cropped_images]
+    # Golden color of every icon in one pass
+    golden_colors = GOLDEN_PLAYSTYLE.classify(resized_images)
 
-    # Determine if the playstyle is golden
-    golden_playstyle = is_golden_playstyle(cropped_resized)
-    
-    # Choose the correct template set
-    if is_gk and golden_playstyle:
-        templates = GK_GOLDEN_TEMPLATES
-    elif is_gk:
-        templates = GK_TEMPLATES
-    elif golden_playstyle:
-        templates = GOLDEN_TEMPLATES
-    else:
-        templates = REGULAR_TEMPLATES
-
-    # Convert to grayscale if not already
-    if len(cropped_resized.shape) == 3 and cropped_resized.shape[2] == 3:
-        cropped_gray = cv2.cvtColor(cropped_resized, cv2.COLOR_BGR2GRAY)
-    else:
-        cropped_gray = cropped_resized
-
-    # Check average brightness to detect empty slots
-    avg_brightness = np.mean(cropped_gray)
-    
-    if avg_brightness < 60:
-        return None, None
+    for index, (cropped_resized, golden_color) in enumerate(zip(resized_images, golden_colors)):
+        # Determine if the playstyle is golden
+        golden_playstyle = is_golden_playstyle(cropped_resized, golden_color)
 
-    best_match = None
-    best_confidence = 0.0
+        # Convert to grayscale if not already
+        if len(cropped_resized.shape) == 3 and cropped_resized.shape[2] == 3:
+            cropped_gray = cv2.cvtColor(cropped_resized, cv2.COLOR_BGR2GRAY)
+        else:
+            cropped_gray = cropped_resized
 
-    # Loop through each template and perform template matching
-    for template_name, template_image in templates.items():
-        # Resize template to target size for consistent matching
-        resized_template = cv2.resize(template_image, TARGET_SIZE, interpolation=cv2.INTER_AREA)
+        # Check average brightness to detect empty slots
+        if np.mean(cropped_gray) < MIN_BRIGHTNESS:
+            continue
 
-        # Perform template matching
-        result = cv2.matchTemplate(cropped_gray, resized_template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, _ = cv2.minMaxLoc(result)
+        icons.setdefault(select_templates(is_gk, golden_playstyle), []).append((index, cropped_gray))
 
-        # Track the best match if the new confidence score is higher
-        if max_val > best_confidence:
-            best_confidence = max_val
-            best_match = template_name if max_val >= THRESHOLD else "none"
+    for templates, entries in icons.items():
+        indexes, images = zip(*entries)
+        for index, (name, confidence) in zip(indexes, templates.match(normalize_icons(images))):
+            if confidence <= 0:
+                results[index] = (None, 0.0)
+            else:
+                results[index] = (name if confidence >= THRESHOLD else "none", confidence)
 
-    return best_match, best_confidence
+    return results
 
-def is_golden_playstyle(cropped_image):
+def match_playstyle(cropped_image, is_gk=False):
+    """
+    Matches the cropped playstyle icon against stored templates based on the icon type (regular, golden, goalkeeper).
+    
+    Parameters:
+        cropped_image (numpy.ndarray): The cropped playstyle icon from the player screen.
+        is_gk (bool): True if the player is a goalkeeper, else False.
+
+    Returns:
+        best_match (str): The name of the best-matching template, or "none" if no match meets the threshold.
+        best_confidence (float): The confidence score of the best match.
+    """
+    return match_playstyles([cropped_image], is_gk)[0]
+
+def is_golden_playstyle(cropped_image, golden_color=None):
     """
     Detects if the given playstyle icon is golden or regular by analyzing shape and color.
     
     Parameters:
         cropped_image (numpy.ndarray): The cropped playstyle icon from the player screen.
+        golden_color (bool): Result of color_signatures.GOLDEN_PLAYSTYLE for the icon if already known.
     
     Returns:
         bool: True if the icon is golden, False if it is regular.
     """
     # Step 1: Check Color in HSV Space for Golden Hue
-    hsv_image = cv2.cvtColor(cropped_image, cv2.COLOR_BGR2HSV)
-    
-    # Define range for golden color (this range may need fine-tuning)
-    lower_gold = np.array([15, 100, 100])  # Adjust hue range for golden color
-    upper_gold = np.array([35, 255, 255])
-
-    # Create mask to isolate golden color
-    mask = cv2.inRange(hsv_image, lower_gold, upper_gold)
-    golden_pixels = cv2.countNonZero(mask)
+    if golden_color is None:
+        golden_color = GOLDEN_PLAYSTYLE.classify([cropped_image])[0]
 
     # If there's a significant amount of golden color, we classify as golden
-    if golden_pixels > 50:  # Threshold might need adjustment based on icon size
+    if golden_color:
         return True
 
     # Step 2: Shape Analysis for Gem-like Structure
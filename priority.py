@@ -2,6 +2,10 @@ import psutil
 import os
 
 def set_highest_priority():
+    # Priority classes only exist on Windows
+    if os.name != "nt":
+        return
+
     # Get the current process
     p = psutil.Process(os.getpid())
     
@@ -9,6 +13,9 @@ def set_highest_priority():
     p.nice(psutil.REALTIME_PRIORITY_CLASS)
 
 def set_high_priority():
+    if os.name != "nt":
+        return
+
     # Get the current process
     p = psutil.Process(os.getpid())
     
@@ -17,5 +24,8 @@ def set_high_priority():
 
 def set_normal_priority():
     """Resets the process priority to normal."""
+    if os.name != "nt":
+        return
+
     p = psutil.Process(os.getpid())
     p.nice(psutil.NORMAL_PRIORITY_CLASS)
\ No newline at end of file
@@ -0,0 +1,46 @@
+import asyncio
+import json
+import sys
+import time
+
+from main import start_main_process
+from ocr_manager import shutdown_ocr, warm_up_ocr
+from platform_backends import ConsoleOverlay, ReplayCapture, ReplayInput
+from screenshot import screenshot_writer
+
+async def replay(frames, events, team):
+    """
+    Drives the main process with recorded frames and scripted key presses, no game or display needed.
+
+    Parameters:
+        frames (str): Folder of screenshots or a manifest listing them.
+        events (str): Event file with the key presses, e.g. "F12 at t=3s".
+        team (dict): Selected team, as cached in local_cache/user_<id>.json.
+    """
+    overlay = ConsoleOverlay()
+    capture = ReplayCapture(frames)
+    keys = ReplayInput(events)
+
+    # Model loading isn't part of the measured run
+    started = time.perf_counter()
+    await warm_up_ocr()
+    print(f"OCR warmed up in {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    try:
+        await start_main_process(team.get("userId"), team, overlay, capture=capture, keys=keys)
+    finally:
+        screenshot_writer.flush()
+        shutdown_ocr()
+
+    print(f"Replayed {capture.index} frames in {time.perf_counter() - started:.2f}s")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        print("Usage: python replay.py <frames folder or manifest> <events file> <team json>")
+        sys.exit(1)
+
+    with open(sys.argv[3], "r") as file:
+        selected_team = json.load(file)
+
+    asyncio.run(replay(sys.argv[1], sys.argv[2], selected_team))
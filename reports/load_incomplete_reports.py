@@ -1,19 +1,22 @@
-import json
 import os
 
 import inquirer
-from reports.report_manager import CACHE_DIR
+from reports.report_manager import CACHE_DIR, load_report
 
 def load_incomplete_reports(overlay=None):
     """Prompt the user to choose between multiple incomplete reports and notify them."""
-    cache_files = [f for f in os.listdir(CACHE_DIR) if not f.endswith("_submitted.json")]
+    # The cache folder also holds other caches (e.g. the OCR cache folder), only report files are read
+    cache_files = [
+        f for f in os.listdir(CACHE_DIR)
+        if f.endswith(".json") and not f.endswith("_submitted.json") and os.path.isfile(os.path.join(CACHE_DIR, f))
+    ]
 
     incomplete_reports = []
     for cache_file in cache_files:
-        with open(os.path.join(CACHE_DIR, cache_file), 'r') as file:
-            report = json.load(file)
-            if report.get("status") == "in_progress":
-                incomplete_reports.append((cache_file, report))
+        # Snapshot plus the screen updates journaled since
+        report = load_report(os.path.join(CACHE_DIR, cache_file))
+        if report.get("status") == "in_progress":
+            incomplete_reports.append((cache_file, report))
 
     if len(incomplete_reports) == 0:
         print("No incomplete reports found.")
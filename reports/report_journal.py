@@ -0,0 +1,79 @@
+import json
+import os
+import struct
+import zlib
+
+# "always" fsyncs every record so a crash loses nothing, "never" leaves flushing to the OS
+JOURNAL_FSYNC = os.environ.get("FCORE_JOURNAL_FSYNC", "always")
+# Records appended before the journal is compacted into the report snapshot
+JOURNAL_COMPACT_RECORDS = int(os.environ.get("FCORE_JOURNAL_COMPACT_RECORDS", 32))
+
+# Every record is framed as: payload length (uint32), CRC32 of the payload (uint32), JSON payload
+FRAME = struct.Struct("<II")
+
+def sync(file, fsync=JOURNAL_FSYNC):
+    file.flush()
+    if fsync == "always":
+        os.fsync(file.fileno())
+
+def append_record(path, record, default=None, fsync=JOURNAL_FSYNC):
+    """
+    Appends one framed record to the journal, the cost only depends on the record's size.
+
+    Parameters:
+        record (dict): Screen update, see apply_record.
+        default (function): JSON serializer for types json can't handle (e.g. numpy values).
+    """
+    payload = json.dumps(record, default=default).encode()
+    with open(path, "ab") as file:
+        file.write(FRAME.pack(len(payload), zlib.crc32(payload)) + payload)
+        sync(file, fsync)
+
+def read_records(path):
+    """
+    Reads the journal's records in order.
+    A torn or corrupt tail (e.g. a crash mid-write) is cut off so later appends stay readable.
+
+    Returns:
+        list: The records, empty if there's no journal.
+    """
+    if not os.path.exists(path):
+        return []
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    records = []
+    offset = 0
+    while offset + FRAME.size <= len(data):
+        length, checksum = FRAME.unpack_from(data, offset)
+        payload = data[offset + FRAME.size:offset + FRAME.size + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            break
+        records.append(json.loads(payload))
+        offset += FRAME.size + length
+
+    if offset < len(data):
+        print(f"Journal {path}: dropped {len(data) - offset} bytes of an incomplete record")
+        with open(path, "r+b") as file:
+            file.truncate(offset)
+
+    return records
+
+def apply_record(report, record):
+    """Applies one screen update: "set" replaces the screen's data, "add" appends to a multi-capture screen."""
+    screens_data = report["screens_data"]
+    if record["op"] == "set":
+        screens_data[record["screen"]] = record["data"]
+    elif record["op"] == "add":
+        screens_data.setdefault(record["screen"], []).append(record["data"])
+    else:
+        raise ValueError(f"Unknown journal operation '{record['op']}'")
+
+def write_snapshot(path, report, default=None, fsync=JOURNAL_FSYNC):
+    """Writes the whole report atomically, so a crash leaves either the old or the new snapshot."""
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(report, file, default=default)
+        sync(file, fsync)
+    os.replace(temporary_path, path)
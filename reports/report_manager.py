@@ -4,6 +4,7 @@ from pathlib import Path
 import uuid
 
 import numpy as np
+from reports.report_journal import JOURNAL_COMPACT_RECORDS, append_record, apply_record, read_records, write_snapshot
 from reports.report_types import REPORT_TYPES
 
 # Define a directory for local cache
@@ -15,6 +16,13 @@ def get_cache_path(report_id, report_type, is_submitted=False):
     suffix = "_submitted" if is_submitted else ""
     return CACHE_DIR / f"{report_type}_{report_id}{suffix}.json"
 
+# Screen updates since the last snapshot of an in-progress report
+def get_journal_path(report_id, report_type):
+    return CACHE_DIR / f"{report_type}_{report_id}.journal"
+
+# Records in each report's journal, compacted into the snapshot once it reaches JOURNAL_COMPACT_RECORDS
+journal_records = {}
+
 # Initialize a new report
 def create_report(report_type, user_id):
     """Create a new report with a shortened UUID and save it to cache."""
@@ -58,26 +66,55 @@ def custom_json_serializer(obj):
     else:
         raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
-# Save report to cache
+# Save the whole report to cache, compacting its journal into the snapshot
 def save_to_cache(report):
     is_submitted = report["status"] == "complete"
 
     cache_path = get_cache_path(report["report_handle"], report["report_type"], is_submitted)
-    with open(cache_path, "w") as cache_file:
-        json.dump(report, cache_file, default=custom_json_serializer)
+    write_snapshot(cache_path, report, default=custom_json_serializer)
+
+    delete_journal(report)
+
+def delete_journal(report):
+    journal_path = get_journal_path(report["report_handle"], report["report_type"])
+    if os.path.exists(journal_path):
+        os.remove(journal_path)
+    journal_records.pop(report["report_handle"], None)
+
+# Record a screen update in the report's journal, only the new data is written
+def journal_screen_data(report, record):
+    journal_path = get_journal_path(report["report_handle"], report["report_type"])
+    append_record(journal_path, record, default=custom_json_serializer)
+
+    journal_records[report["report_handle"]] = journal_records.get(report["report_handle"], 0) + 1
+    if journal_records[report["report_handle"]] >= JOURNAL_COMPACT_RECORDS:
+        save_to_cache(report)
+
+# Load a cached report with the screen updates journaled since its snapshot
+def load_report(cache_path):
+    with open(cache_path, 'r') as cache_file:
+        report = json.load(cache_file)
+
+    if report.get("status") == "in_progress":
+        records = read_records(get_journal_path(report["report_handle"], report["report_type"]))
+        for record in records:
+            apply_record(report, record)
+        journal_records[report["report_handle"]] = len(records)
+
+    return report
 
 # Add screen data to the report
 def set_screen_data(report, screen_type, screen_data):
     report["screens_data"][screen_type] = screen_data
 
-    save_to_cache(report)
+    journal_screen_data(report, {"op": "set", "screen": screen_type, "data": screen_data})
 
 def add_screen_data(report, screen_type, screen_data):
     if screen_type not in report["screens_data"]:
         report["screens_data"][screen_type] = []
     report["screens_data"][screen_type].append(screen_data)
 
-    save_to_cache(report)
+    journal_screen_data(report, {"op": "add", "screen": screen_type, "data": screen_data})
 
 # Check if the report is complete (all required screens are captured)
 def is_report_complete(report):
@@ -91,19 +128,22 @@ def submit_report(report):
         print(f"Report {report['report_handle']} is already submitted.")
         return
     
+    # Compact the journal into the in-progress snapshot first, so a failed submission loses no screens
+    save_to_cache(report)
+
     # Mark the report as complete
     report["status"] = "complete"
-    save_to_cache(report)
 
     submit_function = REPORT_TYPES[report["report_type"]]["submit_function"]
-    submit_function(report)  # Directly call the function to submit the report
-
-    # Rename the file after submission
+    try:
+        submit_function(report)  # Directly call the function to submit the report
+    except Exception:
+        # Still in progress, it's loaded again from the snapshot and can be resubmitted
+        report["status"] = "in_progress"
+        raise
+
+    # Only a submitted report gets the submitted snapshot, which replaces the in-progress one
+    save_to_cache(report)
     old_path = get_cache_path(report["report_handle"], report["report_type"])
-    new_path = old_path.with_name(f"{report['report_type']}_{report['report_handle']}_submitted.json")
-    
-    # Handle conflict if submitted file already exists
-    if os.path.exists(new_path):
-        os.remove(new_path)  # Remove existing submitted file (if needed)
-    
-    os.rename(old_path, new_path)  # Rename the file to mark it as submitted
+    if os.path.exists(old_path):
+        os.remove(old_path)
@@ -0,0 +1,82 @@
+import os
+
+import cv2
+from layout import crop_box, frame_scale, region_box
+from ocr import FULL_OCR, ocr_regions, paddleocr, scale_ocr_result
+
+class ScreenContext:
+    """
+    One captured screen and everything derived from it so far.
+    Created once per screenshot and passed from detection into the screen processors,
+    so the frame is decoded once and no region is cropped or recognized twice.
+
+    Crops are views into the frame; copy them before drawing on them.
+    Coordinates are always in pixels of a layout.BASE_RESOLUTION capture, frames of other
+    resolutions are mapped through the layout so crops come out at the same size.
+    The frame itself is never resized, only the crops taken from it.
+    """
+    def __init__(self, image=None, path=None):
+        self.path = path
+        self._image = image
+        self.crops = {}  # (x1, y1, x2, y2) -> cropped view
+        self.ocr_results = {}  # ((x1, y1, x2, y2) or None for the full frame, mode) -> PaddleOCR-style result
+        self.screen_type = None
+
+    @classmethod
+    def from_path(cls, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} does not exist.")
+        return cls(path=path)
+
+    @property
+    def image(self):
+        """The decoded BGR frame, read from disk on first use."""
+        if self._image is None:
+            self._image = cv2.imread(self.path)
+        return self._image
+
+    def crop(self, coordinates):
+        """Crop of the frame at (x1, y1, x2, y2), cached."""
+        coordinates = tuple(coordinates)
+        if coordinates not in self.crops:
+            self.crops[coordinates] = crop_box(self.image, coordinates)
+        return self.crops[coordinates]
+
+    def region(self, screen_type, name):
+        """Crop of a region registered in the layout, cached."""
+        return self.crop(region_box(screen_type, name))
+
+    async def read_regions(self, regions):
+        """
+        Reads named regions of the frame, reusing results already produced for the same crop and mode.
+        Everything not read yet goes through a single ocr_regions call.
+
+        Parameters:
+            regions (dict): name -> ((x1, y1, x2, y2), mode)
+
+        Returns:
+            dict: name -> PaddleOCR-style result
+        """
+        keys = {name: (tuple(coordinates), mode) for name, (coordinates, mode) in regions.items()}
+
+        missing = {key: (self.crop(key[0]), key[1]) for key in keys.values() if key not in self.ocr_results}
+        if missing:
+            self.ocr_results.update(await ocr_regions(missing))
+
+        return {name: self.ocr_results[key] for name, key in keys.items()}
+
+    async def full_ocr(self):
+        """OCR result of the whole frame with boxes in base pixels, computed once."""
+        key = (None, FULL_OCR)
+        if key not in self.ocr_results:
+            # The detector shrinks the frame to its side limit anyway, so it's read as captured
+            result = await paddleocr(self.image)
+            self.ocr_results[key] = scale_ocr_result(result, *frame_scale(self.image))
+        return self.ocr_results[key]
+
+    def release(self):
+        """Drop the frame and everything derived from it, keeping only the path and screen type."""
+        if self.path:
+            self._image = None
+        self.crops.clear()
+        self.ocr_results.clear()
@@ -1,15 +1,16 @@
-import cv2
-import numpy as np
-from ocr import find_text_in_ocr, paddleocr
+from color_signatures import PLAY_MATCH_BUTTON
+from ocr import find_text_in_ocr
 
-async def check_is_regular_match(image):
+def check_is_regular_match(image, ocr_result):
     """
     Checks if match is going to be played as a regular match or simulated
     by checking the "Play Match" text background color.
     If the background is white, the match is regular.
-    """
-    ocr_result = await paddleocr(image)
 
+    Parameters:
+        image (np.array): The image containing the "Play Match" button.
+        ocr_result (list): OCR result of the same image, reused to locate the button text.
+    """
     if not ocr_result:
         return False
 
@@ -32,17 +33,6 @@ async def check_is_regular_match(image):
     # Extract the region of interest (ROI) from the image using the bounding box
     roi = image[y1:y2, x1:x2]
 
-    # Convert the image (ROI) to grayscale for color intensity analysis
-    gray_roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-
-    # Check if the majority of pixels in the ROI are white (value close to 255)
-    white_threshold = 200  # Pixel intensity value to consider as "white"
-    white_pixels = np.sum(gray_roi >= white_threshold)
-    total_pixels = gray_roi.size
-    white_ratio = white_pixels / total_pixels
-
-    # If the majority of the pixels are white, consider it as a regular match
-    if white_ratio > 0.5:  # Adjust this threshold if needed
-        return True  # Regular match (selected)
-    else:
-        return False  # Simulated match (not selected)
\ No newline at end of file
+    # If the majority of the pixels are white (gray value 200 or more), it's a regular match (selected),
+    # otherwise a simulated match (not selected)
+    return bool(PLAY_MATCH_BUTTON.classify([roi])[0])
\ No newline at end of file
@@ -1,11 +1,11 @@
-import os
 import re
-import cv2
-from crop import crop_image
-from ocr import find_text_in_ocr, paddleocr
+from fingerprints import LOOKALIKES, MATCH_SCREEN_TYPES, add_fingerprint, classify_screen
+from layout import region_box
+from ocr import FULL_OCR, find_text_in_ocr
 from positions import find_position_from_ocr
 from save_image import save_image
 from screens.check_is_regular_match import check_is_regular_match
+from screens.detector_scheduler import DetectorScheduler
 from screens.screen_types import (
     MATCH_FACTS, PLAYER_PERFORMANCE, PLAYER_PERFORMANCE_EXTENDED, PRE_MATCH,
     SIM_MATCH_FACTS, SIM_MATCH_PERFORMANCE, SIM_MATCH_PERFORMANCE_BENCH,
@@ -14,64 +14,124 @@ from screens.screen_types import (
 
 DEBUG = True
 
-async def detect_match_screen_type(screenshot_path):
-    if not os.path.exists(screenshot_path):
-        raise FileNotFoundError(f"{screenshot_path} does not exist.")
-    
-    image = cv2.imread(screenshot_path)
-
-    # Attempt each screen detection function and return the first detected type
-    screen_type = await is_pre_match_screen(image)
-    if screen_type:
-        return screen_type
-
-    screen_type = await is_match_facts_screen(image)
-    if screen_type:
+# Regions checked for each screen's anchor text, from the layout registry (screens/screen_layouts.py)
+ANCHOR_REGIONS = {
+    "pre_match": region_box(PRE_MATCH, "anchor"),
+    "match_facts": region_box(MATCH_FACTS, "anchor"),
+    "performance": region_box(PLAYER_PERFORMANCE, "anchor"),
+    "performance_extended": region_box(PLAYER_PERFORMANCE_EXTENDED, "anchor"),
+    "sim_match_facts": region_box(SIM_MATCH_FACTS, "anchor"),
+    "sim_match_performance": region_box(SIM_MATCH_PERFORMANCE, "anchor"),
+}
+
+# Probe confirming a fingerprint match on screens the fingerprints can't tell apart (fingerprints.LOOKALIKES)
+LOOKALIKE_PROBES = {
+    PRE_MATCH: "pre_match",  # Regular or simulated, told apart by the "Play Match" button color
+    SIM_PRE_MATCH: "pre_match",
+    SIM_MATCH_PERFORMANCE: "sim_match_performance",  # Bench view, told apart by the "n/a" text
+    SIM_MATCH_PERFORMANCE_BENCH: "sim_match_performance",
+}
+
+# Shared across screenshots so it learns the usual order of screens
+SCHEDULER = DetectorScheduler()
+
+async def detect_match_screen_type(context, report=None):
+    """
+    Detects the match screen type of a captured screen.
+
+    Parameters:
+        context (ScreenContext): The captured screen, anchor OCR results are kept on it for the processors.
+        report (dict): The active report, used to probe the screens it still needs first.
+    """
+    # Compare the anchor regions with the reference fingerprints first, no OCR needed
+    screen_type, distance = classify_screen(context.image, MATCH_SCREEN_TYPES)
+    if screen_type in LOOKALIKES:
+        # The fingerprint narrows it down to one anchor, its probe tells the lookalikes apart
+        print(f"Screen matched by fingerprint: {screen_type} (distance {distance:.3f}), confirming with OCR")
+        name = LOOKALIKE_PROBES[screen_type]
+        screen_type = run_probe(name, await read_anchors(context, [name]))
+        if screen_type:
+            return detected(context, screen_type, 1)
+    elif screen_type:
+        print(f"Screen matched by fingerprint: {screen_type} (distance {distance:.3f})")
+        SCHEDULER.record(screen_type, 0)
+        context.screen_type = screen_type
         return screen_type
 
-    screen_type = await is_performance_screen(image)
-    if screen_type:
-        return screen_type
+    ranking = SCHEDULER.rank({name: screen_types for name, (_, screen_types) in SCREEN_PROBES.items()}, report)
+    top, top_score = ranking[0]
+
+    # Confirm the most likely screen on its own anchor region first, only while the predictions usually hit
+    predicted = [top] if top_score > 0 and SCHEDULER.prediction_reliable() else []
+    if predicted:
+        screen_type = run_probe(top, await read_anchors(context, predicted))
+        SCHEDULER.record_prediction(bool(screen_type))
+        if screen_type:
+            return detected(context, screen_type, 1)
+
+    # Otherwise read every (other) anchor region in one batched OCR pass
+    remaining = [name for name, _ in ranking if name not in predicted]
+    anchors = await read_anchors(context, remaining)
+
+    # Evaluate the remaining probes on the shared results in ranked order
+    for name in remaining:
+        screen_type = run_probe(name, anchors)
+        if screen_type:
+            if top_score > 0 and not predicted:
+                SCHEDULER.record_prediction(name == top)
+            return detected(context, screen_type, len(predicted) + 1)
+
+    if top_score > 0 and not predicted:
+        SCHEDULER.record_prediction(False)
+    SCHEDULER.record(None, len(predicted) + 1)
+    return "unknown"
 
-    screen_type = await is_performance_extended_screen(image)
-    if screen_type:
-        return screen_type
+def run_probe(name, anchors):
+    rule, _ = SCREEN_PROBES[name]
+    return rule(anchors)
 
-    screen_type = await is_sim_match_facts_screen(image)
-    if screen_type:
-        return screen_type
+def detected(context, screen_type, probes_run):
+    SCHEDULER.record(screen_type, probes_run)
+    # Confirmed by OCR, remember the screen so the next one of its type can skip OCR
+    add_fingerprint(context.image, screen_type)
+    context.screen_type = screen_type
+    return screen_type
 
-    screen_type = await is_sim_match_performance_screen(image)
-    if screen_type:
-        return screen_type
+async def read_anchors(context, names=None):
+    """
+    Crops the anchor regions and reads them with a single batched OCR call.
 
-    return "unknown"
+    Parameters:
+        names (list): Anchor regions to read, all of them by default.
 
-async def is_pre_match_screen(image):
-    cropped_image = crop_image(image, (470, 1170, 1150, 1350))
+    Returns:
+        dict: region name -> (cropped image, PaddleOCR-style result)
+    """
+    regions = {name: ANCHOR_REGIONS[name] for name in (names if names is not None else ANCHOR_REGIONS)}
 
     if DEBUG:
-        save_image(cropped_image, "./images/debug/", "pre_match.png")
+        for name, coords in regions.items():
+            save_image(context.crop(coords), "./images/debug/", f"{name}.png")
+
+    ocr_results = await context.read_regions({name: (coords, FULL_OCR) for name, coords in regions.items()})
 
-    ocr_result = await paddleocr(cropped_image)
+    return {name: (context.crop(coords), ocr_results[name]) for name, coords in regions.items()}
+
+def is_pre_match_screen(anchors):
+    cropped_image, ocr_result = anchors["pre_match"]
     is_pre_match, _, _ = find_text_in_ocr(ocr_result, "play match")
 
     if not is_pre_match:
         return False
     
-    is_regular_pre_match = await check_is_regular_match(cropped_image)
+    is_regular_pre_match = check_is_regular_match(cropped_image, ocr_result)
     if is_regular_pre_match:
         return PRE_MATCH
     
     return SIM_PRE_MATCH
     
-async def is_match_facts_screen(image):
-    cropped_image = crop_image(image, (1859, 420, 2500, 520))
-
-    if DEBUG:
-        save_image(cropped_image, "./images/debug/", "match_facts.png")
-
-    ocr_result = await paddleocr(cropped_image)
+def is_match_facts_screen(anchors):
+    _, ocr_result = anchors["match_facts"]
     is_match_facts, _, _ = find_text_in_ocr(ocr_result, "possession %")
 
     if not is_match_facts:
@@ -79,13 +139,8 @@ async def is_match_facts_screen(image):
     
     return MATCH_FACTS
 
-async def is_performance_screen(image):
-    cropped_image = crop_image(image, (1740, 300, 1840, 400))
-
-    if DEBUG:
-        save_image(cropped_image, "./images/debug/", "performance.png")
-
-    ocr_result = await paddleocr(cropped_image)
+def is_performance_screen(anchors):
+    _, ocr_result = anchors["performance"]
     is_performance_screen = find_position_from_ocr(ocr_result)
 
     if not is_performance_screen:
@@ -93,13 +148,8 @@ async def is_performance_screen(image):
     
     return PLAYER_PERFORMANCE
 
-async def is_performance_extended_screen(image):
-    cropped_image = crop_image(image, (400, 50, 1000, 200))
-
-    if DEBUG:
-        save_image(cropped_image, "./images/debug/", "performance_extended.png")
-
-    ocr_result = await paddleocr(cropped_image)
+def is_performance_extended_screen(anchors):
+    _, ocr_result = anchors["performance_extended"]
     is_performance_extended_screen, _, _ = find_text_in_ocr(ocr_result, "player performance")
 
     if not is_performance_extended_screen:
@@ -107,13 +157,8 @@ async def is_performance_extended_screen(image):
     
     return PLAYER_PERFORMANCE_EXTENDED
 
-async def is_sim_match_facts_screen(image):
-    cropped_image = crop_image(image, (700, 380, 930, 440))
-
-    if DEBUG:
-        save_image(cropped_image, "./images/debug/", "sim_match_facts.png")
-
-    ocr_result = await paddleocr(cropped_image)
+def is_sim_match_facts_screen(anchors):
+    _, ocr_result = anchors["sim_match_facts"]
     is_sim_match_facts_screen, _, _ = find_text_in_ocr(ocr_result, "possession %")
 
     if not is_sim_match_facts_screen:
@@ -121,13 +166,8 @@ async def is_sim_match_facts_screen(image):
     
     return SIM_MATCH_FACTS
 
-async def is_sim_match_performance_screen(image):
-    cropped_image = crop_image(image, (650, 380, 1000, 440))
-
-    if DEBUG:
-        save_image(cropped_image, "./images/debug/", "sim_match_performance.png")
-
-    ocr_result = await paddleocr(cropped_image)
+def is_sim_match_performance_screen(anchors):
+    _, ocr_result = anchors["sim_match_performance"]
     is_sim_match_performance_screen, _, _ = find_text_in_ocr(ocr_result, "bench")
 
     if not is_sim_match_performance_screen:
@@ -139,3 +179,13 @@ async def is_sim_match_performance_screen(image):
         return SIM_MATCH_PERFORMANCE_BENCH
     
     return SIM_MATCH_PERFORMANCE
+
+# Probe per anchor region in fixed priority order: rule and the screen types it can detect
+SCREEN_PROBES = {
+    "pre_match": (is_pre_match_screen, [PRE_MATCH, SIM_PRE_MATCH]),
+    "match_facts": (is_match_facts_screen, [MATCH_FACTS]),
+    "performance": (is_performance_screen, [PLAYER_PERFORMANCE]),
+    "performance_extended": (is_performance_extended_screen, [PLAYER_PERFORMANCE_EXTENDED]),
+    "sim_match_facts": (is_sim_match_facts_screen, [SIM_MATCH_FACTS]),
+    "sim_match_performance": (is_sim_match_performance_screen, [SIM_MATCH_PERFORMANCE, SIM_MATCH_PERFORMANCE_BENCH]),
+}
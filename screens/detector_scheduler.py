@@ -0,0 +1,108 @@
+from collections import Counter, deque
+
+from reports.report_types import REPORT_TYPES
+
+# Score of a probe that can confirm a screen the active report still needs
+MISSING_REQUIRED_WEIGHT = 2.0
+MISSING_OPTIONAL_WEIGHT = 1.0
+# Score added for the share of past transitions from the previous screen to this one
+TRANSITION_WEIGHT = 3.0
+# The top probe is only read on its own while it was right this often over the last PREDICTION_WINDOW screens,
+# a miss costs a second OCR pass over the other anchors
+PREDICTION_WINDOW = 20
+PREDICTION_MIN_HIT_RATE = 0.8
+
+class DetectorScheduler:
+    """
+    Orders the screen detectors so the most likely screen is probed first.
+
+    Probes are ranked by what the active report is still missing and by which
+    screen usually followed the previously detected one. Probes that can't
+    produce a screen of interest keep their fixed priority order after the others.
+    """
+    def __init__(self, report_types=REPORT_TYPES):
+        self.report_types = report_types
+        self.transitions = {}  # previous screen -> Counter of next screens
+        self.last_screen = None
+        self.probes_run = 0
+        self.detections = 0
+        self.predictions = deque(maxlen=PREDICTION_WINDOW)  # Whether the top probe found the screen
+
+    def expected_screens(self, report=None):
+        """
+        Screens worth probing for and their weight.
+
+        Parameters:
+            report (dict): The active report, None when no report has started yet.
+
+        Returns:
+            dict: screen type -> weight
+        """
+        if not report:
+            # Only an initial screen can start a report
+            return {config["initial_screen"]: MISSING_REQUIRED_WEIGHT for config in self.report_types.values()}
+
+        config = self.report_types[report["report_type"]]
+        captured = report["screens_data"]
+
+        expected = {screen: MISSING_REQUIRED_WEIGHT for screen in config["multi_capture_screens"]}
+        expected.update({screen: MISSING_OPTIONAL_WEIGHT for screen in config["optional_screens"] if screen not in captured})
+        expected.update({screen: MISSING_REQUIRED_WEIGHT for screen in config["required_screens"] if screen not in captured})
+        return expected
+
+    def score(self, screen_types, report=None):
+        """Score of a probe that detects any of the given screen types."""
+        expected = self.expected_screens(report)
+        followers = self.transitions.get(self.last_screen, Counter())
+        total = sum(followers.values())
+
+        best = 0.0
+        for screen_type in screen_types:
+            score = expected.get(screen_type, 0.0)
+            if total:
+                score += TRANSITION_WEIGHT * followers[screen_type] / total
+            best = max(best, score)
+
+        return best
+
+    def rank(self, probes, report=None):
+        """
+        Orders the probes from most to least likely.
+
+        Parameters:
+            probes (dict): probe name -> screen types it can detect, in fixed priority order.
+            report (dict): The active report, or None.
+
+        Returns:
+            list: (probe name, score) pairs, ties keep the fixed priority order.
+        """
+        scores = [(name, self.score(screen_types, report)) for name, screen_types in probes.items()]
+        return sorted(scores, key=lambda item: -item[1])
+
+    def record(self, screen_type, probes_run):
+        """Remember a detected screen and how many probes it took."""
+        self.probes_run += probes_run
+        self.detections += 1
+
+        if not screen_type:
+            return
+
+        if self.last_screen:
+            self.transitions.setdefault(self.last_screen, Counter())[screen_type] += 1
+        self.last_screen = screen_type
+
+    def record_prediction(self, hit):
+        """Remember whether the top ranked probe found the screen."""
+        self.predictions.append(hit)
+
+    def prediction_reliable(self):
+        """True once the top ranked probe has usually been right, so it's worth reading its anchor on its own."""
+        if len(self.predictions) < PREDICTION_WINDOW // 2:
+            return False
+        return sum(self.predictions) / len(self.predictions) >= PREDICTION_MIN_HIT_RATE
+
+    def print_stats(self):
+        if self.detections:
+            print(f"Screen detection: {self.probes_run / self.detections:.2f} probes per screenshot over {self.detections} screenshots")
+        if self.predictions:
+            print(f"Screen prediction: {sum(self.predictions) / len(self.predictions):.0%} hits over the last {len(self.predictions)} screenshots")
@@ -9,43 +9,43 @@ from screens.squad_attributes import process_squad_attributes
 from screens.squad_financial import process_squad_financial
 from screens.squad_stats import process_squad_stats
 
-async def extract_data_from_screen(screen_type, screenshot_path, team):
+async def extract_data_from_screen(screen_type, context, team):
     """
-    Process the screenshot data based on the detected screen type.
+    Process the captured screen (ScreenContext) based on the detected screen type.
     Uses OCR to extract information and returns the processed data.
     """
     if screen_type == PRE_MATCH:
-        return await process_pre_match(screenshot_path)
+        return await process_pre_match(context)
     
     elif screen_type == SIM_PRE_MATCH:
-        return await process_pre_match(screenshot_path)
+        return await process_pre_match(context)
     
     elif screen_type == MATCH_FACTS:
-        return await process_match_facts(screenshot_path, team)
+        return await process_match_facts(context, team)
     
     elif screen_type == PLAYER_PERFORMANCE:
-        return await process_player_performance_screen(screenshot_path)
+        return await process_player_performance_screen(context)
     
     elif screen_type == PLAYER_PERFORMANCE_EXTENDED:
-        return await process_player_performance_extended(screenshot_path)
+        return await process_player_performance_extended(context)
     
     elif screen_type == SIM_MATCH_FACTS:
-        return await process_sim_match_facts(screenshot_path, team)
+        return await process_sim_match_facts(context, team)
     
     elif screen_type == SIM_MATCH_PERFORMANCE:
-        return await process_sim_match_performance(screenshot_path, team)
+        return await process_sim_match_performance(context, team)
     
     elif screen_type == SIM_MATCH_PERFORMANCE_BENCH:
-        return await process_sim_match_performance(screenshot_path, team)
+        return await process_sim_match_performance(context, team)
 
     elif screen_type == SQUAD_FINANCIAL:
-        return await process_squad_financial(screenshot_path)
+        return await process_squad_financial(context)
 
     elif screen_type == SQUAD_ATTRIBUTES:
-        return await process_squad_attributes(screenshot_path)
+        return await process_squad_attributes(context)
     
     elif screen_type == SQUAD_STATS:
-        return await process_squad_stats(screenshot_path)
+        return await process_squad_stats(context)
 
     else:
         raise ValueError(f"Unknown screen type: {screen_type}")
\ No newline at end of file
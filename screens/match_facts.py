@@ -4,34 +4,31 @@ import pprint
 import re
 import cv2
 
-from crop import crop_image, crop_region
-from image_processing import upscale_image
-from ocr import extract_number_value, paddleocr, parse_ocr
+from crop import crop_image, region_around
+from image_processing import RegionPipeline
+from digits import DIGITS_ENABLED, THRESHOLD as DIGIT_THRESHOLD, read_digits
+from ocr import FULL_OCR, RECOGNIZE_ONLY, extract_number_value, ocr_regions, paddleocr_batch
+from ocr_result import OcrResult
 from save_image import save_image
+from screens.screen_types import MATCH_FACTS
 
 DEBUG = True
 FOLDER = './images/match_facts'
 os.makedirs(FOLDER, exist_ok=True)
 
-async def process_match_facts(screenshot_path, our_team):
+# Stat values are small, they are upscaled by 6 for the digit templates and OCR
+VALUE_REGION = RegionPipeline(scale=6)
+
+async def process_match_facts(context, our_team):
     our_team_name = our_team['teamName']
-    image = cv2.imread(screenshot_path)
-
-    # Coordinates for cropping the stats
-    match_score_coords = (1900, 80, 3440 - 400, 1440 - 1270)  
-    possession_stats_coords = (1950, 375, 3400 - 880, 1440 - 880) 
-    shots_stats_coords = (1550, 715, 3440 - 500, 1440 - 620)
-    passes_stats_coords = (1550, 800, 3440 - 500, 920)
-    accuracy_stats_coords = (1550, 900, 3440 - 500, 1020)
-    tackles_stats_coords = (1550, 1000, 3440 - 500, 1100)
-
-    # Crop the relevant areas
-    cropped_match_score = crop_image(image, match_score_coords)
-    cropped_possession = crop_image(image, possession_stats_coords)
-    cropped_shots = crop_image(image, shots_stats_coords)
-    cropped_passes = crop_image(image, passes_stats_coords)
-    cropped_accuracy = crop_image(image, accuracy_stats_coords)
-    cropped_tackles = crop_image(image, tackles_stats_coords)
+
+    # Crop the relevant areas, regions are declared in screens/screen_layouts.py
+    cropped_match_score = context.region(MATCH_FACTS, "match_score")
+    cropped_possession = context.region(MATCH_FACTS, "possession")
+    cropped_shots = context.region(MATCH_FACTS, "shots")
+    cropped_passes = context.region(MATCH_FACTS, "passes")
+    cropped_accuracy = context.region(MATCH_FACTS, "accuracy")
+    cropped_tackles = context.region(MATCH_FACTS, "tackles")
 
     if DEBUG:
         save_image(cropped_match_score, FOLDER, "match_score.png")
@@ -41,20 +38,42 @@ async def process_match_facts(screenshot_path, our_team):
         save_image(cropped_accuracy, FOLDER, "accuracy_stats.png")
         save_image(cropped_tackles, FOLDER, "tackles_stats.png")
 
-    # Perform OCR on each cropped section
-    possession_stats_result = await paddleocr(cropped_possession)
-    shots_result = await paddleocr(cropped_shots)
-    passes_result = await paddleocr(cropped_passes)
-    accuracy_result = await paddleocr(cropped_accuracy)
-    tackles_result = await paddleocr(cropped_tackles)
+    cropped_score = crop_score(cropped_match_score)
+
+    # Perform OCR on every cropped section in batched calls
+    # The score sits at a fixed spot in one short line, so it is read without detection
+    ocr_results = await ocr_regions({
+        "possession": (cropped_possession, FULL_OCR),
+        "shots": (cropped_shots, FULL_OCR),
+        "passes": (cropped_passes, FULL_OCR),
+        "accuracy": (cropped_accuracy, FULL_OCR),
+        "tackles": (cropped_tackles, FULL_OCR),
+        "match_score": (cropped_match_score, FULL_OCR),
+        "score": (cropped_score, RECOGNIZE_ONLY),
+    })
+    ocr_results = {name: OcrResult.from_paddle(result) for name, result in ocr_results.items()}
+    possession_stats_result = ocr_results["possession"]
+    shots_result = ocr_results["shots"]
+    passes_result = ocr_results["passes"]
+    accuracy_result = ocr_results["accuracy"]
+    tackles_result = ocr_results["tackles"]
+    match_score_result = ocr_results["match_score"]
+    score_result = ocr_results["score"]
 
     # Extract match facts
-    home, away = await process_match_score(cropped_match_score)
+    home, away = process_match_score(match_score_result, score_result)
     home_possession, away_possession = process_possession_stats(possession_stats_result)
-    home_shots, away_shots = await extract_value(shots_result, "Shots", cropped_shots)
-    home_passes, away_passes = await extract_value(passes_result, "Passes", cropped_passes)
-    home_accuracy, away_accuracy = await extract_value(accuracy_result, "Accuracy", cropped_accuracy)
-    home_tackles, away_tackles = await extract_value(tackles_result, "Tackles", cropped_tackles)
+    (
+        (home_shots, away_shots),
+        (home_passes, away_passes),
+        (home_accuracy, away_accuracy),
+        (home_tackles, away_tackles),
+    ) = await extract_values([
+        (shots_result, "Shots", cropped_shots),
+        (passes_result, "Passes", cropped_passes),
+        (accuracy_result, "Accuracy", cropped_accuracy),
+        (tackles_result, "Tackles", cropped_tackles),
+    ])
 
     # Determine which team is ours
     home_team = home['team_name']
@@ -90,71 +109,100 @@ async def process_match_facts(screenshot_path, our_team):
 
     return match_facts
 
-# Helper function to calculate the center of a bounding box
-def calculate_center(bounding_box):
-    x_coords = [point[0] for point in bounding_box]
-    y_coords = [point[1] for point in bounding_box]
-    center_x = int(sum(x_coords) / len(x_coords))
-    center_y = int(sum(y_coords) / len(y_coords))
-    return center_x, center_y
+def crop_values(ocr_result, keyword, image):
+    """
+    Finds the keyword and crops the home and away values on both sides of it.
 
-# Main function to extract values
-async def extract_value(ocr_result, keyword, image):
+    Parameters:
+        ocr_result (OcrResult): OCR result of the stat row.
+
+    Returns:
+        tuple: (cropped_left, cropped_right), or (None, None) if the keyword wasn't found.
+    """
     TRAVERSE = 505
     CROP_WIDTH = 175
     CROP_HEIGHT = 70
 
-    # Loop through and find keyword
-    for detection_group in ocr_result:
-        for detection in detection_group:
-            if len(detection) >= 2 and isinstance(detection[1], tuple):
-                bounding_box, (text_data, confidence) = detection[0], detection[1]
-
-                # Check if the keyword is present in the detected text
-                if keyword.lower() in text_data.lower():
-                    # Steps to extract the home and away values
-                    # 1. Calculate the center of the keyword's bounding box
-                    # 2. Traverse to the left and right of the keyword center
-                    # 3. Crop the regions and apply OCR to extract the numbers
-                    # 4. Return the extracted home and away values
-
-                    # Calculate the center of the keyword's bounding box
-                    center_x, center_y = calculate_center(bounding_box)
-
-                    # Traverse to the left of the keyword center
-                    left_x = center_x - TRAVERSE
-                    cropped_left = upscale_image(crop_region(image, left_x, center_y, width=CROP_WIDTH, height=CROP_HEIGHT), 6)
-                    right_x = center_x + TRAVERSE
-                    cropped_right = upscale_image(crop_region(image, right_x, center_y, width=CROP_WIDTH, height=CROP_HEIGHT), 6)
-
-                    if DEBUG:
-                        # Save cropped image for debugging
-                        left_image_path = os.path.join(FOLDER, f"home_{keyword}.png")
-                        cv2.imwrite(left_image_path, cropped_left)
-                        right_image_path = os.path.join(FOLDER, f"away_{keyword}.png")
-                        cv2.imwrite(right_image_path, cropped_right)
-
-                    left_ocr_result = await paddleocr(cropped_left) 
-                    if not left_ocr_result or left_ocr_result == [None] or len(left_ocr_result) == 0:
-                        left_ocr_result = []
-                    right_ocr_result = await paddleocr(cropped_right)
-                    if not right_ocr_result or right_ocr_result == [None] or len(right_ocr_result) == 0:
-                        right_ocr_result = []
-                    
-                    home = extract_number_value(left_ocr_result)
-                    away = extract_number_value(right_ocr_result)
-
-                    return home, away
-
-    return None, None
-
-async def process_match_score(image):
-    ocr_result = await paddleocr(image)
-    home_team, away_team = extract_team_names(ocr_result)
+    # Find the keyword
+    index = ocr_result.find_first(keyword)
+    if index is None:
+        return None, None
+
+    # Steps to extract the home and away values
+    # 1. Take the center of the keyword's bounding box
+    # 2. Traverse to the left and right of the keyword center
+    # 3. Crop the regions for OCR
+    center_x, center_y = (int(value) for value in ocr_result.centers[index])
+
+    # Traverse to the left of the keyword center
+    left_x = center_x - TRAVERSE
+    cropped_left = VALUE_REGION(image, region_around(left_x, center_y, width=CROP_WIDTH, height=CROP_HEIGHT))
+    right_x = center_x + TRAVERSE
+    cropped_right = VALUE_REGION(image, region_around(right_x, center_y, width=CROP_WIDTH, height=CROP_HEIGHT))
+
+    if DEBUG:
+        # Save cropped image for debugging
+        left_image_path = os.path.join(FOLDER, f"home_{keyword}.png")
+        cv2.imwrite(left_image_path, cropped_left)
+        right_image_path = os.path.join(FOLDER, f"away_{keyword}.png")
+        cv2.imwrite(right_image_path, cropped_right)
+
+    return cropped_left, cropped_right
+
+# Main function to extract values
+async def extract_values(stats):
+    """
+    Extracts home and away values for several stats.
+    Values are read with the digit templates first (when FCORE_DIGIT_TEMPLATES is on),
+    the unsure ones share a single batched OCR call.
 
+    Parameters:
+        stats (list): (ocr_result, keyword, image) tuples, one per stat.
+
+    Returns:
+        list: (home, away) tuples in the same order as the stats.
+    """
+    crops = [crop_values(ocr_result, keyword, image) for ocr_result, keyword, image in stats]
+    found = [crop for pair in crops if pair[0] is not None for crop in pair]
+
+    # Read every value with the templates when enabled, keep the unsure ones for OCR
+    read = {}
+    unsure = []
+    for index, crop in enumerate(found):
+        if not DIGITS_ENABLED:
+            unsure.append(index)
+            continue
+        text, confidence = read_digits(crop)
+        if confidence >= DIGIT_THRESHOLD and text.replace('.', '', 1).isdigit():
+            read[index] = text
+        else:
+            unsure.append(index)
+
+    value_results = await paddleocr_batch([found[index] for index in unsure]) if unsure else []
+    for index, value_result in zip(unsure, value_results):
+        read[index] = extract_number_value(OcrResult.from_paddle(value_result))
+
+    values = []
+    index = 0
+    for cropped_left, _ in crops:
+        if cropped_left is None:
+            values.append((None, None))
+            continue
+
+        values.append((read[index], read[index + 1]))
+        index += 2
+
+    return values
+
+def crop_score(image):
+    """Crop the score from the match score area."""
     cropped_score = crop_image(image, (520, 0, 680, 100))
     save_image(cropped_score, FOLDER, "debug_crop_score.png")
-    score_ocr_result = await paddleocr(cropped_score)
+
+    return cropped_score
+
+def process_match_score(ocr_result, score_ocr_result):
+    home_team, away_team = extract_team_names(ocr_result)
 
     print("OCR RESULT?", score_ocr_result)
 
@@ -178,7 +226,7 @@ def extract_scores_from_ocr(ocr_output):
     Extracts home and away scores from OCR output.
     
     Parameters:
-        ocr_output (list): The structured OCR output.
+        ocr_output (OcrResult): The OCR result of the score crop.
     
     Returns:
         tuple: Home and away scores as integers, or None if not found.
@@ -190,9 +238,7 @@ def extract_scores_from_ocr(ocr_output):
     score_pattern = re.compile(r'(\d)\s*-\s*(\d)')
 
     # Check each OCR text line for the score pattern
-    for item in ocr_output[0]:
-        text = item[1][0]  # Extract the text part of the OCR item
-        
+    for text in ocr_output.texts:
         # Try to match the score pattern directly
         match = score_pattern.search(text)
         if match:
@@ -212,7 +258,7 @@ def extract_team_names(ocr_output, confidence_threshold=0.7):
     Extracts home and away team names from OCR output, filtering out scores and time formats.
     
     Parameters:
-        ocr_output (list): The structured OCR output.
+        ocr_output (OcrResult): The OCR result of the match score area.
         confidence_threshold (float): Minimum confidence to consider a valid text.
     
     Returns:
@@ -224,18 +270,18 @@ def extract_team_names(ocr_output, confidence_threshold=0.7):
     score_pattern = re.compile(r'^\d\s*-\s*\d$')
     time_pattern = re.compile(r'^\d{1,2}:\d{2}$')
     
-    for bbox, text, confidence in parse_ocr(ocr_output):
+    for text, confidence, x_min in zip(ocr_output.texts, ocr_output.confidences, ocr_output.x_min):
         # Ignore entries with low confidence, score pattern, or time format
         if confidence < confidence_threshold or score_pattern.match(text) or time_pattern.match(text):
             continue
 
         # Determine if the text belongs to the left or right team based on bbox x-coordinates
-        if bbox[0][0] < left_max_x:
+        if x_min < left_max_x:
             left_team_name = text
-            left_max_x = bbox[0][0]
-        elif bbox[0][0] > right_min_x:
+            left_max_x = x_min
+        elif x_min > right_min_x:
             right_team_name = text
-            right_min_x = bbox[0][0]
+            right_min_x = x_min
 
     return left_team_name, right_team_name
 
@@ -243,22 +289,8 @@ def process_home_away_stats(ocr_output, stat_name):
     if not ocr_output:
         return {f'{stat_name}_home': None, f'{stat_name}_away': None}
 
-    items = ocr_output[0]
-    text_items = []
-
-    if not items:
-        return {f'{stat_name}_home': None, f'{stat_name}_away': None}
-
-    for item in items:
-        coords = item[0]
-        text, confidence = item[1]
-        x_coords = [p[0] for p in coords]
-        avg_x = sum(x_coords) / len(x_coords)
-        text_items.append({'x': avg_x, 'text': text})
-
     numbers = []
-    for item in text_items:
-        text = item['text']
+    for text, center_x in zip(ocr_output.texts, ocr_output.centers[:, 0]):
         nums = re.findall(r'\d+\.?\d*', text)
         if nums:
             for num in nums:
@@ -266,7 +298,7 @@ def process_home_away_stats(ocr_output, stat_name):
                     num_value = float(num)
                     if num_value.is_integer():
                         num_value = int(num_value)
-                    numbers.append((item['x'], num_value))
+                    numbers.append((center_x, num_value))
                 except ValueError:
                     continue
     numbers.sort(key=lambda x: x[0])
@@ -1,5 +1,4 @@
 import os
-import cv2
 
 from image_processing import grayscale_image
 from ocr import annotate_ocr_results, paddleocr
@@ -9,10 +8,10 @@ DEBUG = True
 FOLDER = './images/match_facts_extended'
 os.makedirs(FOLDER, exist_ok=True)
 
-async def process_match_facts_extended(screenshot_path):
+async def process_match_facts_extended(context):
     """Process the player performance extended screen to extract data."""
-    image = cv2.imread(screenshot_path)
-    grayscale = grayscale_image(image)
+    # Boxes are only drawn for debugging, so the frame is read as captured
+    grayscale = grayscale_image(context.image)
 
     result = await paddleocr(grayscale)
 
@@ -1,28 +1,29 @@
 import os
-import cv2
-from check_for_mvp import check_for_mvp
-from crop import crop_image
-from image_processing import grayscale_image, upscale_image
+from check_for_mvp import find_mvp
+from image_processing import RegionPipeline, grayscale_image
 
-from ocr import annotate_ocr_results, paddleocr, parse_ocr
+from ocr import annotate_ocr_results, paddleocr_result
 from player_name import clean_player_name, is_valid_player_name
 from save_image import save_image
+from screens.screen_types import PLAYER_PERFORMANCE
 
 # Allow saving images for debugging purposes
 DEBUG = True
 FOLDER = './images/player_performance'
 os.makedirs(FOLDER, exist_ok=True)
 
-async def process_player_performance_screen(screenshot_path):
+# Player names and ratings, upscaled by 4 for OCR (in color, the MVP check needs it)
+PLAYER_PERFORMANCE_REGION = RegionPipeline(region=(PLAYER_PERFORMANCE, "players"), scale=4)
+
+async def process_player_performance_screen(context):
     """Process the player performance screen to extract data."""
-    image = cv2.imread(screenshot_path)
+    image = context.image
 
-    # Crop the image
-    cropped_image = crop_player_performance(image)
-    upscaled_image = upscale_image(cropped_image, 4)
+    # Crop and upscale the image
+    upscaled_image = crop_player_performance(image)
     processed_image = grayscale_image(upscaled_image)
     
-    result = await paddleocr(processed_image)
+    result = await paddleocr_result(processed_image)
 
     if DEBUG:
         save_image(processed_image, FOLDER, "player_performance_processed.png")
@@ -38,7 +39,7 @@ def extract_player_data(ocr_data, image):
     Extract player names, match ratings, and check for MVP from the OCR results.
     
     Parameters:
-        ocr_data (list): The OCR result containing players and match ratings.
+        ocr_data (OcrResult): The OCR result containing players and match ratings.
         image (np.array): The full image to check for the MVP icon.
     
     Returns:
@@ -47,36 +48,34 @@ def extract_player_data(ocr_data, image):
     y_threshold = 50
     x_threshold = 30
     processed_names = set()
-    mvp_found = False  # To track if we've already marked a player as MVP
+    mvp_candidates = []  # (last name bounding box, player) of every player, checked for the MVP icon at the end
 
     # Helper functions for extracting last name and match rating
     def find_last_name(current_index, first_name_bbox):
-        for j in range(current_index + 1, len(ocr_iterator)):
-            next_bbox, next_text, _ = ocr_iterator[j]
+        # Last names sit on the next line, left-aligned with the first name
+        first_name_height = first_name_bbox[2][1] - first_name_bbox[0][1]
+        candidates = spatial.below(current_index, first_name_height + y_threshold, x_threshold, align="left")
+        for j in candidates:
+            next_bbox, next_text, _ = ocr_data[j]
             next_cleaned_text = clean_player_name(next_text)
 
-            if is_valid_player_name(next_cleaned_text) and \
-               abs(next_bbox[0][1] - first_name_bbox[2][1]) <= y_threshold and \
-               abs(next_bbox[0][0] - first_name_bbox[0][0]) <= x_threshold:
+            if is_valid_player_name(next_cleaned_text):
                 return next_cleaned_text, next_bbox
         return None, None
 
     def find_match_rating(current_index, first_name_bbox):
-        for j in range(current_index + 1, len(ocr_iterator)):
-            bbox_right, text_right, _ = ocr_iterator[j]
+        # Ratings are in the same row, to the right of the name
+        first_name_height = first_name_bbox[2][1] - first_name_bbox[0][1]
+        for j in spatial.right_of(current_index, first_name_height + y_threshold):
             try:
-                rating = float(text_right)
-                if bbox_right[0][0] > first_name_bbox[2][0]:  # Ensure it's to the right
-                    return rating
+                return float(ocr_data.texts[j])
             except ValueError:
                 continue
         return None
 
     # Main processing function
     def process_player(i):
-        nonlocal mvp_found  # Inform Python to use the outer scope variable
-        
-        bbox, text, _ = ocr_iterator[i]
+        bbox, text, _ = ocr_data[i]
         cleaned_text = clean_player_name(text)
 
         if is_valid_player_name(cleaned_text):
@@ -90,36 +89,39 @@ def extract_player_data(ocr_data, image):
                 match_rating = find_match_rating(i, first_name_bbox)
 
                 if match_rating is not None:
-                    # Check for MVP only if not already found
-                    is_mvp = False
-                    if not mvp_found and last_name_bbox:
-                        is_mvp = check_for_mvp(image, last_name_bbox, full_name, search_x_offset=190, folder=FOLDER)
-                        if is_mvp:
-                            print(f"Found MVP: {full_name}")
-                            mvp_found = True  # Stop checking further once found
-
                     processed_names.add(full_name)
                     processed_names.add(first_name)
                     if last_name:
                         processed_names.add(last_name)
-                    return {
+                    player = {
                         'full_name': full_name,
                         'match_rating': match_rating,
-                        'is_mvp': is_mvp
+                        'is_mvp': False
                     }
+                    # The MVP icon is checked for all players at once below
+                    if last_name_bbox is not None:
+                        mvp_candidates.append((last_name_bbox, player))
+                    return player
         return None
 
     # Iterate over OCR data and collect players
-    ocr_iterator = list(parse_ocr(ocr_data))
-    player_data = [player for i in range(len(ocr_iterator)) if (player := process_player(i))]
+    spatial = ocr_data.spatial
+    player_data = [player for i in range(len(ocr_data)) if (player := process_player(i))]
+
+    # Only the first player with the MVP icon is the MVP
+    mvp = find_mvp(image, [(bbox, player['full_name']) for bbox, player in mvp_candidates], search_x_offset=190, folder=FOLDER)
+    if mvp is not None:
+        player = mvp_candidates[mvp][1]
+        print(f"Found MVP: {player['full_name']}")
+        player['is_mvp'] = True
 
     return player_data
 
 def crop_player_performance(image):
-    """Crop the image to focus on the relevant area with player names and ratings."""
-    cropped_image = crop_image(image, (1900, 200, 2800, 1250))
+    """Crop the image to focus on the relevant area with player names and ratings, upscaled for OCR."""
+    upscaled_image = PLAYER_PERFORMANCE_REGION(image)
 
     if DEBUG:
-        save_image(cropped_image, FOLDER, "player_performance_cropped.png")
+        save_image(upscaled_image, FOLDER, "player_performance_cropped.png")
     
-    return cropped_image
\ No newline at end of file
+    return upscaled_image
\ No newline at end of file
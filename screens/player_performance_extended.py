@@ -2,26 +2,23 @@
 import os
 import pprint
 
-import cv2
-
-from check_for_mvp import check_for_mvp
-from crop import crop_image
+from check_for_mvp import find_mvp
 from image_processing import grayscale_image
-from ocr import annotate_ocr_results, paddleocr, parse_ocr
+from ocr import annotate_ocr_results, paddleocr_result, parse_ocr
 from save_image import save_image
+from screens.screen_types import PLAYER_PERFORMANCE_EXTENDED
 
 
 DEBUG = True
 FOLDER = './images/player_performance_extended'
 os.makedirs(FOLDER, exist_ok=True)
 
-async def process_player_performance_extended(screenshot_path):
+async def process_player_performance_extended(context):
     """Process the player performance extended screen to extract data."""
-    image = cv2.imread(screenshot_path)
-    cropped_image = crop_performance_area(image)
+    cropped_image = crop_performance_area(context)
     grayscale = grayscale_image(cropped_image)
 
-    result = await paddleocr(grayscale)
+    result = await paddleocr_result(grayscale)
     annotate_ocr_results(grayscale, FOLDER, result)
 
     player_data = extract_player_data(result, cropped_image)
@@ -30,14 +27,14 @@ async def process_player_performance_extended(screenshot_path):
     return player_data
 
 def extract_player_data(ocr_results, image):
-    ocr_results_sorted = sorted(ocr_results, key=lambda x: (x[0][0][1], x[0][0][0]))
+    ocr_results_sorted = ocr_results.sorted_by_position()
 
     # Variables to store x-coordinates of the MR, G, and AST columns
     mr_x, g_x, ast_x = None, None, None
 
     # List to store the extracted player data
     player_data = []
-    mvp_found = False
+    mvp_candidates = []  # (name bounding box, player), the MVP icon is checked for all of them at the end
 
     # Step 1: Find the x-coordinates of MR, G, AST labels
     for bbox, text, confidence in parse_ocr(ocr_results_sorted):
@@ -79,13 +76,7 @@ def extract_player_data(ocr_results, image):
         # Player's name usually follows the position
         elif current_player and current_player["name"] == "":
             current_player["name"] = text
-
-            # Check for MVP if not already found
-            if not mvp_found:
-                is_mvp = check_for_mvp(image, bbox, current_player["name"])
-                if is_mvp:
-                    current_player["mvp"] = True
-                    mvp_found = True
+            mvp_candidates.append((bbox, current_player))
 
         # Numbers (rating, goals, assists) follow after the name
         elif current_player:
@@ -111,6 +102,11 @@ def extract_player_data(ocr_results, image):
     if current_player:
         player_data.append(current_player)
 
+    # Only the first player with the MVP icon is the MVP
+    mvp = find_mvp(image, [(bbox, player["name"]) for bbox, player in mvp_candidates])
+    if mvp is not None:
+        mvp_candidates[mvp][1]["mvp"] = True
+
     return player_data
 
 def is_nearby(value_bbox, label_bbox, tolerance=50):
@@ -131,9 +127,9 @@ def is_nearby(value_bbox, label_bbox, tolerance=50):
     
     return abs(value_x_min - label_x_min) <= tolerance
 
-def crop_performance_area(image):
+def crop_performance_area(context):
     """Crop the image to focus on the relevant area with player names and ratings and stats."""
-    cropped_image = crop_image(image, (420, 400, 1380, 1300))
+    cropped_image = context.region(PLAYER_PERFORMANCE_EXTENDED, "performance")
 
     if DEBUG:
         save_image(cropped_image, FOLDER, "cropped.png")
@@ -4,11 +4,12 @@ import json
 import pprint
 import re
 import cv2
-import numpy as np
-from crop import crop_area, crop_image
-from image_processing import upscale_image
-from ocr import paddleocr
+from color_signatures import FORM_SIGN, MOOD
+from crop import crop_area
+from image_processing import RegionPipeline
+from ocr import DIGITS, ocr_regions, paddleocr
 from player_name import is_valid_player_name
+from screens.screen_types import PRE_MATCH
 
 # Allow saving images for debugging purposes
 DEBUG = True
@@ -16,25 +17,30 @@ DEBUG = True
 FOLDER = './images/pre_match'
 os.makedirs(FOLDER, exist_ok=True)
 
-async def process_pre_match(screenshot_path):
-    # Load the screenshot
-    image = cv2.imread(screenshot_path)
-    upscaled_image = upscale_image(image)
+# Form values are a short number cropped at a fixed offset from the player name,
+# so they are read with the digit templates
+FORM_OCR_MODE = DIGITS
+
+# Positions are measured on the screenshot upscaled by 1.5, only the regions themselves are scaled
+MATCH_DATE_REGION = RegionPipeline(region=(PRE_MATCH, "match_date"), scale=1.5)
+STARTING_11_REGION = RegionPipeline(region=(PRE_MATCH, "starting_11"), scale=1.5)
 
-    # Define crop coordinates for match date and starting 11
-    match_date_coords = (1840, 475, 3240, 620)
-    starting_11_coords = (1720, 590, 3500, 1650)
+# Custom preprocessing for starting_11, this produces the best results
+# Covers a portion of the image where known irrelevant text will be,
+# this removes unnecessary text from the OCR results
+STARTING_11_PREPROCESSING = RegionPipeline(contrast=(1.1, 10), fill=[((0, 1000, 375, 870), (255, 255, 0))])
 
-    # Step 1: Crop relevant sections
-    cropped_match_date = crop_image(upscaled_image, match_date_coords)
-    cropped_starting_11 = crop_image(upscaled_image, starting_11_coords)
-    processed_starting_11 = preprocess_starting_11_image(cropped_starting_11)
+# Player form crops are upscaled, sharpened and contrast enhanced for OCR
+PLAYER_FORM_PREPROCESSING = RegionPipeline(scale=6, grayscale=True, sharpen=True, clahe=(3.0, (10, 10)))
+
+async def process_pre_match(context):
+    # Load the screenshot
+    image = context.image
 
-    # Cover a portion of the image where know irrelevant text will be
-    # This will remove unnecessary text from the OCR results
-    block_coords = (0, 1000, 375, 870)
-    processed_starting_11 = cv2.rectangle(processed_starting_11, (block_coords[0], block_coords[1]), 
-                                          (block_coords[2], block_coords[3]), (255, 255, 0), thickness=-1)
+    # Step 1: Crop and upscale relevant sections
+    cropped_match_date = MATCH_DATE_REGION(image)
+    cropped_starting_11 = STARTING_11_REGION(image)
+    processed_starting_11 = STARTING_11_PREPROCESSING(cropped_starting_11)
 
     # Step 3: Perform OCR on each cropped section
     match_date_result = await paddleocr(cropped_match_date)
@@ -80,6 +86,9 @@ async def extract_starting_11(ocr_results, image):
     """
     CONFIDENCE_THRESHOLD = 0.7  # Minimum confidence level for valid OCR results
     players_info = [] 
+    mood_areas = []  # Mood icons, classified together once all players are found
+    form_areas = []  # Form values, their color gives the sign
+    form_images = []  # Preprocessed form areas, OCR'd together once all players are found
 
     for result in ocr_results:
         for line in result:
@@ -120,8 +129,7 @@ async def extract_starting_11(ocr_results, image):
 
             # Crop mood
             mood_area = crop_area(image, name_center_x - 101, name_center_y - 128, 42, 42)
-            # Detect mood color
-            mood = detect_mood(mood_area)
+            mood_areas.append(mood_area)
 
             # Adjust name_center_x for short names
             player_form_area_offset = name_center_x + 40
@@ -130,11 +138,10 @@ async def extract_starting_11(ocr_results, image):
 
             # Crop player form
             player_form_area = crop_area(image, player_form_area_offset, name_center_y - 121, 75, 40)
-            # Preprocess for better OCR results
-            processed_player_form, isPositive = preprocess_player_form_image(player_form_area)
-            # Perform OCR 
-            player_form_result = await paddleocr(processed_player_form)  # Perform OCR on the form area
-            player_form_value = process_player_form_value(player_form_result, isPositive)
+            form_areas.append(player_form_area)
+            # Upscale, sharpen and enhance contrast for better OCR results
+            processed_player_form = PLAYER_FORM_PREPROCESSING(player_form_area)
+            form_images.append(processed_player_form)
 
             if DEBUG:   
                 # Save image for debugging
@@ -144,16 +151,29 @@ async def extract_starting_11(ocr_results, image):
                 cv2.imwrite(mood_path, mood_area)
 
             # Append player info with relevant data
+            # Mood and form are filled in after the batched color checks and OCR below
             player_info = {
                 "name": player_name,
-                "mood": mood,  
-                "form": player_form_value  
+                "mood": None,  
+                "form": None  
             }
             if is_captain:
                 player_info["is_captain"] = True
 
             players_info.append(player_info)
 
+    # Detect every player's mood color and form sign (green positive, red negative) in one pass each
+    moods = MOOD.classify(mood_areas)
+    form_signs = FORM_SIGN.classify(form_areas)
+
+    # Perform OCR on every player's form area in one batched call
+    form_results = await ocr_regions({
+        index: (form_image, FORM_OCR_MODE) for index, form_image in enumerate(form_images)
+    })
+    for index, (player_info, mood, isPositive) in enumerate(zip(players_info, moods, form_signs)):
+        player_info["mood"] = mood
+        player_info["form"] = process_player_form_value(form_results[index], isPositive)
+
     return players_info
 
 
@@ -189,42 +209,6 @@ def extract_match_date(ocr_output):
 
     return None  # No date found
 
-def is_form_value_positive(image):
-    """
-    Analyze the color information to determine if the form is positive (green) or negative (red).
-    """
-    # Convert image to HSV for better color detection
-    hsv_image = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-
-    # Define color ranges for green and red in HSV space
-    green_lower = (35, 50, 50)
-    green_upper = (85, 255, 255)
-
-    # Red has two ranges in the HSV space (because hue wraps around)
-    red_lower1 = (0, 50, 50)
-    red_upper1 = (10, 255, 255)
-    red_lower2 = (170, 50, 50)
-    red_upper2 = (180, 255, 255)
-
-    # Create masks for the green and red colors
-    green_mask = cv2.inRange(hsv_image, green_lower, green_upper)
-    red_mask1 = cv2.inRange(hsv_image, red_lower1, red_upper1)
-    red_mask2 = cv2.inRange(hsv_image, red_lower2, red_upper2)
-    red_mask = cv2.bitwise_or(red_mask1, red_mask2)
-
-    # Count the number of green and red pixels
-    green_pixels = cv2.countNonZero(green_mask)
-    red_pixels = cv2.countNonZero(red_mask)
-
-    # If there are more red pixels than green, it's negative; otherwise, it's positive
-    if red_pixels > green_pixels:
-        return False  # Negative
-    elif green_pixels > red_pixels:
-        return True  # Positive
-
-    # If neither color is detected, return None
-    return None
-
 def process_player_form_value(ocr_result, isPositive):
     """
     Clean the OCR result for the form value, ensuring it's a valid number.
@@ -251,85 +235,6 @@ def process_player_form_value(ocr_result, isPositive):
                 return None  # If OCR result is not a valid number, return None
     return None
 
-def detect_mood(mood_image):
-    """
-    Analyze the mood image to determine the mood color.
-    This function uses color detection to identify the mood (green, cyan, yellow, red).
-    """
-    if mood_image is None or mood_image.size == 0:
-        return None
-
-    hsv_image = cv2.cvtColor(mood_image, cv2.COLOR_BGR2HSV)
-    
-    # Define color ranges in HSV space for different moods
-    excited_green_lower = (40, 50, 50)  # Green (Excited)
-    excited_green_upper = (75, 255, 255)
-    happy_cyan_lower = (85, 50, 50)  # Cyan-Blue (Happy)
-    happy_cyan_upper = (105, 255, 255)
-    neutral_yellow_lower = (20, 50, 50)  # Yellow (Neutral)
-    neutral_yellow_upper = (30, 255, 255)
-    bad_red_lower1 = (0, 50, 50)  # Red (Bad) - lower range
-    bad_red_upper1 = (10, 255, 255)
-    bad_red_lower2 = (170, 50, 50)  # Red (Bad) - upper range
-    bad_red_upper2 = (180, 255, 255)
-    
-    # Create masks for different colors
-    green_mask = cv2.inRange(hsv_image, excited_green_lower, excited_green_upper)
-    cyan_mask = cv2.inRange(hsv_image, happy_cyan_lower, happy_cyan_upper)
-    yellow_mask = cv2.inRange(hsv_image, neutral_yellow_lower, neutral_yellow_upper)
-    red_mask1 = cv2.inRange(hsv_image, bad_red_lower1, bad_red_upper1)
-    red_mask2 = cv2.inRange(hsv_image, bad_red_lower2, bad_red_upper2)
-    red_mask = cv2.bitwise_or(red_mask1, red_mask2)
-
-    # Check for color presence and return mood
-    if cv2.countNonZero(green_mask) > 0:
-        return "excited"
-    elif cv2.countNonZero(cyan_mask) > 0:
-        return "happy"
-    elif cv2.countNonZero(yellow_mask) > 0:
-        return "neutral"
-    elif cv2.countNonZero(red_mask) > 0:
-        return "bad"
-    
-    return "unknown"
-
-
-
-def preprocess_player_form_image(image):
-
-    """
-    Preprocess the player form image for better OCR results by sharpening,
-    enhancing edges, and ensuring the numbers are solid white on a black background with a black outline.
-    """
-    # Step 1: Use color information to determine the form sign
-    is_positive = is_form_value_positive(image)
-
-    # Step 2: Upscale the image to enhance OCR accuracy
-    image = cv2.resize(image, None, fx=6, fy=6, interpolation=cv2.INTER_LINEAR)
-
-    # Step 3: Convert to grayscale
-    gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-
-
-    # Sharpening the image after blurring
-    kernel = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]])  # Simple sharpening kernel
-    sharpened = cv2.filter2D(gray_image, -1, kernel)
-
-    # Apply CLAHE (more aggressive contrast enhancement)
-    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(10, 10))
-    enhanced = clahe.apply(sharpened)
-
-    return enhanced, is_positive
-
-
-# Custom preprocessing for starting_11
-# This produces the best results
-def preprocess_starting_11_image(image):
-    adjust_contrast = cv2.convertScaleAbs(image, alpha=1.1, beta=10)
-
-    return adjust_contrast
-
-
 # Save pre-match data into a JSON file
 def save_pre_match_data(match_data):
     with open("pre_match_data.json", "w") as f:
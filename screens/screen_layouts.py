@@ -0,0 +1,75 @@
+from screens.screen_types import (
+    MATCH_FACTS, PLAYER_PERFORMANCE, PLAYER_PERFORMANCE_EXTENDED, PRE_MATCH,
+    SIM_MATCH_FACTS, SIM_MATCH_PERFORMANCE, SIM_MATCH_PERFORMANCE_BENCH,
+    SIM_PRE_MATCH, SQUAD_ATTRIBUTES, SQUAD_FINANCIAL, SQUAD_STATS
+)
+
+# Regions shared by every squad screen, used before the screen type is known
+SQUAD = "squad"
+
+# Resolution the regions below were measured on
+MEASURED_RESOLUTION = (3440, 1440)
+
+# Regions per screen type: name -> (x1, y1, x2, y2) in pixels at MEASURED_RESOLUTION
+# "anchor" holds the text (or look) each screen is detected by
+SCREEN_LAYOUTS = {
+    PRE_MATCH: {
+        "anchor": (470, 1170, 1150, 1350),
+    },
+    SIM_PRE_MATCH: {
+        "anchor": (470, 1170, 1150, 1350),
+    },
+    MATCH_FACTS: {
+        "anchor": (1859, 420, 2500, 520),
+        "match_score": (1900, 80, 3040, 170),
+        "possession": (1950, 375, 2520, 560),
+        "shots": (1550, 715, 2940, 820),
+        "passes": (1550, 800, 2940, 920),
+        "accuracy": (1550, 900, 2940, 1020),
+        "tackles": (1550, 1000, 2940, 1100),
+    },
+    PLAYER_PERFORMANCE: {
+        "anchor": (1740, 300, 1840, 400),
+        "players": (1900, 200, 2800, 1250),
+    },
+    PLAYER_PERFORMANCE_EXTENDED: {
+        "anchor": (400, 50, 1000, 200),
+        "performance": (420, 400, 1380, 1300),
+    },
+    SIM_MATCH_FACTS: {
+        "anchor": (700, 380, 930, 440),
+    },
+    SIM_MATCH_PERFORMANCE: {
+        "anchor": (650, 380, 1000, 440),
+    },
+    SIM_MATCH_PERFORMANCE_BENCH: {
+        "anchor": (650, 380, 1000, 440),
+    },
+    SQUAD: {
+        "header": (400, 225, 1750, 350),
+        "player": (1700, 300, 2550, 960),
+        "name": (1750, 360, 2400, 460),
+        "panel": (1700, 300, 2550, 1200),
+        "player_list": (400, 300, 1750, 1300),
+    },
+    SQUAD_ATTRIBUTES: {
+        "anchor": (400, 225, 1750, 350),
+        "player": (1700, 300, 2550, 960),
+    },
+    SQUAD_STATS: {
+        "anchor": (400, 225, 1750, 350),
+        "stats": (1700, 500, 2550, 1300),
+    },
+    SQUAD_FINANCIAL: {
+        "anchor": (400, 225, 1750, 350),
+        "financial": (1700, 570, 2550, 1200),
+    },
+}
+
+# Regions measured on screenshots upscaled as a whole, with that upscaled resolution
+UPSCALED_LAYOUTS = {
+    PRE_MATCH: ((5160, 2160), {
+        "match_date": (1840, 475, 3240, 620),
+        "starting_11": (1720, 590, 3500, 1650),
+    }),
+}
@@ -2,30 +2,45 @@ import difflib
 import os
 import re
 
-import cv2
+import numpy as np
 
+from digits import DIGITS_ENABLED
 from image_processing import grayscale_image
-from ocr import annotate_ocr_results, easyocr_number, extract_number_value, paddleocr, parse_ocr
+from layout import frame_scale
+from ocr import (
+    OcrCascade, annotate_ocr_results, digits_strategy, easyocr_number, number_strategy,
+    parse_ocr, preprocessed,
+)
+from ocr_result import OcrResult
 from save_image import save_image
 
 DEBUG = True
 FOLDER = './images/sim_match_facts'
 os.makedirs(FOLDER, exist_ok=True)
 
-async def process_sim_match_facts(screenshot_path, team):
+# How stat values are read: digit templates first (when FCORE_DIGIT_TEMPLATES is on),
+# then PaddleOCR and EasyOCR, then both again on grayscale
+STATS_CASCADE = OcrCascade([
+    *([("digits", digits_strategy)] if DIGITS_ENABLED else []),
+    ("paddle", number_strategy),
+    ("easyocr", easyocr_number),
+    ("grayscale_paddle", preprocessed(number_strategy, grayscale_image)),
+    ("grayscale_easyocr", preprocessed(easyocr_number, grayscale_image)),
+], budget=3.0)
+
+async def process_sim_match_facts(context, team):
     """
     Main function that processes match facts, returning relevant data.
     """
     our_team_name = team['teamName']
 
-    image = cv2.imread(screenshot_path)
-    result = await paddleocr(image)
+    result = OcrResult.from_paddle(await context.full_ocr())
 
     # Step 1: Process penalties
     penalties = process_penalties(result)
 
     # Step 2: Annotate OCR results for debugging purposes
-    annotate_ocr_results(image.copy(), FOLDER, result)
+    annotate_ocr_results(context.image, FOLDER, result, frame_scale(context.image))
 
     # Step 3: Extract score and team information
     score, score_bbox = extract_score(result)
@@ -33,7 +48,7 @@ async def process_sim_match_facts(screenshot_path, team):
 
     # Step 4: Determine our team and relevant stats
     our_team, their_team = determine_our_team(home_team, away_team, our_team_name)
-    stats = await extract_stats(result, score_bbox, image)
+    stats = await extract_stats(result, score_bbox, context)
 
     # Step 5: Determine match result, including penalties
     winner, home_score, away_score, is_draw, penalties = determine_match_result(score, penalties)
@@ -116,7 +131,7 @@ def determine_our_team(home_team, away_team, our_team):
     else:
         raise ValueError(f"Our team '{our_team}' could not be matched to either '{home_team}' or '{away_team}'.")
 
-async def extract_stats(ocr_data, score_bbox, image):
+async def extract_stats(ocr_data, score_bbox, context):
     """
     Extract statistics values for keywords like 'Possession %', 'Shots', and 'Chances' from an OCR-processed image.
     
@@ -124,9 +139,9 @@ async def extract_stats(ocr_data, score_bbox, image):
     its position relative to the score bounding box, and then crops the relevant area to extract the value below the keyword.
     
     Parameters:
-        ocr_data (list): The OCR result containing bounding boxes and text.
+        ocr_data (OcrResult): The OCR result containing bounding boxes and text.
         score_bbox (list): The bounding box of the score (used to determine home/away sides).
-        image (np.array): The image on which the OCR was run.
+        context (ScreenContext): The screen the OCR was run on, stat values are cropped from it.
     
     Returns:
         dict: A dictionary containing two dictionaries:
@@ -176,34 +191,21 @@ async def extract_stats(ocr_data, score_bbox, image):
                 x_max = int(keyword_x_center + crop_width / 2)
                 y_max = y_min + crop_height
 
-                # Step 6: Crop the area below the keyword in the image
-                cropped_area = image[y_min:y_max, x_min:x_max]
+                # Step 6: Crop the area below the keyword, only the crop is mapped to base resolution
+                cropped_area = context.crop((x_min, y_min, x_max, y_max))
 
-                # Step 7: Run OCR on the cropped image to extract the value (start with paddleOCR)
-                ocr_result = await paddleocr(cropped_area)
-                value = extract_number_value(ocr_result)
+                # Step 7: Read the value, escalating from the digit templates to OCR retries
+                value, stage = await STATS_CASCADE.run(cropped_area)
 
-                # Step 8: If no value is found, try easyOCR
-                if not value:
-                    value = easyocr_number(cropped_area)
-
-                # Step 9: If still no value, apply grayscale processing and retry with paddleOCR
-                if not value:
-                    processed_cropped_area = grayscale_image(cropped_area)
-                    result = await paddleocr(processed_cropped_area)
-                    value = extract_number_value(result)
-
-                # Step 10: Try easyOCR again on the grayscale image
-                if not value:
-                    value = easyocr_number(processed_cropped_area)
-
-                # Step 11: If no value is found after all attempts, set it to 0
-                if not value:
+                # Step 8: If no value is found after all attempts, set it to 0
+                if value is None:
                     value = 0
+                if DEBUG:
+                    print(f"{team_side} {keyword}: {value} ({stage or 'not found'})")
 
-                # Step 12: Store the extracted value in the correct team dictionary under the appropriate keyword
+                # Step 9: Store the extracted value in the correct team dictionary under the appropriate keyword
                 target_stats[keyword] = value
-                # Step 13: Optionally save the cropped area for visual debugging
+                # Step 10: Optionally save the cropped area for visual debugging
                 if DEBUG:
                     save_image(cropped_area, FOLDER, f"{team_side}_{keyword}.png")
 
@@ -224,51 +226,23 @@ def extract_stats_whole(ocr_data, score_bbox):
     # Initialize dictionaries to store the home and away stats
     home_stats = {"Possession %": None, "Shots": None, "Chances": None}
     away_stats = {"Possession %": None, "Shots": None, "Chances": None}
-    
+
     # Loop through the keywords
     # When a keyword is detected we grab the value below it
     # We then determine if the value belongs to the home or away team
     # by comparing the X-center of the keyword with the X-center of the score
     for keyword in keywords:
-        for bbox, text, _ in parse_ocr(ocr_data):
-            # Step 2: Check if this text matches the current keyword
-            if keyword.lower() in text.lower():
-                # Calculate Y-center and X-center of the keyword's bounding box
-                keyword_y_center = (bbox[0][1] + bbox[2][1]) / 2
-                keyword_x_center = (bbox[0][0] + bbox[2][0]) / 2
-                
-                # Step 3: Determine if this is home or away based on comparison with the score X-center
-                if keyword_x_center < score_x_center:
-                    team_side = "home"
-                else:
-                    team_side = "away"
-                
-                # Step 4: Loop through the items again to find the value below the keyword
-                for group_below in ocr_data:
-                    for item_below in group_below:
-                        if isinstance(item_below, list) and len(item_below) == 2 and isinstance(item_below[1], tuple):
-                            bbox_below, (value_text, _) = item_below
-                            
-                            # Calculate Y-center and X-center of the potential value's bounding box
-                            value_y_center = (bbox_below[0][1] + bbox_below[2][1]) / 2
-                            value_x_center = (bbox_below[0][0] + bbox_below[2][0]) / 2
-                            
-                            # Step 5: Check if the value is below the keyword (Y-axis) and within the same column (X-axis)
-                            if (value_y_center > keyword_y_center and
-                                abs(value_y_center - keyword_y_center) < y_threshold and
-                                abs(value_x_center - keyword_x_center) < x_threshold):
-
-                                try:
-                                    value_text = int(value_text.strip())
-                                except ValueError:
-                                    break
-                                
-                                # Step 6: Store the value in the correct team's stats dictionary
-                                if team_side == "home":
-                                    home_stats[keyword] = value_text
-                                else:
-                                    away_stats[keyword] = value_text
-                                break                 
+        for index in ocr_data.find(keyword):
+            # Determine if this is home or away based on comparison with the score X-center
+            target_stats = home_stats if ocr_data.centers[index, 0] < score_x_center else away_stats
+
+            # Nearest value below the keyword (Y-axis) and within the same column (X-axis)
+            below = ocr_data.spatial.below(index, y_threshold, x_threshold)
+            if len(below):
+                try:
+                    target_stats[keyword] = int(ocr_data.texts[below[0]].strip())
+                except ValueError:
+                    pass
 
     return home_stats, away_stats
 
@@ -277,7 +251,7 @@ def process_penalties(ocr_data):
     Check if penalties occurred in the match and determine the winner if applicable.
     
     Parameters:
-        ocr_data (list): The OCR output from the image.
+        ocr_data (OcrResult): The OCR output from the image.
         
     Returns:
         dict: Contains the result of the penalty check and the winner if applicable.
@@ -311,18 +285,19 @@ def process_penalties(ocr_data):
         pen_top_y = pen_bbox[0][1]  # Top Y of the PEN bounding box
         pen_x_center = (pen_bbox[0][0] + pen_bbox[2][0]) / 2  # X-center of the "PEN" bbox
 
-        # Search for penalty scores near the "PEN" bbox
-        for bbox, text, _ in parse_ocr(ocr_data):
+        # Search for penalty scores near the "PEN" bbox, in OCR order
+        nearby = np.sort(ocr_data.spatial.band(pen_y_center - y_threshold, pen_y_center + y_threshold))
+        for index in nearby:
+            bbox, text, _ = ocr_data[index]
             try:
                 number = int(text.strip())
             except ValueError:
                 continue  # Skip non-numeric text
 
-            current_y_center = (bbox[0][1] + bbox[2][1]) / 2
             current_bottom_y = bbox[2][1]  # Bottom Y-coordinate of the bbox
 
-            # Check if the current number is close to the PEN text and below/aligned with it
-            if (abs(current_y_center - pen_y_center) <= y_threshold) and (current_bottom_y >= pen_top_y):
+            # Check if the current number is below/aligned with the PEN text
+            if current_bottom_y >= pen_top_y:
                 current_x_center = (bbox[0][0] + bbox[2][0]) / 2  # X-center of the number bbox
 
                 # Assign the number to the home or away team based on its X-position relative to the PEN text
@@ -348,7 +323,7 @@ def extract_teams(ocr_data):
     # Find the match score value and it's location
     score_value, score_bbox = extract_score(ocr_data)
 
-    if not score_bbox or not score_value:
+    if score_bbox is None or not score_value:
         print("Score not found, abort")
         return
 
@@ -375,23 +350,13 @@ def extract_team_names(ocr_data, score_bbox):
     score_y_center = (score_bbox[0][1] + score_bbox[2][1]) / 2
     
     # Find all items in the same Y row based on threshold
-    same_row_items = []
-    for group in ocr_data:
-        for item in group:
-            if isinstance(item, list) and len(item) == 2 and isinstance(item[1], tuple):
-                bbox, (text, _) = item
-                item_y_center = (bbox[0][1] + bbox[2][1]) / 2
-                if abs(item_y_center - score_y_center) < y_threshold:  # Check if Y is within threshold
-                    same_row_items.append(item)
+    same_row = ocr_data.spatial.row(score_y_center, y_threshold)  # Sorted left-to-right
     
     # Grab the home and away team names
     # They are most likely located on the far-left and far-right
-    if same_row_items:
-        home_team = min(same_row_items, key=lambda x: x[0][0][0])  # Find smallest X-coordinate
-        home_team_name = home_team[1][0].strip()  # Extract the home team name
-
-        away_team = max(same_row_items, key=lambda x: x[0][0][0])  # Find largest X-coordinate
-        away_team_name = away_team[1][0].strip()
+    if len(same_row):
+        home_team_name = ocr_data.texts[same_row[0]].strip()  # Smallest X-coordinate
+        away_team_name = ocr_data.texts[same_row[-1]].strip()  # Largest X-coordinate
     else:
         home_team_name = None
         away_team_name = None
@@ -4,10 +4,12 @@ import pprint
 import re
 
 import cv2
-import numpy as np
 
+from color_signatures import GOAL_ICON, SUB_CARET
 from crop import crop_area
-from ocr import paddleocr, parse_ocr
+from layout import BASE_RESOLUTION
+from ocr import paddleocr_result, parse_ocr
+from ocr_result import OcrResult
 from player_name import clean_player_name, is_valid_player_name
 from save_image import save_image
 
@@ -15,15 +17,14 @@ DEBUG = True
 FOLDER = './images/sim_match_performance'
 os.makedirs(FOLDER, exist_ok=True)
 
-async def process_sim_match_performance(screenshot_path, team):
+async def process_sim_match_performance(context, team):
     team_name = team['teamName']
 
-    image = cv2.imread(screenshot_path)
     # Step 1: Perform OCR on the full image using paddleocr
-    ocr_data = await paddleocr(image)
+    ocr_data = OcrResult.from_paddle(await context.full_ocr())
 
     # Step 2: Detect the team side (home or away)
-    _, image_width, _ = image.shape  # Get image dimensions
+    image_width, _ = BASE_RESOLUTION  # OCR boxes are in base pixels
     team_side = detect_team_side(ocr_data, team_name, image_width)
     if not team_side:
         raise ValueError(f"Team '{team_name}' not found in the OCR output")
@@ -36,12 +37,12 @@ async def process_sim_match_performance(screenshot_path, team):
     bench_midpoint_x, bench_y = anchor_result  
 
     # Step 4: Crop the image based on the team side and bench midpoint
-    cropped_image = crop_team_players(image, bench_midpoint_x, bench_y)
+    cropped_image = crop_team_players(context, bench_midpoint_x, bench_y)
     cropped_filename = os.path.join(FOLDER, f"{team_side}.png")
     cv2.imwrite(cropped_filename, cropped_image)
 
     # Step 5: Re-run OCR on the cropped image to get player data
-    cropped_ocr_data = await paddleocr(cropped_image)
+    cropped_ocr_data = await paddleocr_result(cropped_image)
 
     # Step 6: Extract player information (name, rating, is_sub, scored_goal)
     player_data = extract_player_data(cropped_ocr_data, cropped_image, team_side)
@@ -125,14 +126,14 @@ def find_anchors(ocr_data, team_side, image_width):
                 bench_box = bbox
 
     # Fallback mechanism if 'Bench' is not found
-    if starting_box and not bench_box:
+    if starting_box is not None and bench_box is None:
         print("Warning: 'Bench' label not found. Using 'Starting 11' as fallback.")
         starting_right_x = starting_box[1][0]  # Right X-coordinate of 'Starting 11'
         bottom_y = starting_box[2][1]  # Bottom Y-coordinate of 'Starting 11'
         return starting_right_x, bottom_y
 
     # If both anchors are found, calculate the midpoint X-coordinate and bottom Y-coordinate
-    if starting_box and bench_box:
+    if starting_box is not None and bench_box is not None:
         starting_right_x = starting_box[1][0]  # Right X-coordinate of 'Starting 11'
         bench_left_x = bench_box[0][0]  # Left X-coordinate of 'Bench'
         midpoint_x = (starting_right_x + bench_left_x) // 2
@@ -145,12 +146,12 @@ def find_anchors(ocr_data, team_side, image_width):
     return None
 
 
-def crop_team_players(image, bench_midpoint_x, bench_y):
+def crop_team_players(context, bench_midpoint_x, bench_y):
     """
     Crop the image to include only the relevant team’s players, based on the team side and the horizontal midpoint between 'Starting 11' and 'Bench'.
     
     Parameters:
-        image (np.array): The input image containing the full match performance screen.
+        context (ScreenContext): The match performance screen, only the players' crop is mapped to base resolution.
         bench_midpoint_x (int): The X-coordinate of the midpoint between 'Starting 11' and 'Bench' for cropping.
         bench_y (int): The Y-coordinate of the bottom edge of the 'Bench' bounding box.
 
@@ -164,7 +165,8 @@ def crop_team_players(image, bench_midpoint_x, bench_y):
     midpoint_offset = 750 // 2
     y_point = bench_y - 0
 
-    return crop_area(image, midpoint_x - midpoint_offset, y_point, cropping_width, cropping_height)
+    x_point = midpoint_x - midpoint_offset
+    return context.crop((x_point, int(y_point), x_point + cropping_width, int(y_point) + cropping_height))
     
 def extract_player_data(ocr_data, image, team_side):
     """
@@ -179,9 +181,11 @@ def extract_player_data(ocr_data, image, team_side):
         list: A list of dictionaries containing player info (name, rating, is_sub, scored_goal, is_captain).
     """
     player_data = []
+    goal_areas = []  # Goal icon area per player, checked together at the end
+    sub_areas = []  # Substitution caret area per player
     
     # Step 1: Sort OCR data by Y-coordinate (rows), then by X-coordinate (columns)
-    sorted_ocr_data = sorted(parse_ocr(ocr_data), key=lambda x: (x[0][0][1], x[0][0][0]))
+    sorted_ocr_data = ocr_data.sorted_by_position()
 
     row_data = []
     current_row = []
@@ -236,27 +240,30 @@ def extract_player_data(ocr_data, image, team_side):
                 except ValueError:
                     continue  # Skip non-numeric values
 
-            player['scored_goal'] = check_for_scored_goal(image, player_box, team_side, player['name'])
+            goal_areas.append(crop_goal_area(image, player_box, team_side, player['name']))
 
             is_captain, player['name'] = check_captaincy(player['name'], row, team_side, player_box)
             if is_captain:
                 player['is_captain'] = True
 
-            is_sub = check_for_substitution(image, player_box, team_side, player['name'], is_captain)
-            if is_sub:
-                player['is_sub'] = True
-
+            sub_areas.append(crop_substitution_area(image, player_box, team_side, player['name'], is_captain))
 
             # Add the player to the list
             player_data.append(player)
 
+    # Step 4: Check every player's goal icon and substitution caret in one pass each
+    for player, scored_goal, is_sub in zip(player_data, GOAL_ICON.classify(goal_areas), SUB_CARET.classify(sub_areas)):
+        player['scored_goal'] = bool(scored_goal)
+        if is_sub:
+            player['is_sub'] = True
+
     return player_data
 
 
 
-def check_for_scored_goal(image, player_box, team_side, player_name):
+def crop_goal_area(image, player_box, team_side, player_name):
     """
-    Check if the player has scored a goal based on the presence of a white soccer ball icon near the player name.
+    Crop the area next to the player name where the white soccer ball icon of a goal scorer would be.
     
     Parameters:
         image (np.array): The full image in which the player data exists.
@@ -264,7 +271,7 @@ def check_for_scored_goal(image, player_box, team_side, player_name):
         team_side (str): Either 'home' or 'away' indicating where the goal icon would appear.
     
     Returns:
-        bool: True if the player has scored a goal (i.e., if the ball icon is detected), False otherwise.
+        np.array: The cropped area, checked with color_signatures.GOAL_ICON. None for an invalid team side.
     """
     # Get the coordinates of the player name's bounding box
     _, y_min = player_box[0]  # Top-left corner
@@ -282,7 +289,7 @@ def check_for_scored_goal(image, player_box, team_side, player_name):
         x_point = width - 98
     else:
         # Invalid team side
-        return False
+        return None
 
     crop_y = y_min  # Crop area aligned with the player's bounding box vertically
 
@@ -296,21 +303,13 @@ def check_for_scored_goal(image, player_box, team_side, player_name):
         else:
             save_image(cropped_area, FOLDER, f"goal_{player_name}.png")
 
-    # Analyze the cropped area for the presence of white pixels (ball icon)
-    white_threshold = 200  # Threshold to consider a pixel as "white"
-    white_pixel_count = np.sum(cropped_area >= white_threshold)
-
-    # Check if a significant portion of the cropped area is white (representing the ball icon)
-    total_pixels = cropped_area.size
-    white_percentage = (white_pixel_count / total_pixels) * 100
+    return cropped_area
 
-    return white_percentage > 50  # If more than 75% of the area is white, we detect a goal
 
-
-def check_for_substitution(image, player_box, team_side, player_name, is_captain):
+def crop_substitution_area(image, player_box, team_side, player_name, is_captain):
     """
-    Check if the player was involved in a substitution based on the presence of green (sub) caret icon
-    We don't actually check for an icon, we just count the color pixels in the area where the icon would be.
+    Crop the area where the green substitution caret would be.
+    We don't actually check for an icon, color_signatures.SUB_CARET counts the color pixels in the area.
     
     Parameters:
         image (np.array): The full image in which the player data exists.
@@ -320,7 +319,7 @@ def check_for_substitution(image, player_box, team_side, player_name, is_captain
         is_captain (bool): Whether the player is the captain. Offsets are adjusted based on this.
     
     Returns:
-        bool: True if substitution icon was detected, False otherwise
+        np.array: The cropped area, None if it's empty or the team side is invalid.
     """
     # Get the coordinates of the player name's bounding box
     x_max, y_min = player_box[2]  # Bottom-right corner of the player name
@@ -345,7 +344,7 @@ def check_for_substitution(image, player_box, team_side, player_name, is_captain
         crop_x = max(0, x_min - crop_width - x_offset)
     else:
         # Invalid team side
-        return False, False
+        return None
 
     # Use the Y midpoint to ensure we center the crop vertically on the caret
     crop_y = y_mid - (crop_height // 2)
@@ -356,33 +355,13 @@ def check_for_substitution(image, player_box, team_side, player_name, is_captain
     # Ensure the cropped area is not empty or invalid before proceeding
     if cropped_area is None or cropped_area.size == 0:
         print(f"Error: Cropped area for player {player_name} is empty. Skipping.")
-        return False, False
+        return None
 
     # Save the cropped area for debugging
     if DEBUG:
         save_image(cropped_area, FOLDER, f"sub_{player_name}.png")
 
-    # Adjusted green caret color thresholds with higher saturation
-    lower_green = np.array([50, 100, 50], dtype=np.uint8)  # Green lower bound
-    upper_green = np.array([80, 255, 255], dtype=np.uint8)  # Green upper bound
-
-
-    # Convert the cropped area to HSV for better color detection
-    hsv_cropped_area = cv2.cvtColor(cropped_area, cv2.COLOR_BGR2HSV)
-
-    # Create masks to detect green and red pixels in the HSV space
-    green_mask = cv2.inRange(hsv_cropped_area, lower_green, upper_green)
-
-    # Count green and red pixels
-    green_pixel_count = np.sum(green_mask > 0)
-
-
-    # Determine if player is a sub or benched based on the detected colors
-    green_threshold = 20  # Adjust this based on tests for the green caret
-    
-    is_sub = green_pixel_count > green_threshold
-
-    return is_sub
+    return cropped_area
 
 def check_captaincy(player_name, row, team_side, player_box):
     """
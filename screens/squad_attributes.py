@@ -3,12 +3,13 @@ import os
 import pprint
 import re
 
-import cv2
 from crop import crop_image
-from ocr import paddleocr, parse_ocr
-from playstyles import match_playstyle
+from ocr import DIGITS, FULL_OCR, ocr_regions
+from ocr_result import OcrResult
+from playstyles import match_playstyles
 from positions import positions
 from save_image import save_image
+from screens.screen_types import SQUAD_ATTRIBUTES
 from squad.squad_attributes_data_manager import SquadAttributesDataManager
 
 DEBUG = True
@@ -19,15 +20,23 @@ os.makedirs(FOLDER, exist_ok=True)
 # Initialize a manager to handle multiple sequential screenshots
 manager = SquadAttributesDataManager()
 
-async def process_squad_attributes(screenshot_path):
+# Areas read from the player card: (x1, y1, x2, y2), OCR mode
+# The overall rating is a single number at a fixed spot, so it is read with the digit templates
+PLAYER_INFO_REGIONS = {
+    "overall": ((70, 0, 180, 60), DIGITS),
+    "position": ((180, 0, 600, 60), FULL_OCR),
+    "info": ((70, 160, 800, 260), FULL_OCR),
+    "skills": ((70, 300, 460, 800), FULL_OCR),
+}
+
+async def process_squad_attributes(context):
     """
     Process the squad attributes screen
     Extracts the attributes of one player at a time
     At the end compiles a list of all processed players for mass submitting
     """
     # Load the screenshot
-    image = cv2.imread(screenshot_path)
-    cropped_image = crop_image(image, (1700, 300, 2550, 960))
+    cropped_image = context.region(SQUAD_ATTRIBUTES, "player")
     save_image(cropped_image, FOLDER, "cropped_image.png")
 
     # Extract player data
@@ -41,21 +50,21 @@ async def extract_player_info(image):
     player = {}
 
     # Crop specific areas for OCR
-    cropped_overall = crop_image(image, (70, 0, 180, 60))
-    cropped_position = crop_image(image, (180, 0, 600, 60))
-    cropped_info = crop_image(image, (70, 160, 800, 260))
-    cropped_skills = crop_image(image, (70, 300, 460, 800))
+    regions = {
+        name: (crop_image(image, coords), mode)
+        for name, (coords, mode) in PLAYER_INFO_REGIONS.items()
+    }
 
     if DEBUG:
-        save_image(cropped_overall, FOLDER, "cropped_overall.png")
-        save_image(cropped_position, FOLDER, "cropped_position.png")
-        save_image(cropped_info, FOLDER, "cropped_info.png")
-        save_image(cropped_skills, FOLDER, "cropped_skills.png")
+        for name, (cropped, _) in regions.items():
+            save_image(cropped, FOLDER, f"cropped_{name}.png")
 
-    ocr_overall = await paddleocr(cropped_overall)
-    ocr_position = await paddleocr(cropped_position)
-    ocr_info = await paddleocr(cropped_info)
-    ocr_skills = await paddleocr(cropped_skills)
+    # Read all areas with batched OCR calls
+    ocr_results = await ocr_regions(regions)
+    ocr_overall = OcrResult.from_paddle(ocr_results["overall"])
+    ocr_position = OcrResult.from_paddle(ocr_results["position"])
+    ocr_info = OcrResult.from_paddle(ocr_results["info"])
+    ocr_skills = OcrResult.from_paddle(ocr_results["skills"])
 
     player['overall_rating'] = extract_overall_rating(ocr_overall)
     player['position'] = extract_position(ocr_position)
@@ -68,11 +77,7 @@ async def extract_player_info(image):
     bottom_row = crop_playstyles(image, 506, 575, amount=3)
 
     playstyle_images = top_row + bottom_row
-    playstyles = []
-
-    for playstyle_image in playstyle_images:
-        playstyle, _ = match_playstyle(playstyle_image, is_gk=is_gk)
-        playstyles.append((playstyle))
+    playstyles = [playstyle for playstyle, _ in match_playstyles(playstyle_images, is_gk=is_gk)]
 
     player['playstyles'] = list(filter(None, playstyles))
 
@@ -141,8 +146,8 @@ def extract_basic_info(info_ocr):
     weight_pattern = re.compile(r'Weight\s*(\d{1,3})\s*[lI1][bB][sS]', re.IGNORECASE)
     pref_foot_pattern = re.compile(r'Pref\.\s*Foot\s*([LR])', re.IGNORECASE)
 
-    # Use parse_ocr to extract text and combine it into a single string
-    text_parts = [text.strip() for _, text, _ in parse_ocr(info_ocr) if isinstance(text, str)]
+    # Combine the detected texts into a single string
+    text_parts = [text.strip() for text in info_ocr.texts if isinstance(text, str)]
     combined_text = ' '.join(text_parts).strip()
 
     # Find and parse age
@@ -197,8 +202,8 @@ def extract_skills(ocr_skills, is_goalkeeper=False):
     # Initialize skills dictionary with expected labels set to None
     skills = {skill: None for skill in expected_skills}
     
-    # Extract text-only entries from OCR data using parse_ocr
-    extracted_texts = [text.strip() for _, text, _ in parse_ocr(ocr_skills)]
+    # Extract text-only entries from OCR data
+    extracted_texts = [text.strip() for text in ocr_skills.texts]
 
     # Track the current index in extracted_texts
     # Track the current index in extracted_texts
@@ -231,7 +236,7 @@ def extract_overall_rating(ocr_data):
     Extracts and validates the overall rating from OCR data.
     """
     try:
-        rating_text = ocr_data[0][0][1][0]
+        rating_text = ocr_data.texts[0]
         rating = int(rating_text)
         if 1 <= rating <= 99:
             return rating
@@ -244,10 +249,8 @@ def extract_position(ocr_position_data):
     """
     Extracts valid positions from OCR data, handling combined strings without whitespace.
     """
-    texts = []
-    for item in ocr_position_data[0][0]:
-        if isinstance(item, tuple):
-            texts.append(item[0])
+    # Only the first detection holds the position(s)
+    texts = ocr_position_data.texts[:1]
 
     combined_text = ''.join(texts).upper()
 
@@ -3,11 +3,9 @@ import os
 import pprint
 import re
 
-import cv2
-
-from crop import crop_image
-from ocr import annotate_ocr_results, paddleocr, parse_ocr
+from ocr import annotate_ocr_results, paddleocr_result
 from save_image import save_image
+from screens.screen_types import SQUAD_FINANCIAL
 
 
 DEBUG = True
@@ -17,13 +15,10 @@ os.makedirs(FOLDER, exist_ok=True)
 
 # Initialize a manager to handle multiple sequential screenshots
 
-async def process_squad_financial(screenshot_path):
-    # Load the screenshot
-    image = cv2.imread(screenshot_path)
-
-    cropped_image = crop_image(image, (1700, 570, 2550, 1200))
+async def process_squad_financial(context):
+    cropped_image = context.region(SQUAD_FINANCIAL, "financial")
     save_image(cropped_image, FOLDER, "cropped_image.png")
-    ocr_ext = await paddleocr(cropped_image)
+    ocr_ext = await paddleocr_result(cropped_image)
     print(ocr_ext)
 
     if DEBUG:
@@ -38,10 +33,8 @@ def sort_ocr_data(ocr_data):
     """
     Sorts OCR data by Y and X coordinates to structure it as rows.
     """
-    # Use parse_ocr to get a cleaned list of (bbox, text, confidence)
-    parsed_entries = list(parse_ocr(ocr_data))
-    # Sort by Y, then by X
-    return sorted(parsed_entries, key=lambda x: (x[0][0][1], x[0][0][0]))
+    # Sort by Y, then by X and return a list of (bbox, text, confidence)
+    return list(ocr_data.sorted_by_position())
 
 def process_row(row, data_labels, contract_length_pattern):
     """
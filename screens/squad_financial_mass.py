@@ -2,12 +2,12 @@
 import os
 import pprint
 import re
-import cv2
+import numpy as np
 
-from crop import crop_image
-from image_processing import upscale_image
-from ocr import annotate_ocr_results, paddleocr
+from image_processing import RegionPipeline
+from ocr import annotate_ocr_results, paddleocr_result
 from save_image import save_image
+from screens.screen_layouts import SQUAD
 from squad.squad_financial_data_manager import SquadFinancialDataManager
 
 DEBUG = True
@@ -15,6 +15,9 @@ DEBUG = True
 FOLDER = './images/squad_financial'
 os.makedirs(FOLDER, exist_ok=True)
 
+# Player list, upscaled for OCR
+PLAYER_LIST_REGION = RegionPipeline(region=(SQUAD, "player_list"), scale=1.5)
+
 # Initialize a manager to handle multiple sequential screenshots
 manager = SquadFinancialDataManager()
 
@@ -25,19 +28,17 @@ VALUE = 'value'
 WAGE = 'wage'
 CONTRACT_LENGTH = 'contract_length'
 
-async def process_squad_financial_mass(screenshot_path):
+async def process_squad_financial_mass(context):
     """
     Process the squad financial screen.
     """
     # Load the screenshot
-    image = cv2.imread(screenshot_path)
-
-    cropped_image = crop_image(image, (400, 300, 1750, 1300))
-    save_image(cropped_image, FOLDER, "cropped_image.png")
+    image = context.image
 
-    upscaled_image = upscale_image(cropped_image)
+    upscaled_image = PLAYER_LIST_REGION(image)
+    save_image(upscaled_image, FOLDER, "cropped_image.png")
 
-    ocr_results = await paddleocr(upscaled_image)
+    ocr_results = await paddleocr_result(upscaled_image)
     print(ocr_results)
     if DEBUG:
         annotate_ocr_results(upscaled_image, FOLDER, ocr_results)
@@ -81,47 +82,17 @@ async def process_squad_financial_mass(screenshot_path):
     }
 
 def extract_player_data(ocr_data):
-    # Extract the data from the OCR output
-    data = ocr_data[0]
-    entries = []
-    for item in data:
-        bbox = item[0]  # The bounding box
-        text_conf = item[1]
-        text = text_conf[0]
-        conf = text_conf[1]
-        x_center = sum([point[0] for point in bbox]) / 4.0
-        y_center = sum([point[1] for point in bbox]) / 4.0
-        entries.append({
-            'bbox': bbox,
-            'text': text,
-            'conf': conf,
-            'x_center': x_center,
-            'y_center': y_center
-        })
-
-    # Sort entries by y_center (vertical position)
-    entries.sort(key=lambda x: x['y_center'])
+    """
+    Extracts one player per row from the squad financial list.
+
+    Parameters:
+        ocr_data (OcrResult): OCR result of the squad list.
+    """
+    x_centers = ocr_data.centers[:, 0]
 
     # Group entries into rows based on y_center proximity
-    rows = []
-    current_row = []
-    current_y = None
     threshold = 30  # Adjust as needed based on the data
-
-    for entry in entries:
-        y = entry['y_center']
-        if current_y is None:
-            current_y = y
-            current_row = [entry]
-        elif abs(y - current_y) < threshold:
-            current_row.append(entry)
-        else:
-            rows.append(current_row)
-            current_row = [entry]
-            current_y = y
-
-    if current_row:
-        rows.append(current_row)
+    rows = ocr_data.rows(threshold)
 
     # Define column boundaries based on x_center (horizontal position)
     columns = [
@@ -133,27 +104,23 @@ def extract_player_data(ocr_data):
         (CONTRACT_LENGTH, 1600, 1800)
     ]
 
-    def get_column(x_center):
-        for column_name, x_min, x_max in columns:
-            if x_min <= x_center <= x_max:
-                return column_name
-        return None
-
     # Assign columns to each entry based on x_center
-    for entry in entries:
-        entry['column'] = get_column(entry['x_center'])
+    entry_columns = [None] * len(ocr_data)
+    for column_name, x_min, x_max in columns:
+        for index in np.flatnonzero((x_centers >= x_min) & (x_centers <= x_max)):
+            if entry_columns[index] is None:
+                entry_columns[index] = column_name
 
     # Extract data for each player
     players = []
 
     for row in rows:
-        # Sort entries in row by x_center
-        row.sort(key=lambda x: x['x_center'])
+        # Rows are already sorted left-to-right
         columns_in_row = {}
-        for entry in row:
-            column_name = entry['column']
+        for index in row:
+            column_name = entry_columns[index]
             if column_name:
-                columns_in_row.setdefault(column_name, []).append(entry)
+                columns_in_row.setdefault(column_name, []).append(index)
 
         # Initialize player data
         player = {}
@@ -163,7 +130,7 @@ def extract_player_data(ocr_data):
             entries_in_column = columns_in_row.get(column_name, [])
             if entries_in_column:
                 if column_name == NAME:
-                    texts = [e['text'] for e in entries_in_column]
+                    texts = [ocr_data.texts[index] for index in entries_in_column]
                     # Check for captain marker 'c'
                     if 'c' in texts:
                         captain = True
@@ -172,8 +139,8 @@ def extract_player_data(ocr_data):
                     player[NAME] = player_name
                 else:
                     # Choose the text with the highest confidence
-                    best_entry = max(entries_in_column, key=lambda e: e['conf'])
-                    field_value = best_entry['text']
+                    best_entry = max(entries_in_column, key=lambda index: ocr_data.confidences[index])
+                    field_value = ocr_data.texts[best_entry]
 
                     # Apply converters to relevant columns
                     if column_name == VALUE:
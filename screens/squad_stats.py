@@ -1,10 +1,11 @@
 import os
 import pprint
 
-import cv2
+import numpy as np
 from crop import crop_image
-from ocr import annotate_ocr_results, paddleocr, parse_ocr
+from ocr import annotate_ocr_results, paddleocr_result
 from save_image import save_image
+from screens.screen_types import SQUAD_STATS
 from squad.squad_stats_data_manager import SquadStatsDataManager
 
 
@@ -16,14 +17,11 @@ os.makedirs(FOLDER, exist_ok=True)
 # Initialize a manager to handle multiple sequential screenshots
 manager = SquadStatsDataManager()
 
-async def process_squad_stats(screenshot_path):
-    # Load the screenshot
-    image = cv2.imread(screenshot_path)
-
+async def process_squad_stats(context):
     # Crop main stats area
-    cropped_stats_screen = crop_image(image, (1700, 500, 2550, 1300))
+    cropped_stats_screen = context.region(SQUAD_STATS, "stats")
     image_height, image_width = cropped_stats_screen.shape[:2]
-    stats_screen_ocr = await paddleocr(cropped_stats_screen)
+    stats_screen_ocr = await paddleocr_result(cropped_stats_screen)
     
     # Get bbox for "Totals"
     totals_coordinates = get_totals_bbox(stats_screen_ocr)
@@ -46,7 +44,7 @@ async def process_squad_stats(screenshot_path):
     save_image(cropped_totals, FOLDER, "cropped_totals.png")
 
     # Perform OCR on cropped totals area
-    ocr_ext = await paddleocr(cropped_totals)
+    ocr_ext = await paddleocr_result(cropped_totals)
     print(ocr_ext)
 
     if DEBUG:
@@ -62,11 +60,8 @@ def extract_stats(ocr_data):
     """
     Extracts stat values from OCR data after sorting by the X-coordinate.
     """
-    # Parse OCR data using the helper function
-    parsed_entries = list(parse_ocr(ocr_data))
-
     # Sort entries by the X-coordinate of the first point in the bounding box
-    entries_sorted = sorted(parsed_entries, key=lambda x: x[0][0][0])
+    entries_sorted = list(ocr_data.subset(np.argsort(ocr_data.x_min, kind="stable")))
 
     # Define the labels we expect in the specific order after "Totals"
     stat_labels = [
@@ -94,13 +89,13 @@ def get_totals_bbox(ocr_data):
     Extracts the bounding box (bbox) of the text "Totals" from OCR output.
     
     Parameters:
-        ocr_data (list): The OCR data in the format [[bbox, (text, confidence)], ...].
+        ocr_data (OcrResult): The OCR data.
 
     Returns:
         tuple or None: The bbox coordinates of "Totals" if found, else None.
     """
 
-    for bbox, text, _ in parse_ocr(ocr_data):
+    for bbox, text, _ in ocr_data:
         # Check if text is exactly "Totals" (case-sensitive)
             if text.strip() == "Totals":
                 return bbox  # Return the bbox as soon as "Totals" is found
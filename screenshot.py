@@ -1,16 +1,131 @@
 import os
+import queue
+import threading
 import time
-from PIL import ImageGrab
 
-def take_screenshot():
-    """Takes a screenshot and returns the file path."""
-    if not os.path.exists('screenshots'):
-        os.makedirs('screenshots')
+import cv2
+import numpy as np
 
-    timestamp = time.strftime('%Y%m%d_%H%M%S')
-    filename = os.path.join('screenshots', f'screenshot_{timestamp}.png')
+SCREENSHOT_DIR = "screenshots"
 
-    screenshot = ImageGrab.grab()  # Full-screen screenshot
-    screenshot.save(filename)
+# Archive format of captured screens: "png", "jpg", "webp" or "none" to keep nothing on disk
+SCREENSHOT_FORMAT = os.environ.get("FCORE_SCREENSHOT_FORMAT", "png")
+# PNG compression level (0-9, lower is faster) or JPEG/WebP quality (0-100)
+SCREENSHOT_QUALITY = os.environ.get("FCORE_SCREENSHOT_QUALITY")
+# Frames waiting to be written before new ones are dropped from the archive (or wait, see archive)
+SCREENSHOT_QUEUE_SIZE = int(os.environ.get("FCORE_SCREENSHOT_QUEUE_SIZE", 8))
 
-    return filename
+# Encoder parameter and default value per format
+ENCODE_PARAMS = {
+    "png": (cv2.IMWRITE_PNG_COMPRESSION, 1),
+    "jpg": (cv2.IMWRITE_JPEG_QUALITY, 95),
+    "webp": (cv2.IMWRITE_WEBP_QUALITY, 95),
+}
+
+def capture_frame():
+    """Grabs the full screen as a BGR numpy frame, without touching the disk."""
+    # Screen capture isn't available on every platform, imported on first use
+    from PIL import ImageGrab
+
+    screenshot = ImageGrab.grab()
+    return cv2.cvtColor(np.asarray(screenshot), cv2.COLOR_RGB2BGR)
+
+class ScreenshotWriter:
+    """
+    Archives captured frames on a background thread, so encoding never delays processing.
+    Frames are dropped from the archive (not from processing) when the queue is full,
+    unless the caller needs the file and waits for room.
+    """
+    def __init__(self, image_format=SCREENSHOT_FORMAT, quality=SCREENSHOT_QUALITY, queue_size=SCREENSHOT_QUEUE_SIZE):
+        if image_format != "none" and image_format not in ENCODE_PARAMS:
+            raise ValueError(f"Unknown screenshot format '{image_format}', expected one of: none, {', '.join(ENCODE_PARAMS)}")
+
+        self.image_format = image_format
+        if image_format in ENCODE_PARAMS:
+            param, default = ENCODE_PARAMS[image_format]
+            self.params = [param, int(quality) if quality is not None else default]
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        # Captures within the same second get a counter, so they don't overwrite each other
+        self.last_timestamp = None
+        self.same_second = 0
+
+    def require_files(self):
+        """Raises if frames aren't written to disk, for callers that process the files later."""
+        if self.image_format == "none":
+            raise ValueError("FCORE_SCREENSHOT_FORMAT=none keeps no screenshots on disk, which the player watcher reads")
+
+    def archive(self, frame, folder=SCREENSHOT_DIR, block=False):
+        """
+        Queues a frame to be written to folder.
+
+        Parameters:
+            block (bool): Wait for room in the queue instead of dropping the frame,
+                          for callers that only keep the file (e.g. the player watcher).
+
+        Returns:
+            str: Path the frame will be written to, None if it won't be archived.
+        """
+        if block:
+            self.require_files()
+        if self.image_format == "none":
+            return None
+
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        self.same_second = self.same_second + 1 if timestamp == self.last_timestamp else 0
+        self.last_timestamp = timestamp
+        suffix = f"_{self.same_second}" if self.same_second else ""
+        path = os.path.join(folder, f'screenshot_{timestamp}{suffix}.{self.image_format}')
+
+        if block:
+            self.queue.put((frame, path))
+        else:
+            try:
+                self.queue.put_nowait((frame, path))
+            except queue.Full:
+                print(f"Screenshot archive is behind, skipped {path}")
+                return None
+
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+            self.thread.start()
+
+        return path
+
+    def _run(self):
+        while True:
+            frame, path = self.queue.get()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if not cv2.imwrite(path, frame, self.params):
+                    print(f"Failed to write screenshot {path}")
+            except Exception as e:
+                print(f"Failed to write screenshot {path}: {e}")
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Blocks until every queued frame is on disk."""
+        self.queue.join()
+
+# Shared by every capture in the process
+screenshot_writer = ScreenshotWriter()
+
+def take_screenshot(folder=SCREENSHOT_DIR, grab=capture_frame, block=False):
+    """
+    Takes a screenshot for immediate processing and archives it in the background.
+
+    Parameters:
+        grab (callable): Returns the next BGR frame, e.g. a capture backend's grab.
+        block (bool): Wait for the archive instead of dropping the frame when it's behind.
+
+    Returns:
+        tuple: (BGR frame, path it is archived to or None), (None, None) if nothing was captured
+    """
+    frame = grab()
+    if frame is None:
+        return None, None
+
+    path = screenshot_writer.archive(frame, folder, block)
+    return frame, path
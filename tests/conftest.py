@@ -0,0 +1,4 @@
+import os
+
+# Build asset banks in memory instead of compiling them into the working copy's local_cache
+os.environ.setdefault("FCORE_ASSET_CACHE_DIR", "")
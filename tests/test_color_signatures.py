@@ -0,0 +1,65 @@
+import cv2
+import numpy as np
+import pytest
+
+from color_signatures import FORM_SIGN, GOAL_ICON, GOLDEN_PLAYSTYLE, MOOD, SUB_CARET
+
+GREEN = (0, 200, 0)
+WHITE = (255, 255, 255)
+GOLD = (0, 200, 230)
+RED = (0, 0, 220)
+
+def roi(size, color=(30, 30, 30), pixels=0, pixel_color=None):
+    """BGR ROI of the given (width, height) with the first `pixels` pixels set to pixel_color."""
+    width, height = size
+    image = np.full((height, width, 3), color, dtype=np.uint8)
+    if pixels:
+        image.reshape(-1, 3)[:pixels] = pixel_color
+    return image
+
+# The rules as the screens checked them before the signatures
+def sub_caret_rule(image):
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    return np.sum(cv2.inRange(hsv, np.array([50, 100, 50]), np.array([80, 255, 255])) > 0) > 20
+
+def goal_icon_rule(image):
+    return np.sum(image >= 200) / image.size > 0.5
+
+def golden_rule(image):
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    return cv2.countNonZero(cv2.inRange(hsv, np.array([15, 100, 100]), np.array([35, 255, 255]))) > 50
+
+@pytest.mark.parametrize("signature, rule, color", [
+    (SUB_CARET, sub_caret_rule, GREEN),
+    (GOAL_ICON, goal_icon_rule, WHITE),
+    (GOLDEN_PLAYSTYLE, golden_rule, GOLD),
+])
+def test_signatures_keep_the_original_rules(signature, rule, color):
+    rng = np.random.default_rng(0)
+    rois = []
+    for _ in range(200):
+        width, height = rng.integers(5, 80, 2)
+        image = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        image.reshape(-1, 3)[rng.choice(width * height, rng.integers(0, width * height))] = color
+        rois.append(image)
+
+    assert signature.classify(rois) == [rule(image) for image in rois]
+
+def test_sub_caret_is_an_absolute_count():
+    # 21 green pixels are a caret whatever the size of the area
+    assert SUB_CARET.classify([roi((40, 25), pixels=21, pixel_color=GREEN), roi((80, 50), pixels=21, pixel_color=GREEN)]) == [True, True]
+    assert SUB_CARET.classify([roi((40, 25), pixels=20, pixel_color=GREEN)]) == [False]
+
+def test_goal_icon_counts_channel_values():
+    # Pale cyan has two of its three channel values at 200 or above, gray would put it under 200
+    assert GOAL_ICON.classify([roi((10, 10), (230, 230, 0))]) == [True]
+    assert GOAL_ICON.classify([roi((10, 10), (0, 0, 230))]) == [False]
+
+def test_empty_rois_and_defaults():
+    assert MOOD.classify([None, np.zeros((0, 5, 3), dtype=np.uint8), roi((5, 5))]) == [None, None, "unknown"]
+    assert MOOD.classify([roi((5, 5), GREEN)]) == ["excited"]
+
+def test_dominant_class_wins_and_ties_give_the_default():
+    assert FORM_SIGN.classify([roi((10, 1), GREEN, pixels=3, pixel_color=RED)]) == [True]
+    assert FORM_SIGN.classify([roi((10, 1), RED, pixels=3, pixel_color=GREEN)]) == [False]
+    assert FORM_SIGN.classify([roi((10, 1), GREEN, pixels=5, pixel_color=RED)]) == [None]
@@ -0,0 +1,39 @@
+import numpy as np
+
+from continuous_capture import ChangeDetector, frame_difference, thumbnail
+
+def screen(value, width=1720, height=720):
+    frame = np.full((height, width, 3), value, dtype=np.uint8)
+    frame[100:200, 100:600] = 255 - value  # Some structure, like a title bar
+    return frame
+
+def feed(detector, frames):
+    return [detector.update(frame) for frame in frames]
+
+def test_settled_screen_is_passed_on_once():
+    detector = ChangeDetector(stable_frames=3)
+    assert feed(detector, [screen(40)] * 6) == [False, False, True, False, False, False]
+
+def test_transitions_are_skipped_until_the_next_screen_settles():
+    detector = ChangeDetector(stable_frames=2)
+    fading = [screen(value) for value in (40, 90, 140, 190)]
+    assert feed(detector, fading + [screen(190)]) == [False, False, False, False, True]
+
+def test_change_confined_to_one_number_is_detected():
+    detector = ChangeDetector(stable_frames=2)
+    before = screen(40)
+    after = before.copy()
+    after[300:330, 800:820] = 255  # One digit of a score changes
+
+    assert feed(detector, [before, before, after, after]) == [False, True, False, True]
+
+def test_capture_noise_is_not_a_change():
+    rng = np.random.default_rng(0)
+    frame = screen(120)
+    noisy = np.clip(frame.astype(np.int16) + rng.integers(-10, 11, frame.shape), 0, 255).astype(np.uint8)
+
+    assert frame_difference(thumbnail(frame), thumbnail(noisy)) == 0
+
+def test_flicker_back_to_the_handled_screen_is_ignored():
+    detector = ChangeDetector(stable_frames=2)
+    assert feed(detector, [screen(40), screen(40), screen(200), screen(40), screen(40)]) == [False, True, False, False, False]
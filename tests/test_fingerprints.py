@@ -0,0 +1,68 @@
+import cv2
+import numpy as np
+
+from fingerprints import add_fingerprint, classify_screen, load_fingerprints, make_entry, write_entries
+from layout import BASE_RESOLUTION
+from screens.screen_types import MATCH_FACTS, PLAYER_PERFORMANCE, PRE_MATCH, SIM_PRE_MATCH
+
+SCREEN_TYPES = [MATCH_FACTS, PLAYER_PERFORMANCE, PRE_MATCH, SIM_PRE_MATCH]
+
+def screenshot(seed):
+    """Smooth random frame at base resolution, different seeds give unrelated screens."""
+    rng = np.random.default_rng(seed)
+    width, height = BASE_RESOLUTION
+    small = rng.integers(0, 256, (height // 40, width // 40, 3), dtype=np.uint8)
+    return cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+
+def with_noise(image, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.clip(image.astype(np.int16) + rng.integers(-4, 5, image.shape), 0, 255).astype(np.uint8)
+
+def bank(tmp_path, samples):
+    path = tmp_path / "fingerprints.json"
+    write_entries([make_entry(image, screen_type, "test") for screen_type, image in samples], path)
+    return load_fingerprints([path])
+
+def test_closest_screen_type(tmp_path):
+    facts, performance = screenshot(1), screenshot(2)
+    fingerprints = bank(tmp_path, [(MATCH_FACTS, facts), (PLAYER_PERFORMANCE, performance)])
+
+    assert classify_screen(with_noise(facts), SCREEN_TYPES, fingerprints)[0] == MATCH_FACTS
+    assert classify_screen(with_noise(performance), SCREEN_TYPES, fingerprints)[0] == PLAYER_PERFORMANCE
+    assert classify_screen(screenshot(3), SCREEN_TYPES, fingerprints) == (None, None)
+    assert classify_screen(with_noise(facts), [PLAYER_PERFORMANCE], fingerprints) == (None, None)
+
+def test_lookalikes_are_exempt_from_the_margin(tmp_path):
+    pre_match = screenshot(4)
+    # Same anchor crop, only the caller's OCR probe tells them apart
+    fingerprints = bank(tmp_path, [(PRE_MATCH, pre_match), (SIM_PRE_MATCH, pre_match)])
+
+    assert classify_screen(pre_match, SCREEN_TYPES, fingerprints)[0] in (PRE_MATCH, SIM_PRE_MATCH)
+
+def test_learned_hash_needs_two_confirmations(tmp_path):
+    path = tmp_path / "learned.json"
+    fingerprints = {}
+    facts = screenshot(5)
+
+    assert not add_fingerprint(facts, MATCH_FACTS, fingerprints, path)
+    assert fingerprints == {}
+    assert load_fingerprints([path]) == {}  # A single confirmation is only a candidate
+
+    assert add_fingerprint(with_noise(facts), MATCH_FACTS, fingerprints, path)
+    assert classify_screen(facts, SCREEN_TYPES, fingerprints)[0] == MATCH_FACTS
+    assert classify_screen(facts, SCREEN_TYPES, load_fingerprints([path]))[0] == MATCH_FACTS
+
+def test_one_wrong_detection_never_becomes_a_reference(tmp_path):
+    path = tmp_path / "learned.json"
+    fingerprints = {}
+
+    # A performance screen misdetected once as match facts, then real match facts screens
+    assert not add_fingerprint(screenshot(6), MATCH_FACTS, fingerprints, path)
+    assert not add_fingerprint(screenshot(7), MATCH_FACTS, fingerprints, path)
+
+    assert fingerprints == {}
+    assert classify_screen(screenshot(6), SCREEN_TYPES, load_fingerprints([path])) == (None, None)
+
+def test_unknown_screen_types_are_not_learned(tmp_path):
+    assert not add_fingerprint(screenshot(8), "unknown", {}, tmp_path / "learned.json")
+    assert not (tmp_path / "learned.json").exists()
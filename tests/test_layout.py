@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from layout import BASE_RESOLUTION, base_box, crop_box, crop_layout, frame_geometry, frame_scale, frame_slices, region_box
+from ocr import scale_ocr_result
+from screens.screen_types import MATCH_FACTS, PRE_MATCH
+
+def gradient_frame(width, height):
+    """Frame whose pixels encode their position relative to the frame size, so mapped crops can be checked."""
+    xs = np.linspace(0, 255, width, dtype=np.float64)
+    ys = np.linspace(0, 255, height, dtype=np.float64)
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame[:, :, 0] = xs[np.newaxis, :].round().astype(np.uint8)
+    frame[:, :, 1] = ys[:, np.newaxis].round().astype(np.uint8)
+    return frame
+
+def test_region_box_is_the_measured_box():
+    assert region_box(MATCH_FACTS, "shots") == (1550, 715, 2940, 820)
+
+def test_upscaled_regions_are_mapped_to_base_pixels():
+    # Measured on 5160x2160, which is 1.5 times the base resolution
+    assert base_box(PRE_MATCH, "match_date") == pytest.approx((1840 / 1.5, 475 / 1.5, 3240 / 1.5, 620 / 1.5))
+
+def test_base_resolution_crop_is_a_view():
+    frame = gradient_frame(*BASE_RESOLUTION)
+    crop = crop_layout(frame, MATCH_FACTS, "shots")
+
+    assert crop.shape == (105, 1390, 3)
+    assert np.shares_memory(crop, frame)
+
+@pytest.mark.parametrize("resolution", [(2560, 1080), (5120, 2160), (2560, 1440)])
+def test_crops_come_out_at_base_size_from_the_same_part_of_the_screen(resolution):
+    base_crop = crop_layout(gradient_frame(*BASE_RESOLUTION), MATCH_FACTS, "shots")
+    crop = crop_layout(gradient_frame(*resolution), MATCH_FACTS, "shots")
+
+    assert crop.shape == base_crop.shape
+    # Same relative position in the frame, up to the rounding of the scaled box
+    assert np.abs(crop.astype(int) - base_crop.astype(int)).max() <= 2
+
+def test_frame_slices_scale_per_axis_and_stay_inside_the_frame():
+    rows, columns = frame_slices((1720, 720, 3440, 1440), 2560, 1440)
+    assert (columns.start, columns.stop) == (1280, 2560)
+    assert (rows.start, rows.stop) == (720, 1440)
+
+    rows, columns = frame_slices((-50, -50, 4000, 2000), 1720, 720)
+    assert (columns.start, columns.stop, rows.start, rows.stop) == (0, 1720, 0, 720)
+
+def test_only_other_aspect_ratios_warn(capsys):
+    frame_geometry.cache_clear()
+    assert frame_geometry(1720, 720) == (0.5, 0.5)
+    assert capsys.readouterr().out == ""
+
+    frame_geometry(1920, 1080)
+    assert "aspect ratio" in capsys.readouterr().out
+    frame_geometry(1920, 1080)
+    assert capsys.readouterr().out == ""  # Once per resolution
+
+def test_frame_scale():
+    assert frame_scale(np.zeros((1080, 2560, 3), dtype=np.uint8)) == pytest.approx((2560 / 3440, 1080 / 1440))
+
+def test_empty_crop_outside_the_frame():
+    assert crop_box(gradient_frame(1720, 720), (3440, 0, 3500, 10)).size == 0
+
+def test_scale_ocr_result_maps_frame_pixels_to_base_pixels():
+    result = [[[[[100, 50], [300, 50], [300, 100], [100, 100]], ("Bench", 0.9)]]]
+
+    assert scale_ocr_result(result, 1, 1) is result
+    assert scale_ocr_result(result, 0.5, 0.5) == [[[[[200, 100], [600, 100], [600, 200], [200, 200]], ("Bench", 0.9)]]]
+    assert scale_ocr_result([None], 0.5, 0.5) == [None]
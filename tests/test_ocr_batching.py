@@ -0,0 +1,47 @@
+import numpy as np
+
+from ocr import BATCH_PADDING, build_mosaic, plan_batches, split_mosaic_result
+
+def crops(sizes, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) if width else None for width, height in sizes]
+
+def test_batches_keep_every_mosaic_within_the_side_limit():
+    rng = np.random.default_rng(0)
+    images = crops([(int(w), int(h)) for w, h in rng.integers(20, 400, (60, 2))] + [(0, 0)])
+    batches = plan_batches(images, max_side=960)
+
+    assert sorted(index for batch in batches for index in batch) == list(range(60))
+    assert len(batches) > 1
+    for batch in batches:
+        mosaic, _ = build_mosaic([images[index] for index in batch], max_side=960)
+        assert max(mosaic.shape[:2]) <= 960
+
+def test_oversized_crop_gets_a_batch_of_its_own():
+    images = crops([(100, 50), (1500, 80), (100, 50)])
+    assert plan_batches(images, max_side=960) == [[0], [1], [2]]
+
+def test_mosaic_holds_every_crop_where_its_placement_says():
+    images = crops([(120, 40), (0, 0), (60, 90)]) + [np.full((30, 50), 200, dtype=np.uint8)]
+    mosaic, placements = build_mosaic(images)
+
+    assert placements[1] is None
+    for image, placement in zip(images, placements):
+        if placement is None:
+            continue
+        x, y, w, h = placement
+        region = mosaic[y:y + h, x:x + w]
+        assert np.array_equal(region, image if image.ndim == 3 else np.repeat(image[:, :, np.newaxis], 3, axis=2))
+        assert x >= BATCH_PADDING and y >= BATCH_PADDING
+
+def test_detections_are_split_back_into_crop_coordinates():
+    placements = [(32, 32, 100, 40), None, (164, 32, 60, 40)]
+    result = [[
+        [[[40, 35], [90, 35], [90, 60], [40, 60]], ("Shots", 0.9)],
+        [[[170, 40], [200, 40], [200, 60], [170, 60]], ("12", 0.8)],
+    ]]
+
+    split = split_mosaic_result(result, placements)
+    assert split[0] == [[[[[8, 3], [58, 3], [58, 28], [8, 28]], ("Shots", 0.9)]]]
+    assert split[1] == [None]
+    assert split[2] == [[[[[6, 8], [36, 8], [36, 28], [6, 28]], ("12", 0.8)]]]
@@ -0,0 +1,71 @@
+import numpy as np
+
+from ocr_cache import MISS, OcrCache
+
+RESULT = [[[[[0, 0], [10, 0], [10, 5], [0, 5]], ("Shots", 0.98)]]]
+
+def test_key_depends_on_pixels_shape_and_params():
+    image = np.zeros((4, 6, 3), dtype=np.uint8)
+    changed = image.copy()
+    changed[0, 0, 0] = 1
+
+    key = OcrCache.make_key(image, "full")
+    assert key == OcrCache.make_key(image.copy(), "full")
+    assert key != OcrCache.make_key(changed, "full")
+    assert key != OcrCache.make_key(image.reshape(6, 4, 3), "full")
+    assert key != OcrCache.make_key(image, "rec")
+
+def test_memory_tier_is_an_lru():
+    cache = OcrCache(max_entries=2, directory="")
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is MISS
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["misses"] == 1
+
+def test_none_is_a_cached_result():
+    cache = OcrCache(directory="")
+    cache.put("empty", None)
+    assert cache.get("empty") is None
+
+def test_results_are_copied():
+    cache = OcrCache(directory="")
+    result = [["text"]]
+    cache.put("key", result)
+    result[0].append("changed after put")
+    cache.get("key")[0].append("changed after get")
+
+    assert cache.get("key") == [["text"]]
+
+def test_memory_only_by_default(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = OcrCache()
+    cache.put("key", RESULT)
+    cache.flush()
+
+    assert cache.directory is None
+    assert list(tmp_path.iterdir()) == []
+
+def test_disk_tier_round_trips_tuples(tmp_path):
+    cache = OcrCache(directory=str(tmp_path))
+    cache.put("key", RESULT)
+    cache.flush()
+
+    # A fresh cache only has the disk tier
+    reopened = OcrCache(directory=str(tmp_path))
+    assert reopened.get("key") == RESULT
+    assert reopened.stats()["disk_hits"] == 1
+
+def test_disk_tier_evicts_the_oldest_entries(tmp_path):
+    cache = OcrCache(directory=str(tmp_path), max_bytes=300)
+    for index in range(10):
+        cache.put(f"key{index}", ["x" * 40])
+        cache.flush()
+
+    assert cache.disk_bytes <= 300
+    assert not (tmp_path / "key0.json").exists()
+    assert (tmp_path / "key9.json").exists()
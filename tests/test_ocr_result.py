@@ -0,0 +1,63 @@
+import numpy as np
+
+from ocr_result import OcrResult
+
+def box(x, y, width=40, height=10):
+    return [[x, y], [x + width, y], [x + width, y + height], [x, y + height]]
+
+def make_result(items):
+    return OcrResult.from_paddle([[[box(*position), (text, 0.9)] for text, position in items]])
+
+# Two columns of stats under their headers, plus a row with a value next to its label
+RESULT = make_result([
+    ("Shots", (100, 100)),
+    ("Chances", (300, 100)),
+    ("7", (105, 130)),
+    ("3", (305, 135)),
+    ("12", (100, 400)),
+    ("Rating", (20, 200)),
+    ("8.1", (160, 202)),
+    ("9.9", (400, 200)),
+])
+
+def texts(indices):
+    return [RESULT.texts[index] for index in indices]
+
+def test_from_paddle_skips_malformed_items():
+    result = OcrResult.from_paddle([None, [[box(0, 0), ("ok", 0.5)], None, ["no tuple", 1], [[1, 2], ("bad box", 0.1)]]])
+    assert result.texts == ["ok"]
+    assert not OcrResult.from_paddle(None)
+
+def test_below_is_nearest_first_and_limited():
+    shots = RESULT.find_first("shots")
+    assert texts(RESULT.spatial.below(shots, max_distance=400, x_tolerance=20)) == ["7", "12"]
+    assert texts(RESULT.spatial.below(shots, max_distance=100, x_tolerance=20)) == ["7"]
+
+def test_beside_on_the_same_row():
+    rating = RESULT.find_first("rating")
+    assert texts(RESULT.spatial.right_of(rating, y_tolerance=10)) == ["8.1", "9.9"]
+    assert texts(RESULT.spatial.right_of(rating, y_tolerance=10, max_distance=150)) == ["8.1"]
+    assert texts(RESULT.spatial.left_of(RESULT.find_first("9.9"), y_tolerance=10)) == ["8.1", "Rating"]
+
+def test_anchor_can_be_a_box():
+    assert texts(RESULT.spatial.below(box(300, 100), max_distance=100, x_tolerance=20)) == ["3"]
+
+def test_rows_match_a_linear_scan():
+    rng = np.random.default_rng(0)
+    result = OcrResult([box(x, y) for x, y in rng.integers(0, 1000, (200, 2))], [str(i) for i in range(200)], np.ones(200))
+
+    # Reference: start a row at the first detection more than the threshold below the current row's start
+    order = sorted(range(len(result)), key=lambda index: result.centers[index, 1])
+    expected, start_y = [], None
+    for index in order:
+        if start_y is None or result.centers[index, 1] - start_y >= 25:
+            expected.append([])
+            start_y = result.centers[index, 1]
+        expected[-1].append(index)
+    expected = [sorted(row, key=lambda index: result.x_min[index]) for row in expected]
+
+    assert [list(row) for row in result.rows(25)] == expected
+
+def test_row_and_band():
+    assert texts(RESULT.spatial.row(205, y_tolerance=5)) == ["Rating", "8.1", "9.9"]
+    assert set(texts(RESULT.spatial.band(100, 140))) == {"Shots", "Chances", "7", "3"}
@@ -0,0 +1,50 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from playstyles import (
+    REGULAR_PLAYSTYLE_PATH, TARGET_SIZE, TemplateBank, load_templates, match_playstyle, match_playstyles,
+    normalize_icons,
+)
+
+def test_dot_product_is_tm_ccoeff_normed():
+    rng = np.random.default_rng(0)
+    icons = [rng.integers(0, 256, TARGET_SIZE[::-1], dtype=np.uint8) for _ in range(5)]
+    vectors = normalize_icons(icons)
+
+    for a, icon_a in enumerate(icons):
+        for b, icon_b in enumerate(icons):
+            expected = cv2.matchTemplate(icon_a, icon_b, cv2.TM_CCOEFF_NORMED)[0, 0]
+            assert vectors[a] @ vectors[b] == pytest.approx(expected, abs=1e-4)
+
+def test_flat_icons_correlate_with_nothing():
+    vectors = normalize_icons([np.full(TARGET_SIZE[::-1], 128, dtype=np.uint8)])
+    assert not vectors.any()
+
+def test_bank_scores_like_matching_every_template():
+    templates = load_templates(REGULAR_PLAYSTYLE_PATH)
+    arrays, metadata = TemplateBank.build(REGULAR_PLAYSTYLE_PATH)
+    bank = TemplateBank(metadata["names"], arrays["matrix"])
+
+    rng = np.random.default_rng(1)
+    resized = {name: cv2.resize(image, TARGET_SIZE, interpolation=cv2.INTER_AREA) for name, image in templates.items()}
+    icon = np.clip(resized["rapid"].astype(np.int16) + rng.integers(-20, 21, resized["rapid"].shape), 0, 255).astype(np.uint8)
+
+    scores = {name: cv2.matchTemplate(icon, template, cv2.TM_CCOEFF_NORMED)[0, 0] for name, template in resized.items()}
+    (name, confidence), = bank.match(normalize_icons([icon]))
+
+    assert name == max(scores, key=scores.get) == "rapid"
+    assert confidence == pytest.approx(scores[name], abs=1e-4)
+
+def test_empty_bank():
+    assert TemplateBank([], np.zeros((0, TARGET_SIZE[0] * TARGET_SIZE[1]), dtype=np.float32)).match(np.zeros((2, 4900))) == [(None, 0.0)] * 2
+
+def test_match_playstyles_on_template_icons():
+    icons = [cv2.imread(os.path.join(REGULAR_PLAYSTYLE_PATH, f"{name}.png")) for name in ("rapid", "technical")]
+    empty_slot = np.full((70, 70, 3), 20, dtype=np.uint8)
+
+    results = match_playstyles(icons + [empty_slot])
+    assert [name for name, _ in results] == ["rapid", "technical", None]
+    assert match_playstyle(icons[0])[0] == "rapid"
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from reports.report_journal import FRAME, append_record, apply_record, read_records, write_snapshot
+
+def test_records_round_trip(tmp_path):
+    path = tmp_path / "report.journal"
+    records = [{"op": "set", "screen": "pre_match", "data": {"a": 1}}, {"op": "add", "screen": "squad", "data": [1, 2]}]
+    for record in records:
+        append_record(path, record, fsync="never")
+
+    assert read_records(path) == records
+
+def test_missing_journal_has_no_records(tmp_path):
+    assert read_records(tmp_path / "missing.journal") == []
+
+def test_torn_tail_is_cut_off_and_later_appends_stay_readable(tmp_path):
+    path = tmp_path / "report.journal"
+    append_record(path, {"op": "set", "screen": "a", "data": 1}, fsync="never")
+    intact_size = path.stat().st_size
+    append_record(path, {"op": "set", "screen": "b", "data": 2}, fsync="never")
+
+    # Crash in the middle of the second record
+    with open(path, "r+b") as file:
+        file.truncate(intact_size + FRAME.size + 3)
+
+    assert read_records(path) == [{"op": "set", "screen": "a", "data": 1}]
+    assert path.stat().st_size == intact_size
+
+    append_record(path, {"op": "set", "screen": "c", "data": 3}, fsync="never")
+    assert [record["screen"] for record in read_records(path)] == ["a", "c"]
+
+def test_corrupt_record_stops_the_replay(tmp_path):
+    path = tmp_path / "report.journal"
+    append_record(path, {"op": "set", "screen": "a", "data": 1}, fsync="never")
+    append_record(path, {"op": "set", "screen": "b", "data": 2}, fsync="never")
+
+    data = bytearray(path.read_bytes())
+    data[-2] ^= 0xFF  # Flip a byte of the last payload, its CRC no longer matches
+    path.write_bytes(bytes(data))
+
+    assert [record["screen"] for record in read_records(path)] == ["a"]
+
+def test_apply_record():
+    report = {"screens_data": {}}
+    apply_record(report, {"op": "set", "screen": "facts", "data": {"score": "1-0"}})
+    apply_record(report, {"op": "add", "screen": "players", "data": "A"})
+    apply_record(report, {"op": "add", "screen": "players", "data": "B"})
+    apply_record(report, {"op": "set", "screen": "facts", "data": {"score": "2-0"}})
+
+    assert report["screens_data"] == {"facts": {"score": "2-0"}, "players": ["A", "B"]}
+
+    with pytest.raises(ValueError):
+        apply_record(report, {"op": "delete", "screen": "facts"})
+
+def test_write_snapshot_replaces_the_file(tmp_path):
+    path = tmp_path / "report.json"
+    write_snapshot(path, {"version": 1}, fsync="never")
+    write_snapshot(path, {"version": 2}, fsync="never")
+
+    assert json.loads(path.read_text()) == {"version": 2}
+    assert [entry.name for entry in tmp_path.iterdir()] == ["report.json"]
@@ -0,0 +1,80 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+
+# Submitting goes to Firebase, these tests only cover the local snapshot and journal
+if "reports.submit_report" not in sys.modules:
+    submit_module = types.ModuleType("reports.submit_report")
+    for name in ("submit_match_report", "submit_player_report", "submit_sim_match_report"):
+        setattr(submit_module, name, lambda report: None)
+    sys.modules["reports.submit_report"] = submit_module
+
+from reports import report_manager
+from reports.report_types import PLAYER_REPORT, REPORT_TYPES
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_manager, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(report_manager, "journal_records", {})
+    return tmp_path
+
+def reload(report):
+    return report_manager.load_report(report_manager.get_cache_path(report["report_handle"], report["report_type"]))
+
+def test_journaled_screens_are_replayed_on_load(cache_dir):
+    report = report_manager.create_report(PLAYER_REPORT, "user")
+    report_manager.set_screen_data(report, "squad_stats", {"goals": np.int64(3)})
+    report_manager.add_screen_data(report, "squad_financial", {"value": 1})
+    report_manager.add_screen_data(report, "squad_financial", {"value": 2})
+
+    assert reload(report)["screens_data"] == {
+        "squad_stats": {"goals": 3},
+        "squad_financial": [{"value": 1}, {"value": 2}],
+    }
+
+def test_journal_is_compacted_into_the_snapshot(cache_dir, monkeypatch):
+    monkeypatch.setattr(report_manager, "JOURNAL_COMPACT_RECORDS", 3)
+    report = report_manager.create_report(PLAYER_REPORT, "user")
+    journal_path = report_manager.get_journal_path(report["report_handle"], report["report_type"])
+
+    for value in range(3):
+        report_manager.add_screen_data(report, "squad_stats", value)
+    assert not journal_path.exists()
+
+    report_manager.add_screen_data(report, "squad_stats", 3)
+    assert journal_path.exists()
+    assert reload(report)["screens_data"] == {"squad_stats": [0, 1, 2, 3]}
+
+def test_failed_submission_keeps_the_screens(cache_dir, monkeypatch):
+    def fail(report):
+        raise ConnectionError("offline")
+
+    monkeypatch.setitem(REPORT_TYPES[PLAYER_REPORT], "submit_function", fail)
+    report = report_manager.create_report(PLAYER_REPORT, "user")
+    report_manager.set_screen_data(report, "squad_stats", {"goals": 1})
+
+    with pytest.raises(ConnectionError):
+        report_manager.submit_report(report)
+
+    assert report["status"] == "in_progress"
+    reloaded = reload(report)
+    assert reloaded["status"] == "in_progress"
+    assert reloaded["screens_data"] == {"squad_stats": {"goals": 1}}
+    assert not report_manager.get_cache_path(report["report_handle"], PLAYER_REPORT, is_submitted=True).exists()
+
+def test_submission_replaces_the_in_progress_snapshot(cache_dir, monkeypatch):
+    submitted = []
+    monkeypatch.setitem(REPORT_TYPES[PLAYER_REPORT], "submit_function", submitted.append)
+    report = report_manager.create_report(PLAYER_REPORT, "user")
+    report_manager.set_screen_data(report, "squad_stats", {"goals": 1})
+
+    report_manager.submit_report(report)
+
+    assert submitted == [report]
+    assert not report_manager.get_cache_path(report["report_handle"], PLAYER_REPORT).exists()
+    submitted_report = report_manager.load_report(
+        report_manager.get_cache_path(report["report_handle"], PLAYER_REPORT, is_submitted=True))
+    assert submitted_report["status"] == "complete"
+    assert submitted_report["screens_data"] == {"squad_stats": {"goals": 1}}